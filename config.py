@@ -4,6 +4,7 @@ RUN_NAME = "Baseline"         # Default label for the Results folder
 
 # --- GRID & SPATIAL PHYSICS ---
 GRID_SIZE = (50, 50)          # Dimensions of the Universe 
+FIELD_LAYOUT = 'stacked'      # 'stacked' (one (n_fields, H, W) buffer, in-place physics) or 'separate' (dict of arrays)
 
 # --- FIELD PROPERTIES ---    # Initialize different fields of matter/energy that can exist
 
@@ -11,7 +12,8 @@ FIELD_CONFIGS = {
     'carbon': {               # Field Name
         'decay': 0.01,        # Decay Rate of the Field (matter/energy leaves the universe)
         'diffusion': 0.08,    # Diffusion Rate of the Field (matter/energy spreads)
-        'init_value': 0.0     # Initial value of the Field at Genesis
+        'init_value': 0.0,    # Initial value of the Field at Genesis
+        'diffusion_backend': 'auto'  # Optional: 'auto' (by grid size), 'direct', 'stencil' or 'fft'
     },
     'waste': {
         'decay': 0.01,    
@@ -26,7 +28,8 @@ FIELD_CONFIGS = {
     'necromass': {	      # Dead organic matter (COMPULSORY FIELD)  			
         'decay': 0.001,       
         'diffusion': 0.001,   
-        'init_value': 0.0
+        'init_value': 0.0,
+        'update_interval': 10 # Optional: slow fields advance every k steps (k-step kernel, compounded decay)
     }
 }
 
@@ -47,6 +50,11 @@ SOURCES = [
     # Example of a "Toxic Leak" you could add:
     # { 'field': 'waste', 'type': 'vent', 'pos': (10, 10), 'amount': 1.0 }
 
+    # Optional 'schedule' on any source makes it time-varying:
+    #   {'type': 'seasonal', 'period': 2000, 'amplitude': 0.5, 'phase': 0.0}  -> amount * (1 + A*sin)
+    #   {'type': 'pulse', 'period': 100, 'duty': 0.2}                          -> on for 20% of each period
+    # { 'field': 'carbon', 'type': 'rain', 'amount': 0.05, 'schedule': {'type': 'seasonal', 'period': 2000, 'amplitude': 0.8} }
+
     
     # Standard global rain
 
@@ -108,13 +116,30 @@ REPRO_COST_RATIO = 0.5               # Parent gives 50% of internal energy to ch
 BASE_BODY_MASS = 2                   # Mass of an agent (Universal for now)
 
 # --- SIMULATION SETTINGS ---
+ENGINE_MODE = 'vectorized'                # 'vectorized' (AgentPool arrays) or 'scalar' (reference Agent loop)
+UPDATE_SCHEME = 'proportional'            # Tile sharing in the vectorized engine: 'proportional' or 'priority'
+                                          # (the scalar engine is always shuffled-sequential)
 MAX_STEPS_HEADLESS = 20000                # Limit for --headless runs
-AUDIT_INTERVAL = MAX_STEPS_HEADLESS/10.0  # Interval for thermodynamics audit
+AUDIT_INTERVAL = MAX_STEPS_HEADLESS/10.0  # Interval for the full (recomputed) thermodynamics cross-check
+AUDIT_EVERY_STEP = True                   # Log running-ledger mass/energy residuals every step
+LOG_CHUNK_SIZE = 1000                     # Steps buffered in memory before the logger appends them to disk
+LOG_FORMATS = ('columnar', 'csv')         # 'columnar' (memory-mapped binary columns) and/or 'csv' (timeseries.csv)
+CHECKPOINT_INTERVAL = 5000                # Steps between full-state checkpoints in headless runs (None disables)
+CHECKPOINT_KEEP = 2                       # Newest checkpoints kept in <run>/checkpoints/
+SNAPSHOT_INTERVAL = 1000                  # Steps between permanent replay seek points (None disables)
+RECORD_STRIDE = None                      # Steps between recorded render frames in headless runs (None disables)
+RECORD_DOWNSAMPLE = 1                     # Block-mean factor applied to recorded fields
+RECORD_FIELDS = None                      # Fields to record (None records all)
+PROFILE = False                           # Time each step phase (also enabled by --profile); summary in profile.json
+PROFILE_BUFFER = 10000                    # Newest steps whose phase timings are kept for the p50/p99 summary
+PROFILE_COLUMNS = False                   # Also log each phase's time (microseconds) as timeseries columns
 
 
 # --- VISUALIZATION SETTINGS ---
 VISUAL_STYLE = 'TELEMETRIC'          # Two aesthetic available: TELEMETRIC/SCIENTIFIC              
 RENDER_INTERVAL = 100                # How often to render frame ('Timelapse' Renders)
+LIVE_MODE = 'decoupled'              # 'decoupled' (sim in a background process) or 'inline' (sim steps in the GUI loop)
+LIVE_PUBLISH_HZ = 60                 # Max snapshots per second the background sim publishes to the GUI
 
 KEY_BINDINGS = {                     # Change view to different fields during Live Sim
     'y': 'carbon',
@@ -3,6 +3,12 @@ import config
 import time
 from src.logger import DataLogger
 from src.engine import Simulation
+from src.domain import DecomposedSimulation
+from src.frames import FramePlayer, has_frames
+from src.live import LiveSimulation
+from src.runner import report_audit, report_profile, headless_loop
+from src.ensemble import run_ensemble
+from src.sweep import run_sweep, load_sweep_spec
 from utils.viz import Visualizer
 
 def get_seed():
@@ -12,39 +18,104 @@ def get_seed():
         active_seed = int(time.time_ns() % 1e9)
     return active_seed
     
-def run_headless(this_seed, name, steps=config.MAX_STEPS_HEADLESS):
+def run_headless(this_seed, name, steps=config.MAX_STEPS_HEADLESS, tiles=None):
     logger = DataLogger(run_name=name, seed=this_seed)
-    sim = Simulation(this_seed, logger)
-    print(f"🚀 Running Headless: {name}")
-    try:
-        for _ in range(steps):
-            sim.step()
-            if sim.frame_count % config.AUDIT_INTERVAL == 0:
-                sim.check_mass_integrity()
-                sim.check_energy_integrity()
-            if not sim.agents: break
-    finally:
-        m, e = sim.check_mass_integrity(), sim.check_energy_integrity()
-        sim.save_audit_report(m, e)
-        sim.logger.save_to_disk()
+    if tiles is None:
+        sim = Simulation(this_seed, logger)
+        print(f"🚀 Running Headless: {name}")
+        headless_loop(sim, steps)
+        return
+    with DecomposedSimulation(this_seed, logger, tiles) as sim:
+        print(f"🚀 Running Headless: {name} on {tiles} tiles")
+        headless_loop(sim, steps)
+
+def resume_headless(run_folder, steps=config.MAX_STEPS_HEADLESS):
+    """Continues a headless run from its latest checkpoint up to `steps` total steps."""
+    sim = Simulation.resume(run_folder)
+    print(f"⏯️ Resuming {run_folder} from step {sim.frame_count}")
+    headless_loop(sim, steps - sim.frame_count)
 
 if __name__ == "__main__":
     args = sys.argv[1:]
+    if "--profile" in args:
+        # Must be set before any Simulation is built
+        config.PROFILE = True
     this_seed = get_seed()
-    if "--headless" in args:
-        run_headless(this_seed, "Headless_Run")
+    if "--ensemble" in args:
+        try:
+            n = int(args[args.index("--ensemble") + 1])
+            workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+            batch = int(args[args.index("--batch") + 1]) if "--batch" in args else 1
+        except (IndexError, ValueError):
+            print("❌ Error: Usage: python main.py --ensemble N [--workers K] [--batch B]")
+        else:
+            print(f"🚀 Running Ensemble: {n} seeds from base seed {this_seed}")
+            case_dir, manifest = run_ensemble(n, workers, base_seed=this_seed, name="Ensemble", batch=batch)
+            failed = [r['index'] for r in manifest['repeats'] if r['status'] != 'ok']
+            print(f"✅ Ensemble saved to: {case_dir} ({n - len(failed)}/{n} repeats ok)")
+            if failed:
+                print(f"🚨 Failed repeats: {failed} (see their run.log)")
+    elif "--sweep" in args:
+        try:
+            spec_path = args[args.index("--sweep") + 1]
+            workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+            batch = int(args[args.index("--batch") + 1]) if "--batch" in args else 1
+            points, repeats, steps = load_sweep_spec(spec_path)
+        except (IndexError, ValueError, FileNotFoundError) as e:
+            print(f"❌ Error: {e}. Usage: python main.py --sweep sweep.json [--workers K] [--batch B]")
+        else:
+            print(f"🚀 Running Sweep: {len(points)} points x {repeats} repeats from base seed {this_seed}")
+            sweep_dir, manifest = run_sweep(points, repeats=repeats, workers=workers, base_seed=this_seed,
+                                            steps=steps, batch=batch)
+            failed = [(p['index'], r['index']) for p in manifest['points'] for r in p['repeats']
+                      if r['status'] != 'ok']
+            print(f"✅ Sweep saved to: {sweep_dir}")
+            if failed:
+                print(f"🚨 Failed (point, repeat): {failed} (see their run.log)")
+    elif "--headless" in args:
+        try:
+            tiles = int(args[args.index("--tiles") + 1]) if "--tiles" in args else None
+        except (IndexError, ValueError):
+            print("❌ Error: Usage: python main.py --headless [--tiles K]")
+        else:
+            run_headless(this_seed, "Headless_Run", tiles=tiles)
+    elif "--resume" in args:
+        try:
+            resume_headless(sys.argv[sys.argv.index("--resume") + 1])
+        except IndexError:
+            print("❌ Error: Provide a path! Usage: python main.py --resume Results/Run_Folder")
+        except FileNotFoundError as e:
+            print(f"❌ Error: {e}")
     elif "--replay" in args:
         try:
             folder_path = sys.argv[sys.argv.index("--replay") + 1]
-            sim = Simulation.from_history(folder_path)
-            viz = Visualizer(sim)
-            print(f"🎬 Recording replay for: {folder_path}")
-            viz.show(save_gif=True, folder=folder_path)
-            # Run a final audit on the replayed end-state
-            sim.check_mass_integrity() 
+            if has_frames(folder_path):
+                # Draw the recorded frames, no re-simulation needed
+                viz = Visualizer(FramePlayer(folder_path))
+                print(f"🎬 Recording replay from frames for: {folder_path}")
+                viz.show(save_gif=True, folder=folder_path)
+            else:
+                sim = Simulation.from_history(folder_path)
+                viz = Visualizer(sim)
+                print(f"🎬 Recording replay for: {folder_path}")
+                viz.show(save_gif=True, folder=folder_path)
+                # Run a final audit on the replayed end-state
+                report_audit(sim.check_mass_integrity())
         except (IndexError, ValueError):
             print("❌ Error: Provide a path! Usage: python main.py --replay Results/Run_Folder")
         pass
+    elif getattr(config, 'LIVE_MODE', 'decoupled') == 'decoupled':
+        # The universe steps in a background process; the GUI samples its newest snapshot
+        live = LiveSimulation(this_seed, run_name="Live_Run")
+        try:
+            viz = Visualizer(live.start())
+            print(f"Starting GUI:")
+            viz.show()
+        finally:
+            print("\n[CLOSING SIMULATION]")
+            records = live.stop()
+            if records:
+                report_audit(*records)
     else:
         logger = DataLogger(run_name="Live_Run", seed=this_seed)
         sim = Simulation(this_seed, logger)
@@ -56,5 +127,7 @@ if __name__ == "__main__":
             # This runs when the window is closed
             print("\n[CLOSING SIMULATION]")
             m, e = sim.check_mass_integrity(), sim.check_energy_integrity()
+            report_audit(m, e)
             sim.save_audit_report(m, e)
-            sim.logger.save_to_disk()
\ No newline at end of file
+            sim.logger.save_to_disk()
+            report_profile(sim)
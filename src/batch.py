@@ -0,0 +1,454 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+from types import SimpleNamespace
+import numpy as np
+import config
+
+from src.population import AgentPool
+from src.contention import BATCHED_SCHEMES, resolve_birth_sites
+from src.environment import FieldManager, SourceController, BatchedSources
+from src.snapshot import WorldSnapshot
+from src.profiler import StepProfiler, POOL_PHASES
+from src.ledger import Ledger, AuditRecord, write_audit_report, MASS_TOLERANCE, ENERGY_TOLERANCE
+from src.engine import DEATH_CAUSES, DUST_THRESHOLD, seed_streams, genesis_sites, metric_columns
+
+
+class BatchedSimulation:
+    """
+    B independent universes of one configuration, advanced in lockstep.
+
+    Fields live in one (B, n_fields, H, W) tensor and agents in one AgentPool
+    whose rows carry a universe index, so diffusion, decay, sources,
+    metabolism, deaths and births each take a few array operations for the
+    whole batch instead of B Python passes. Every universe keeps its own
+    random streams, ledger entries, death counters and logger: universe b
+    evolves exactly like the vectorized Simulation(seeds[b]), only its ledger
+    sums may differ in the last bits (they are summed per universe).
+
+    A universe whose `active` flag is cleared (see retire()) keeps stepping
+    with the others but no longer logs.
+    """
+    engine_mode = 'batched'
+
+    def __init__(self, seeds, loggers, cfg=None):
+        self.cfg = cfg if cfg is not None else config
+        self.seeds = list(seeds)
+        self.loggers = list(loggers)
+        if len(self.loggers) != len(self.seeds):
+            raise ValueError(f"A batch needs one logger per seed, got {len(self.loggers)} "
+                             f"for {len(self.seeds)} seeds")
+        self.size = len(self.seeds)
+
+        # --- Random Streams (one set per universe, as in Simulation) ---
+        self.streams = [seed_streams(seed)[1] for seed in self.seeds]
+        self._metabolism_rngs = [s['metabolism'] for s in self.streams]
+        self._repro_rngs = [s['repro'] for s in self.streams]
+
+        # --- Batched World ---
+        self.shape = self.cfg.GRID_SIZE
+        self.fields = FieldManager(self.shape, layout='stacked', cfg=self.cfg, batch=self.size)
+        self.ledger = Ledger(self.fields.names, size=self.size)
+        self.sources = BatchedSources(SourceController(self.shape, rng=s['sources'], cfg=self.cfg)
+                                      for s in self.streams)
+        self.agents = AgentPool(self.shape, self.fields.names, cfg=self.cfg, universes=self.size)
+        self.update_scheme = getattr(self.cfg, 'UPDATE_SCHEME', 'proportional')
+        if self.update_scheme not in BATCHED_SCHEMES:
+            raise ValueError(f"Unknown UPDATE_SCHEME '{self.update_scheme}' for a batch. "
+                             f"Use one of {BATCHED_SCHEMES}")
+        self.occupancy = np.zeros((self.size,) + tuple(self.shape), dtype=bool)
+        self.frame_count = 0
+        self.active = np.ones(self.size, dtype=bool)
+
+        self.profiler = None
+        if getattr(self.cfg, 'PROFILE', False):
+            self.profiler = StepProfiler(POOL_PHASES, getattr(self.cfg, 'PROFILE_BUFFER', 10000))
+        self._snapshots = {}  # Per-universe WorldSnapshot cache of the current step
+
+        # --- LEDGERS & STATS ---
+        self.initial_env_mass = self._env_mass()
+        self.species_ids = list(self.cfg.SPECIES_CONFIGS.keys())
+        self.deaths = np.zeros((self.size, len(self.species_ids), len(DEATH_CAUSES)), dtype=np.int64)
+        self._init_metrics()
+        self._seed_all_species()
+
+        self.initial_bio_mass = self._bio_mass()
+        self.initial_heat = self._field_totals()['heat']
+        self.initial_agent_energy = self._agent_energy()
+        self._sync_ledger_stocks()
+
+        self.universes = [UniverseView(self, u) for u in range(self.size)]
+
+    # --- PER-UNIVERSE STOCKS ---
+
+    def _per_universe(self, values, universe=None):
+        """Sums `values` of the live agents (or of rows tagged `universe`) per universe."""
+        if universe is None:
+            universe = self.agents.universe[:self.agents.size]
+        return np.bincount(universe, weights=values, minlength=self.size)
+
+    def _field_totals(self):
+        return {name: np.sum(f, axis=(-2, -1)) for name, f in self.fields.fields.items()}
+
+    def _env_mass(self):
+        return sum(total for name, total in self._field_totals().items() if name != 'heat')
+
+    def _bio_mass(self):
+        pool, n = self.agents, self.agents.size
+        return (self.population() * self.cfg.BASE_BODY_MASS + self._per_universe(pool.stored_mass[:n])
+                + self._per_universe(pool.internal_toxins[:n]))
+
+    def _agent_energy(self):
+        return self._per_universe(self.agents.energy[:self.agents.size])
+
+    def population(self):
+        """Live agents of every universe."""
+        return np.bincount(self.agents.universe[:self.agents.size], minlength=self.size)
+
+    def _which(self, which):
+        return np.arange(self.size) if which is None else np.asarray(which, dtype=np.int64)
+
+    def _sync_ledger_stocks(self, kind=None, which=None):
+        """
+        Simulation._sync_ledger_stocks for the universes in `which` (default: all).
+        Returns the largest drift corrected in each of them.
+        """
+        which = self._which(which)
+        ledger = self.ledger
+        totals = self._field_totals()
+        stocks = []
+        if kind in (None, 'mass'):
+            stocks += [(ledger.field_totals[name], totals[name]) for name in self.fields.names if name != 'heat']
+            stocks.append((ledger.bio_mass, self._bio_mass()))
+        if kind in (None, 'energy'):
+            stocks.append((ledger.field_totals['heat'], totals['heat']))
+            stocks.append((ledger.agent_energy, self._agent_energy()))
+        drift = np.zeros(which.size)
+        for stock, exact in stocks:
+            drift = np.maximum(drift, np.abs(stock.value[which] - exact[which]))
+            stock.reset(exact[which], which)
+        return drift
+
+    # --- GENESIS ---
+
+    def _seed_all_species(self):
+        """The 'Grid' genesis of Simulation, repeated in every universe."""
+        if self.cfg.SEED_STYLE != 'Grid':
+            raise ValueError(f"A batch only supports the 'Grid' SEED_STYLE, got '{self.cfg.SEED_STYLE}'")
+        sites = genesis_sites(self.shape, self.cfg)
+        rows = np.array([r for r, _, _ in sites], dtype=np.int64)
+        cols = np.array([c for _, c, _ in sites], dtype=np.int64)
+        species = np.array([self.agents.species_index(sid) for _, _, sid in sites], dtype=np.int64)
+        universe = np.repeat(np.arange(self.size), rows.size)
+        self.agents.add(np.tile(rows, self.size), np.tile(cols, self.size), np.tile(species, self.size),
+                        universe=universe)
+        self.occupancy[universe, np.tile(rows, self.size), np.tile(cols, self.size)] = True
+
+    # --- STEP ---
+
+    def step(self):
+        prof = self.profiler
+        if prof:
+            prof.start()
+        self._snapshots = {}
+        self.frame_count += 1
+        self.fields.update(sim=self)
+        if prof:
+            prof.lap('fields')
+        self.sources.apply(self.fields.fields, sim=self)
+        if prof:
+            prof.lap('sources')
+
+        pool = self.agents
+        dead, repro = pool.metabolize(self.fields.fields, self, self._metabolism_rngs,
+                                      scheme=self.update_scheme)
+        if prof:
+            prof.lap('metabolism')
+
+        self._handle_deaths(np.flatnonzero(dead))
+        if prof:
+            prof.lap('deaths')
+
+        # Births, as in Simulation._step_pool; universes never share a cell
+        parents = np.flatnonzero(repro)
+        universe = pool.universe[parents]
+        child_rows, child_cols, placed = resolve_birth_sites(
+            pool.row[parents], pool.col[parents], self.occupancy, self._repro_rngs, universe=universe)
+        pool.stored_mass[parents[~placed]] += self.cfg.BASE_BODY_MASS # Refund
+        born = parents[placed]
+        child_energy = pool.energy[born] * 0.5
+        pool.energy[born] -= child_energy
+        pool.age[born] += pool.traits['repro_entropy_cost'][born]
+        child_species = pool.species[born]
+        child_traits = {name: column[born] for name, column in pool.traits.items()}
+
+        pool.compact(~dead)
+        pool.add(child_rows[placed], child_cols[placed], child_species,
+                 energy=child_energy, traits=child_traits, universe=universe[placed])
+
+        n = pool.size
+        self.occupancy[...] = False
+        self.occupancy[pool.universe[:n], pool.row[:n], pool.col[:n]] = True
+        if prof:
+            prof.lap('births')
+
+        self._log_metrics()
+        if prof:
+            prof.lap('logging')
+            prof.end()
+
+    def _handle_deaths(self, idx):
+        """Simulation._handle_deaths across the batch, booked per universe."""
+        if idx.size == 0:
+            return
+        pool = self.agents
+        heat, necromass = self.fields.fields['heat'], self.fields.fields['necromass']
+        u, r, c = pool.universe[idx], pool.row[idx], pool.col[idx]
+        energy = pool.energy[idx]
+
+        # Necroburst: energy becomes heat on the tile, mass spreads over the 3x3 block
+        np.add.at(heat, (u, r, c), energy)
+        burst_mass = self.cfg.BASE_BODY_MASS + pool.stored_mass[idx] + pool.internal_toxins[idx]
+        share = burst_mass / 9.0
+        for dr in [-1, 0, 1]:
+            for dc in [-1, 0, 1]:
+                np.add.at(necromass, (u, (r + dr) % self.shape[0], (c + dc) % self.shape[1]), share)
+
+        energy_out = self._per_universe(energy, u)
+        mass_out = self._per_universe(burst_mass, u)
+        self.ledger.move_field('heat', energy_out)
+        self.ledger.agent_energy.add(-energy_out)
+        self.ledger.move_field('necromass', mass_out)
+        self.ledger.bio_mass.add(-mass_out)
+
+        # Same cause precedence as Simulation._handle_death
+        t = pool.traits
+        senility = pool.age[idx] >= t['lifespan_limit'][idx]
+        starve = ~senility & (energy <= t['death_E'][idx])
+        too_hot = ~senility & ~starve & (heat[u, r, c] > t['heat_tolerance'][idx])
+        toxic = ~senility & ~starve & ~too_hot
+        n_species = len(self.species_ids)
+        key = u * n_species + pool.species[idx]
+        for cause, mask in (("senility", senility), ("starve", starve),
+                            ("heat", too_hot), ("toxic", toxic)):
+            counts = np.bincount(key[mask], minlength=self.size * n_species)
+            self.deaths[:, :, DEATH_CAUSES.index(cause)] += counts.reshape(self.size, n_species)
+
+    # --- LEDGERS & AUDITS ---
+
+    def mass_residual(self):
+        """Simulation.mass_residual of every universe, as a (B,) array."""
+        ledger = self.ledger
+        total_start = self.initial_env_mass + self.initial_bio_mass + ledger.flow('mass_sourced')
+        total_end = ledger.env_mass() + ledger.bio_mass.value + ledger.flow('mass_decayed')
+        return total_start - total_end
+
+    def energy_residual(self):
+        """Simulation.energy_residual of every universe, as a (B,) array."""
+        ledger = self.ledger
+        total_in = self.initial_agent_energy + self.initial_heat + ledger.flow('total_energy_generated')
+        total_out = ledger.agent_energy.value + ledger.heat() + ledger.flow('heat_radiated')
+        return total_in - total_out
+
+    def audit(self, which=None):
+        """Running-ledger audits of the universes in `which`: a list of (mass, energy) records."""
+        which = self._which(which)
+        ledger = self.ledger
+        mass_error, energy_error = self.mass_residual(), self.energy_residual()
+        env, heat = ledger.env_mass(), ledger.heat()
+        records = []
+        for u in which:
+            mass = AuditRecord(
+                step=self.frame_count, kind='mass', error=float(mass_error[u]),
+                ok=bool(abs(mass_error[u]) < MASS_TOLERANCE), method='incremental',
+                breakdown={'env': float(env[u]), 'bio': float(ledger.bio_mass.value[u]),
+                           'sourced': float(ledger.flow('mass_sourced')[u]),
+                           'decayed': float(ledger.flow('mass_decayed')[u])})
+            energy = AuditRecord(
+                step=self.frame_count, kind='energy', error=float(energy_error[u]),
+                ok=bool(abs(energy_error[u]) < ENERGY_TOLERANCE), method='incremental',
+                breakdown={'heat': float(heat[u]), 'bio_energy': float(ledger.agent_energy.value[u]),
+                           'generated': float(ledger.flow('total_energy_generated')[u]),
+                           'radiated': float(ledger.flow('heat_radiated')[u])})
+            records.append((mass, energy))
+        return records
+
+    def check_mass_integrity(self, which=None):
+        """
+        Simulation.check_mass_integrity for the universes in `which` (default:
+        all), dusting each one's own sub-threshold error. Returns their records.
+        """
+        which = self._which(which)
+        drift = self._sync_ledger_stocks('mass', which)
+        ledger = self.ledger
+        current_env = ledger.env_mass()[which]
+        current_bio = ledger.bio_mass.value[which]
+        sourced = ledger.flow('mass_sourced')[which]
+        decayed = ledger.flow('mass_decayed')[which]
+
+        total_start = self.initial_env_mass[which] + self.initial_bio_mass[which] + sourced
+        total_end = current_env + current_bio + decayed
+        mass_error = total_start - total_end
+
+        # --- THE SAFETY VALVE ---
+        dusted = (np.abs(mass_error) < DUST_THRESHOLD) & (mass_error != 0)
+        if dusted.any():
+            r, c = self.shape[0] // 2, self.shape[1] // 2
+            targets = which[dusted]
+            self.fields.fields['necromass'][targets, r, c] += mass_error[dusted]
+            correction = np.zeros(self.size)
+            correction[targets] = mass_error[dusted]
+            self.ledger.move_field('necromass', correction)
+
+            # Re-calculate for the record
+            recomputed = self._env_mass()[which]
+            current_env = np.where(dusted, recomputed, current_env)
+            mass_error = np.where(dusted, total_start - (recomputed + current_bio + decayed), mass_error)
+
+        return [AuditRecord(
+            step=self.frame_count, kind='mass', error=float(mass_error[i]),
+            ok=bool(abs(mass_error[i]) < MASS_TOLERANCE), method='full', drift=float(drift[i]),
+            dusted=bool(dusted[i]),
+            breakdown={'env': float(current_env[i]), 'bio': float(current_bio[i]),
+                       'sourced': float(sourced[i]), 'decayed': float(decayed[i])})
+            for i in range(which.size)]
+
+    def check_energy_integrity(self, which=None):
+        """Simulation.check_energy_integrity for the universes in `which` (default: all)."""
+        which = self._which(which)
+        drift = self._sync_ledger_stocks('energy', which)
+        ledger = self.ledger
+        current_agent_energy = ledger.agent_energy.value[which]
+        current_env_heat = ledger.heat()[which]
+        generated = ledger.flow('total_energy_generated')[which]
+        radiated = ledger.flow('heat_radiated')[which]
+
+        total_in = self.initial_agent_energy[which] + self.initial_heat[which] + generated
+        total_out = current_agent_energy + current_env_heat + radiated
+        energy_error = total_in - total_out
+        return [AuditRecord(
+            step=self.frame_count, kind='energy', error=float(energy_error[i]),
+            ok=bool(abs(energy_error[i]) < ENERGY_TOLERANCE), method='full', drift=float(drift[i]),
+            breakdown={'heat': float(current_env_heat[i]), 'bio_energy': float(current_agent_energy[i]),
+                       'generated': float(generated[i]), 'radiated': float(radiated[i])})
+            for i in range(which.size)]
+
+    def retire(self, which):
+        """Stops logging the universes in `which` (their logs are closed by the caller)."""
+        self.active[self._which(which)] = False
+
+    # --- METRICS ---
+
+    def _init_metrics(self):
+        """Simulation._init_metrics, one preallocated row per universe (no profile columns)."""
+        self.audit_every_step = getattr(self.cfg, 'AUDIT_EVERY_STEP', False)
+        columns, int_columns = metric_columns(self.species_ids, self.audit_every_step)
+        self.metric_columns = columns
+        self._metric_rows = np.zeros((self.size, len(columns)))
+        self._species_offset = columns.index(f"pop_{self.species_ids[0]}")
+        self._species_width = 4 + len(DEATH_CAUSES)
+        for logger in self.loggers:
+            logger.set_columns(columns, int_columns)
+
+    def _log_metrics(self):
+        pool, n = self.agents, self.agents.size
+        n_species = len(self.species_ids)
+        universe, species = pool.universe[:n], pool.species[:n]
+        rows = self._metric_rows
+
+        # 1. Global columns
+        population = self.population()
+        rows[:, 0] = self.frame_count
+        rows[:, 1] = population
+        rows[:, 2] = self._per_universe(pool.age[:n]) / np.maximum(population, 1)
+        if self.audit_every_step:
+            rows[:, 3] = self.mass_residual()
+            rows[:, 4] = self.energy_residual()
+
+        # 2. Per-species counts and averages, grouped by (universe, species) in one pass each
+        key = universe * n_species + species
+        groups = self.size * n_species
+        counts = np.bincount(key, minlength=groups)
+        safe = np.maximum(counts, 1)
+        species_end = self._species_offset + n_species * self._species_width
+        block = rows[:, self._species_offset:species_end].reshape(self.size, n_species, self._species_width)
+        block[..., 0] = counts.reshape(self.size, n_species)
+        for j, column in ((1, pool.energy), (2, pool.stored_mass), (3, pool.age)):
+            block[..., j] = (np.bincount(key, weights=column[:n], minlength=groups) / safe).reshape(
+                self.size, n_species)
+
+        # 3. Per-species death metrics
+        block[..., 4:] = self.deaths
+
+        for u in np.flatnonzero(self.active):
+            self.loggers[u].log_row(rows[u])
+
+    def snapshot(self, universe):
+        """Read-only WorldSnapshot of one universe at the current step (cached per step)."""
+        snap = self._snapshots.get(universe)
+        if snap is None:
+            pool, n = self.agents, self.agents.size
+            rows = np.flatnonzero(pool.universe[:n] == universe)
+            fields = {name: f[universe] for name, f in self.fields.fields.items()}
+            snap = WorldSnapshot.build(self.frame_count, self.species_ids, fields,
+                                       pool.row[rows], pool.col[rows], pool.species[rows],
+                                       pool.energy[rows], pool.stored_mass[rows],
+                                       pool.internal_toxins[rows], pool.age[rows])
+            self._snapshots[universe] = snap
+        return snap
+
+
+class UniverseView:
+    """
+    One universe of a BatchedSimulation behind the Simulation attributes that
+    recorders, audits and reports use. Stepping is done by the batch.
+    """
+    engine_mode = 'vectorized'
+    profiler = None
+
+    def __init__(self, batch, index):
+        self.batch = batch
+        self.index = index
+        self.cfg = batch.cfg
+        self.shape = batch.shape
+        self.species_ids = batch.species_ids
+        self.active_seed = batch.seeds[index]
+        self.logger = batch.loggers[index]
+
+    @property
+    def frame_count(self):
+        return self.batch.frame_count
+
+    @property
+    def fields(self):
+        return SimpleNamespace(names=self.batch.fields.names,
+                               fields={name: f[self.index] for name, f in self.batch.fields.fields.items()})
+
+    @property
+    def deaths(self):
+        counts = self.batch.deaths[self.index]
+        return {sid: dict(zip(DEATH_CAUSES, counts[s].tolist())) for s, sid in enumerate(self.species_ids)}
+
+    def snapshot(self):
+        return self.batch.snapshot(self.index)
+
+    def mass_residual(self):
+        return self.batch.mass_residual()[self.index]
+
+    def energy_residual(self):
+        return self.batch.energy_residual()[self.index]
+
+    def audit(self):
+        return self.batch.audit([self.index])[0]
+
+    def check_mass_integrity(self):
+        return self.batch.check_mass_integrity([self.index])[0]
+
+    def check_energy_integrity(self):
+        return self.batch.check_energy_integrity([self.index])[0]
+
+    def save_audit_report(self, mass_record, energy_record):
+        write_audit_report(self.logger.run_dir, mass_record, energy_record)
@@ -5,13 +5,14 @@
 # the Free Software Foundation.
 
 import numpy as np
-import random
 import config
 
 class Genome:
-    def __init__(self, species_id):
+    def __init__(self, species_id, cfg=None):
         self.species_id = species_id
-        spec = config.SPECIES_CONFIGS[species_id]
+        # Run settings: a RunConfig, or the config module itself by default
+        self.cfg = cfg if cfg is not None else config
+        spec = self.cfg.SPECIES_CONFIGS[species_id]
         
         # Mapping dictionaries
         self.intakes = spec.get('intakes', {})           # {field: efficiency}
@@ -40,10 +41,12 @@ class Genome:
         }
 
 class Agent:
-    def __init__(self, pos, genome, sim, energy=None, parent_traits=None):
+    def __init__(self, pos, genome, sim, energy=None, parent_traits=None, rng=None):
         self.pos = pos
         self.genome = genome
         self.sim = sim # Reference to access fields
+        # Random stream for stochastic decisions (owned by the Simulation)
+        self.rng = rng if rng is not None else np.random.default_rng()
         
         # 1. INITIALIZE ENERGY & TOXINS
         self.energy = energy if energy is not None else self.genome.traits['starting_energy']
@@ -57,6 +60,7 @@ class Agent:
     def step(self, fields_dict, occupancy_grid):
         r, c = self.pos
         t = self.my_traits
+        ledger = self.sim.ledger
         
         # --- PHASE 1: SENILITY ---
         self.age_accumulated += t['entropy_tax']
@@ -64,9 +68,10 @@ class Agent:
             return "die"
 
         # --- PHASE 2: INTAKE & SELECTIVE PROCESSING ---
-        interact_fields = list(set(list(self.genome.intakes.keys()) + 
-                                   list(self.genome.toxin_sens.keys()) + 
-                                   list(self.genome.excretions.keys())))
+        # Ordered de-duplication keeps the float summation order reproducible
+        interact_fields = list(dict.fromkeys(list(self.genome.intakes.keys()) + 
+                                             list(self.genome.toxin_sens.keys()) + 
+                                             list(self.genome.excretions.keys())))
         
         total_matter_on_tile = sum(fields_dict[f][r, c] for f in interact_fields)
         harvest_ratio = min(1.0, t['max_bite'] / max(1e-6, total_matter_on_tile))
@@ -78,12 +83,14 @@ class Agent:
             before = fields_dict[f][r, c]
             grabbed = before * harvest_ratio
             fields_dict[f][r, c] -= grabbed
+            ledger.move_field(f, -grabbed)
             
             # 1. Handle Toxins (Internalized)
             toxin_part = 0.0
             if f in self.genome.toxin_sens:
                 toxin_part = grabbed * self.genome.toxin_sens[f]
                 self.internal_toxins += toxin_part
+                ledger.bio_mass.add(toxin_part)
             
             remaining_mass = grabbed - toxin_part
             
@@ -95,6 +102,7 @@ class Agent:
             else:
                 # REJECTION: Put it back immediately. No transformation.
                 fields_dict[f][r, c] += remaining_mass
+                ledger.move_field(f, remaining_mass)
 
         # --- PHASE 3: THERMODYNAMICS ---
         maintenance_cost = t['metabolism']
@@ -103,15 +111,17 @@ class Agent:
         # 1. Internal Energy Change
         # Net change to agent is gain minus what was spent to stay alive
         self.energy += (energy_gain - maintenance_cost)
+        ledger.agent_energy.add(energy_gain - maintenance_cost)
         
         # 2. External Heat Change
         # The world gets the maintenance cost plus the tax of conversion
         fields_dict['heat'][r, c] += (conversion_heat + maintenance_cost)
+        ledger.move_field('heat', conversion_heat + maintenance_cost)
 
         # 3. THE AUDIT LOG (The Fix)
         # Total energy entering the universe this step is the 
         # metabolic gain PLUS the heat byproduct generated.
-        self.sim.total_energy_generated += (energy_gain + conversion_heat)
+        ledger.book('total_energy_generated', energy_gain + conversion_heat)
 
         # --- PHASE 4: GROWTH AND EXCRETION (MASS ONLY) ---
         # Matter is NEVER destroyed here. It is either stored or excreted.
@@ -120,12 +130,14 @@ class Agent:
         growth_ratio = t.get('growth_efficiency', 0.1) 
         kept_mass = intake_mass_processable * growth_ratio
         self.stored_mass += kept_mass
+        ledger.bio_mass.add(kept_mass)
 
         # 2. Excretion: Everything not kept goes back to the fields.
 
         metabolic_waste = intake_mass_processable - kept_mass
         for f, weight in self.genome.excretions.items():
             fields_dict[f][r, c] += metabolic_waste * weight
+            ledger.move_field(f, metabolic_waste * weight)
 
         # --- PHASE 5: SURVIVAL FILTERS ---
         if self.energy <= t['death_E']: return "die"
@@ -134,9 +146,10 @@ class Agent:
         
         # --- PHASE 6: REPRODUCTION (MASS TRANSFER) ---
         # Only here does structural mass leave the parent.
-        if self.energy >= t['repro_threshold'] and self.stored_mass >= config.BASE_BODY_MASS:
-            if random.random() < t['repro_prob']:
-                self.stored_mass -= config.BASE_BODY_MASS
+        body_mass = self.genome.cfg.BASE_BODY_MASS
+        if self.energy >= t['repro_threshold'] and self.stored_mass >= body_mass:
+            if self.rng.random() < t['repro_prob']:
+                self.stored_mass -= body_mass
                 return "reproduce"
                 
         return "stay"
\ No newline at end of file
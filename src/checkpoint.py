@@ -0,0 +1,231 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import os
+import glob
+import json
+from types import MappingProxyType
+import numpy as np
+
+from src.biology import Agent, Genome
+from src.population import TRAIT_NAMES
+
+CHECKPOINT_DIR = "checkpoints"
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_INDEX = "index.json"
+CHECKPOINT_VERSION = 1
+
+# AgentPool columns saved verbatim (live rows only)
+POOL_COLUMNS = ('row', 'col', 'species', 'energy', 'stored_mass', 'internal_toxins', 'age')
+
+
+def _to_builtin(value):
+    """json.dump fallback for NumPy scalars and arrays, and read-only mappings."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, MappingProxyType):  # Source entries taken from a RunConfig
+        return dict(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def checkpoint_path(run_dir, step):
+    return os.path.join(run_dir, CHECKPOINT_DIR, f"checkpoint_{step:010d}.npz")
+
+
+def list_checkpoints(run_dir):
+    """Checkpoint files of a run, oldest first."""
+    return sorted(glob.glob(os.path.join(run_dir, CHECKPOINT_DIR, "checkpoint_*.npz")))
+
+
+def latest_checkpoint(run_dir):
+    paths = list_checkpoints(run_dir)
+    return paths[-1] if paths else None
+
+
+def capture_state(sim):
+    """
+    Collects everything needed to continue `sim` bit for bit.
+    Returns (arrays, state): NumPy arrays plus a JSON-serializable dict.
+    """
+    arrays = {f"fields/{name}": f for name, f in sim.fields.fields.items()}
+    arrays['occupancy'] = sim.occupancy
+
+    state = {
+        'version': CHECKPOINT_VERSION,
+        'step': sim.frame_count,
+        'seed': sim.active_seed,
+        'engine_mode': sim.engine_mode,
+        'update_scheme': sim.update_scheme,
+        'rng': sim.rng.bit_generator.state,
+        'streams': {name: gen.bit_generator.state for name, gen in sim.streams.items()},
+        'ledger': sim.ledger.state(),
+        'initial': {
+            'env_mass': float(sim.initial_env_mass),
+            'bio_mass': float(sim.initial_bio_mass),
+            'heat': float(sim.initial_heat),
+            'agent_energy': float(sim.initial_agent_energy),
+        },
+        'deaths': sim.deaths,
+        'field_ticks': sim.fields.ticks,
+        'source_ticks': sim.sources.ticks,
+        'active_sources': sim.sources.active_sources,
+        'logger': sim.logger.state(),
+    }
+
+    if sim.engine_mode == 'vectorized':
+        pool, n = sim.agents, sim.agents.size
+        for name in POOL_COLUMNS:
+            arrays[f"pool/{name}"] = getattr(pool, name)[:n]
+        for name in TRAIT_NAMES:
+            arrays[f"pool/trait/{name}"] = pool.traits[name][:n]
+    else:
+        # Scalar agents keep their Python types (list order matters for the shuffle)
+        state['agents'] = [{
+            'pos': list(a.pos),
+            'species': a.genome.species_id,
+            'energy': a.energy,
+            'stored_mass': a.stored_mass,
+            'internal_toxins': a.internal_toxins,
+            'age': a.age_accumulated,
+            'traits': a.my_traits,
+        } for a in sim.agents]
+    return arrays, state
+
+
+def _write_atomic(path, arrays, state):
+    """Writes one state file via a temporary file and a rename."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, _state=np.array(json.dumps(state, default=_to_builtin)), **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_checkpoint(sim, keep=None):
+    """
+    Writes the state of `sim` into <run_dir>/checkpoints/ atomically
+    (write to a temporary file, then rename) and prunes all but the newest `keep`.
+    Returns the checkpoint path.
+    """
+    arrays, state = capture_state(sim)
+    path = checkpoint_path(sim.logger.run_dir, sim.frame_count)
+    _write_atomic(path, arrays, state)
+
+    if keep:
+        for old in list_checkpoints(sim.logger.run_dir)[:-keep]:
+            os.remove(old)
+    return path
+
+
+def write_snapshot(sim):
+    """
+    Writes a permanent seek point into <run_dir>/snapshots/ and records its
+    step in snapshots/index.json. Unlike checkpoints, snapshots are never pruned.
+    """
+    run_dir = sim.logger.run_dir
+    arrays, state = capture_state(sim)
+    name = f"snapshot_{sim.frame_count:010d}.npz"
+    _write_atomic(os.path.join(run_dir, SNAPSHOT_DIR, name), arrays, state)
+
+    index = _read_index(run_dir)
+    index[sim.frame_count] = name
+    index_path = os.path.join(run_dir, SNAPSHOT_DIR, SNAPSHOT_INDEX)
+    with open(index_path + ".tmp", 'w') as f:
+        json.dump({"snapshots": [{"step": step, "file": index[step]} for step in sorted(index)]},
+                  f, indent=4)
+    os.replace(index_path + ".tmp", index_path)
+    return os.path.join(run_dir, SNAPSHOT_DIR, name)
+
+
+def _read_index(run_dir):
+    index_path = os.path.join(run_dir, SNAPSHOT_DIR, SNAPSHOT_INDEX)
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path) as f:
+        return {entry["step"]: entry["file"] for entry in json.load(f)["snapshots"]}
+
+
+def seek_points(run_dir):
+    """Every restorable (step, path) of a run, snapshots and checkpoints alike, by step."""
+    points = {step: os.path.join(run_dir, SNAPSHOT_DIR, name)
+              for step, name in _read_index(run_dir).items()}
+    for path in list_checkpoints(run_dir):
+        step = int(os.path.basename(path)[len("checkpoint_"):-len(".npz")])
+        points.setdefault(step, path)
+    return sorted(points.items())
+
+
+def nearest_seek_point(run_dir, step):
+    """The latest (step, path) at or before `step`, or None when there is none."""
+    best = None
+    for point in seek_points(run_dir):
+        if point[0] > step:
+            break
+        best = point
+    return best
+
+
+def read_checkpoint(path):
+    """Returns (arrays, state) as written by write_checkpoint."""
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files if name != '_state'}
+        state = json.loads(str(data['_state']))
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {state.get('version')} in {path}")
+    return arrays, state
+
+
+def restore_state(sim, arrays, state):
+    """Overwrites a freshly constructed `sim` with a captured state."""
+    if state['engine_mode'] != sim.engine_mode or state['update_scheme'] != sim.update_scheme:
+        raise ValueError(f"Checkpoint was written by the '{state['engine_mode']}' engine with "
+                         f"'{state['update_scheme']}' updates; current config differs")
+
+    # Generators are restored in place: sources and agents hold references to them
+    sim.rng.bit_generator.state = state['rng']
+    for name, gen_state in state['streams'].items():
+        sim.streams[name].bit_generator.state = gen_state
+
+    for name, f in sim.fields.fields.items():
+        f[...] = arrays[f"fields/{name}"]
+    sim.fields.ticks = state['field_ticks']
+    sim.sources.ticks = state['source_ticks']
+    sim.sources.active_sources = state['active_sources']
+    sim.sources._compile_injections()
+    sim.occupancy = arrays['occupancy'].copy()
+
+    sim.frame_count = state['step']
+    sim._snapshot = None
+    sim.deaths = state['deaths']
+    sim.ledger.load_state(state['ledger'])
+    sim.initial_env_mass = state['initial']['env_mass']
+    sim.initial_bio_mass = state['initial']['bio_mass']
+    sim.initial_heat = state['initial']['heat']
+    sim.initial_agent_energy = state['initial']['agent_energy']
+
+    if sim.engine_mode == 'vectorized':
+        pool = sim.agents
+        pool.size = 0
+        pool.add(arrays['pool/row'], arrays['pool/col'], arrays['pool/species'],
+                 energy=arrays['pool/energy'],
+                 traits={name: arrays[f"pool/trait/{name}"] for name in TRAIT_NAMES})
+        for name in ('stored_mass', 'internal_toxins', 'age'):
+            getattr(pool, name)[:pool.size] = arrays[f"pool/{name}"]
+    else:
+        genomes = {}
+        sim.agents = []
+        for a in state['agents']:
+            genome = genomes.setdefault(a['species'], Genome(a['species'], sim.cfg))
+            agent = Agent(tuple(a['pos']), genome, sim, energy=a['energy'],
+                          parent_traits=a['traits'], rng=sim.streams['metabolism'])
+            agent.stored_mass = a['stored_mass']
+            agent.internal_toxins = a['internal_toxins']
+            agent.age_accumulated = a['age']
+            sim.agents.append(agent)
@@ -0,0 +1,118 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+COLUMNS_DIR = "columns"
+SCHEMA_FILE = "schema.json"
+CSV_FILE = "timeseries.csv"
+
+
+class ColumnarWriter:
+    """
+    Append-only binary timeseries: one raw little-endian file per column plus
+    a schema.json holding names, dtypes and the committed row count.
+    The schema is rewritten only after the column files have been appended,
+    so readers never see a partially written chunk.
+    """
+    def __init__(self, run_dir, columns, int_columns=()):
+        self.path = os.path.join(run_dir, COLUMNS_DIR)
+        os.makedirs(self.path, exist_ok=True)
+        int_columns = set(int_columns)
+        self.columns = [{"name": name,
+                         "dtype": "<i8" if name in int_columns else "<f8",
+                         "file": f"{j:03d}.bin"}
+                        for j, name in enumerate(columns)]
+        self.length = 0
+        self._write_schema()
+
+    @classmethod
+    def reopen(cls, run_dir, length):
+        """Reopens an existing store for appending, dropping every row past `length`."""
+        writer = cls.__new__(cls)
+        writer.path = os.path.join(run_dir, COLUMNS_DIR)
+        with open(os.path.join(writer.path, SCHEMA_FILE)) as f:
+            schema = json.load(f)
+        if length > schema["length"]:
+            raise ValueError(f"Store holds {schema['length']} rows, cannot reopen at {length}")
+        writer.columns = schema["columns"]
+        for spec in writer.columns:
+            path = os.path.join(writer.path, spec["file"])
+            if os.path.exists(path):  # Files appear with the first appended chunk
+                with open(path, 'r+b') as f:
+                    f.truncate(length * np.dtype(spec["dtype"]).itemsize)
+        writer.length = length
+        writer._write_schema()
+        return writer
+
+    def append(self, block):
+        """Appends a (rows, n_columns) float block, column by column."""
+        for j, spec in enumerate(self.columns):
+            with open(os.path.join(self.path, spec["file"]), 'ab') as f:
+                f.write(block[:, j].astype(spec["dtype"]).tobytes())
+        self.length += block.shape[0]
+        self._write_schema()
+
+    def _write_schema(self):
+        tmp_path = os.path.join(self.path, SCHEMA_FILE + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"length": self.length, "columns": self.columns}, f, indent=4)
+        os.replace(tmp_path, os.path.join(self.path, SCHEMA_FILE))
+
+
+class ColumnarTimeseries:
+    """
+    Lazy, read-only view of a ColumnarWriter store.
+    Indexing by column name memory-maps that one file; nothing else is read.
+    """
+    def __init__(self, run_dir):
+        self.path = os.path.join(run_dir, COLUMNS_DIR)
+        with open(os.path.join(self.path, SCHEMA_FILE)) as f:
+            schema = json.load(f)
+        self.length = schema["length"]
+        self._specs = {spec["name"]: spec for spec in schema["columns"]}
+        self.columns = list(self._specs)
+        self._cache = {}
+
+    def __len__(self):
+        return self.length
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def __getitem__(self, name):
+        if name not in self._cache:
+            spec = self._specs[name]
+            if self.length == 0:
+                self._cache[name] = np.empty(0, dtype=spec["dtype"])
+            else:
+                self._cache[name] = np.memmap(os.path.join(self.path, spec["file"]),
+                                              dtype=spec["dtype"], mode='r', shape=(self.length,))
+        return self._cache[name]
+
+    def to_frame(self, columns=None):
+        return pd.DataFrame({name: np.asarray(self[name]) for name in (columns or self.columns)})
+
+    def export_csv(self, csv_path):
+        self.to_frame().to_csv(csv_path, index=False)
+
+
+def has_timeseries(run_dir):
+    return (os.path.exists(os.path.join(run_dir, COLUMNS_DIR, SCHEMA_FILE))
+            or os.path.exists(os.path.join(run_dir, CSV_FILE)))
+
+
+def open_timeseries(run_dir):
+    """
+    Opens a run's timeseries, preferring the binary store over timeseries.csv.
+    Both results support `.columns` and `ts[name]`; wrap with np.asarray for arrays.
+    """
+    if os.path.exists(os.path.join(run_dir, COLUMNS_DIR, SCHEMA_FILE)):
+        return ColumnarTimeseries(run_dir)
+    return pd.read_csv(os.path.join(run_dir, CSV_FILE))
@@ -0,0 +1,167 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import numpy as np
+
+# Batched update schemes. 'sequential' is the scalar engine's shuffled loop,
+# where each agent sees the tile exactly as the previous agent left it.
+UPDATE_SCHEMES = ('sequential', 'proportional', 'priority')
+BATCHED_SCHEMES = ('proportional', 'priority')
+
+
+def universe_groups(universe, n_universes):
+    """Row indices of each universe of a batch (one array per universe), in row order."""
+    order = np.argsort(universe, kind='stable')
+    return np.split(order, np.cumsum(np.bincount(universe, minlength=n_universes))[:-1])
+
+
+def grouped_random(rngs, universe, only=None):
+    """
+    Uniform draws for rows tagged with a `universe` index, each universe's rows
+    drawn in row order from its own generator rngs[u]. A universe of a batch
+    thus draws exactly what it would draw on its own. With `only` (a bool per
+    universe), the other universes draw nothing and get zeros.
+    """
+    draws = np.zeros(universe.size)
+    for u, idx in enumerate(universe_groups(universe, len(rngs))):
+        if idx.size and (only is None or only[u]):
+            draws[idx] = rngs[u].random(idx.size)
+    return draws
+
+
+def resolve_contention(tiles, requests, available, scheme, rng, universe=None):
+    """
+    Shares each tile's matter among every agent that reads it in the same step.
+
+    tiles:     (n,) flat tile index of each agent
+    requests:  (n, F) matter each agent would take if it were alone on its tile
+    available: (n, F) matter on the agent's tile before anyone harvests
+    scheme:    'proportional' - every claimant gets the same fraction of its request
+               'priority'     - claimants are served in a random order, each taking
+                                what is left up to its request
+    rng:       np.random.Generator drawing the 'priority' order
+    universe:  (n,) universe index of each agent of a batch, whose `tiles` are
+               then unique across universes and `rng` holds one Generator per
+               universe. A universe draws its order only if it has a shared tile,
+               as it would on its own.
+    Returns the (n, F) granted amounts. For every tile and field the grants sum
+    to at most what was available, so the batched harvest cannot create matter.
+    """
+    if requests.shape[0] == 0:
+        return requests
+    groups, inverse = np.unique(tiles, return_inverse=True)
+    if groups.size == tiles.size:
+        # No two agents share a tile: every request is served in full
+        return requests
+
+    if scheme == 'proportional':
+        n_groups = groups.size
+        granted = np.empty_like(requests)
+        for f in range(requests.shape[1]):
+            demand = np.bincount(inverse, weights=requests[:, f], minlength=n_groups)
+            supply = np.zeros(n_groups)
+            supply[inverse] = available[:, f]
+            scale = np.ones(n_groups)
+            short = demand > supply
+            scale[short] = supply[short] / demand[short]
+            granted[:, f] = requests[:, f] * scale[inverse]
+        return granted
+
+    if scheme == 'priority':
+        # Sort by tile, then by a random priority within each tile
+        if universe is None:
+            keys = rng.random(tiles.size)
+        else:
+            crowded = np.zeros(len(rng), dtype=bool)
+            crowded[universe[np.bincount(inverse)[inverse] > 1]] = True
+            keys = grouped_random(rng, universe, only=crowded)
+        order = np.lexsort((keys, inverse))
+        sorted_groups = inverse[order]
+        starts = np.r_[0, np.flatnonzero(np.diff(sorted_groups)) + 1]
+        granted = np.empty_like(requests)
+        for f in range(requests.shape[1]):
+            req = requests[order, f]
+            taken_before = np.cumsum(req) - req
+            # Restart the running total at the first claimant of each tile
+            group_offset = np.repeat(taken_before[starts], np.diff(np.r_[starts, req.size]))
+            left = np.maximum(available[order, f] - (taken_before - group_offset), 0.0)
+            granted[order, f] = np.minimum(req, left)
+        return granted
+
+    raise ValueError(f"Unknown contention scheme '{scheme}'. Use one of {BATCHED_SCHEMES}")
+
+
+# Moore neighborhood, excluding the parent's own cell
+MOORE_OFFSETS = np.array([(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                          if not (dr == 0 and dc == 0)])
+
+
+def resolve_birth_sites(rows, cols, blocked, rng, universe=None):
+    """
+    Finds a free Moore neighbor for every reproducing parent in one batch.
+
+    rows, cols: (n,) parent positions
+    blocked:    (H, W) bool grid of cells no child may take (left untouched)
+    rng:        np.random.Generator drawing each parent's neighbor order and
+                the parents' priority
+    universe:   (n,) universe index of each parent of a batch; `blocked` is then
+                (B, H, W) and `rng` holds one Generator per universe, from which
+                each universe's parents draw as they would on their own
+    Each parent proposes its first untaken neighbor in its own shuffled order.
+    When several parents propose the same cell, the one with the best random
+    priority wins; the others retry with their next untaken neighbor. A parent
+    whose neighbors are all taken gets no site.
+    Returns (target_rows, target_cols, placed) where `placed` masks the parents
+    that found a site; targets of the others are meaningless.
+    """
+    n = rows.size
+    h, w = blocked.shape[-2:]
+    target = np.zeros(n, dtype=np.int64)
+    placed = np.zeros(n, dtype=bool)
+    if n == 0:
+        return target, target.copy(), placed
+
+    if universe is None:
+        priority = rng.permutation(n)
+        order = np.argsort(rng.random((n, MOORE_OFFSETS.shape[0])), axis=1)
+    else:
+        # Priorities only meet within a cell, so per-universe ranks suffice
+        priority = np.zeros(n, dtype=np.int64)
+        order = np.zeros((n, MOORE_OFFSETS.shape[0]), dtype=np.int64)
+        for u, idx in enumerate(universe_groups(universe, len(rng))):
+            if idx.size:
+                priority[idx] = rng[u].permutation(idx.size)
+                order[idx] = np.argsort(rng[u].random((idx.size, MOORE_OFFSETS.shape[0])), axis=1)
+    cand_r = (rows[:, None] + MOORE_OFFSETS[order, 0]) % h
+    cand_c = (cols[:, None] + MOORE_OFFSETS[order, 1]) % w
+    candidates = cand_r * w + cand_c
+    if universe is not None:
+        candidates += universe[:, None] * (h * w)
+
+    taken = blocked.ravel().copy()
+    active = np.arange(n)
+    # Every round each remaining parent loses at least one candidate, so this
+    # runs at most len(MOORE_OFFSETS) times.
+    while active.size:
+        free = ~taken[candidates[active]]
+        has_free = free.any(axis=1)
+        active, free = active[has_free], free[has_free]
+        if active.size == 0:
+            break
+        wanted = candidates[active, free.argmax(axis=1)]
+
+        # Lowest priority value wins each contested cell
+        by_cell = np.lexsort((priority[active], wanted))
+        cells = wanted[by_cell]
+        first = np.r_[True, cells[1:] != cells[:-1]]
+        winners = active[by_cell[first]]
+        taken[cells[first]] = True
+        target[winners] = cells[first]
+        placed[winners] = True
+        active = active[by_cell[~first]]
+
+    cell = target % (h * w)
+    return cell // w, cell % w, placed
@@ -0,0 +1,720 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import os
+import math
+import traceback
+from types import SimpleNamespace
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import config
+
+from src.population import AgentPool, TRAIT_NAMES
+from src.contention import BATCHED_SCHEMES, resolve_birth_sites
+from src.environment import SourceController, build_backend, diffusion_kernel
+from src.snapshot import WorldSnapshot
+from src.run_config import RunConfig
+from src.profiler import StepProfiler, DOMAIN_PHASES
+from src.ledger import Ledger, AuditRecord, write_audit_report, MASS_TOLERANCE, ENERGY_TOLERANCE
+from src.engine import DEATH_CAUSES, DUST_THRESHOLD, seed_streams, genesis_sites, metric_columns
+
+# Seam births need two tiles' lower seams (their last two rows) to be 4+ rows apart
+MIN_TILE_ROWS = 4
+# A child handed to a neighbor tile: row, col, species, energy, then every trait
+CHILD_COLUMNS = 4 + len(TRAIT_NAMES)
+UP, DOWN = 0, 1
+
+
+def tile_bounds(height, tiles):
+    """Row edges of `tiles` horizontal bands splitting `height` rows as evenly as possible."""
+    if tiles < 1:
+        raise ValueError(f"Need at least one tile, got {tiles}")
+    if tiles > 1 and height // tiles < MIN_TILE_ROWS:
+        raise ValueError(f"A {height}-row grid splits into at most {max(1, height // MIN_TILE_ROWS)} "
+                         f"tiles of {MIN_TILE_ROWS}+ rows, got {tiles}")
+    return [height * k // tiles for k in range(tiles + 1)]
+
+
+def shared_layout(shape, n_fields, tiles):
+    """(shape, dtype) of every shared array of a decomposed world."""
+    h, w = shape
+    return {
+        'fields': ((n_fields, h, w), np.float64),
+        'occupancy': ((h, w), np.bool_),
+        # What each tile sends across its upper and lower seam during a step
+        'necromass_out': ((tiles, 2, w), np.float64),
+        'children_out': ((tiles, 2, w, CHILD_COLUMNS), np.float64),
+        'children_count': ((tiles, 2), np.int64),
+    }
+
+
+class SharedArrays:
+    """
+    NumPy arrays in shared memory blocks, one block per array. The creator
+    (names=None) allocates them; other processes attach by block name.
+    """
+    def __init__(self, layout, names=None):
+        self.owner = names is None
+        self._blocks = {}
+        self.arrays = {}
+        for key, (shape, dtype) in layout.items():
+            nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            if self.owner:
+                block = SharedMemory(create=True, size=nbytes)
+            else:
+                # Spawned children share the creator's resource tracker, which
+                # unlinks the blocks once, when the creator closes them
+                block = SharedMemory(name=names[key])
+            self._blocks[key] = block
+            self.arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    @property
+    def names(self):
+        return {key: block.name for key, block in self._blocks.items()}
+
+    def close(self):
+        self.arrays = {}
+        for block in self._blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+
+
+def reduce_ledgers(states):
+    """Sums the Ledger.state() of every tile into the state of one world-wide Ledger."""
+    def pair(pairs):
+        return [math.fsum(x for p in pairs for x in p), 0.0]
+    first = states[0]
+    return {
+        'field_totals': {name: pair([s['field_totals'][name] for s in states]) for name in first['field_totals']},
+        'bio_mass': pair([s['bio_mass'] for s in states]),
+        'agent_energy': pair([s['agent_energy'] for s in states]),
+        'flows': {name: pair([s['flows'][name] for s in states]) for name in first['flows']},
+    }
+
+
+class Tile:
+    """
+    Rows r0..r1-1 of a decomposed world and the agents standing on them,
+    stepped in a worker process alongside the other tiles.
+
+    Fields and occupancy are views of the world-wide shared arrays, so a tile
+    reads its neighbors' rows directly; it only writes its own rows, and hands
+    what crosses a seam (necroburst mass, children born on a neighbor's row)
+    to the owner through shared outboxes. `barrier` separates those phases.
+    The tile's Ledger books only what happens in the tile, so only the sum
+    over all tiles balances.
+    """
+    def __init__(self, index, bounds, seed, cfg, shared, barrier):
+        self.index = index
+        self.tiles = len(bounds) - 1
+        self.r0, self.r1 = bounds[index], bounds[index + 1]
+        self.height = self.r1 - self.r0
+        self.cfg = cfg
+        self.shape = tuple(cfg.GRID_SIZE)
+        self.barrier = barrier
+        arrays = shared.arrays
+        self.names = list(cfg.FIELD_CONFIGS.keys())
+        self.fields = {name: arrays['fields'][f] for f, name in enumerate(self.names)}
+        self.own = {name: f[self.r0:self.r1] for name, f in self.fields.items()}
+        self.occupancy = arrays['occupancy']
+        self.necromass_out = arrays['necromass_out']
+        self.children_out = arrays['children_out']
+        self.children_count = arrays['children_count']
+        self.ledger = Ledger(self.names)
+
+        # A lone tile is the whole world and draws exactly what Simulation(seed) draws
+        world_streams = seed_streams(seed)[1]
+        self.streams = world_streams if self.tiles == 1 else seed_streams((seed, index))[1]
+
+        # --- Fields ---
+        # A field advancing every k steps reaches k cells per update, so it
+        # diffuses a block of the tile's rows plus k ghost rows on either side.
+        # Every backend treats the block as periodic; the ghost rows absorb the
+        # error of that artificial wrap, so the tile's own rows come out exact.
+        self.ticks = 0
+        self.intervals, self.decay_factors = {}, {}
+        self.backends, self._ghost_rows, self._ghost_blocks, self._diffused = {}, {}, {}, {}
+        for name, specs in cfg.FIELD_CONFIGS.items():
+            k = int(specs.get('update_interval', 1))
+            if k < 1:
+                raise ValueError(f"update_interval for {name} must be >= 1, got {k}")
+            self.intervals[name] = k
+            self.decay_factors[name] = (1 - specs.get('decay', 0.0)) ** k
+            self.own[name].fill(specs['init_value'])
+            self._ghost_rows[name] = np.arange(self.r0 - k, self.r1 + k) % self.shape[0]
+            block = self._ghost_blocks[name] = np.empty((self.height + 2 * k, self.shape[1]))
+            backend = self.backends[name] = build_backend(name, specs.get('diffusion_backend', 'auto'),
+                                                          diffusion_kernel(specs['diffusion']), block.shape, k)
+            self._diffused[name] = block if backend.in_place else np.empty_like(block)
+
+        # Vents are placed from the world's stream, then cropped to this tile
+        self.sources = SourceController(self.shape, rng=world_streams['sources'], cfg=cfg)
+        self.sources.crop_rows(self.r0, self.r1)
+
+        # --- Agents (Grid genesis, restricted to the tile's rows) ---
+        self.update_scheme = getattr(cfg, 'UPDATE_SCHEME', 'proportional')
+        self.agents = AgentPool(self.shape, self.names, cfg=cfg)
+        self.species_ids = self.agents.species_ids
+        self.deaths = np.zeros((len(self.species_ids), len(DEATH_CAUSES)), dtype=np.int64)
+        self.occupancy[self.r0:self.r1] = False
+        for r, c, species_id in genesis_sites(self.shape, cfg):
+            if self.r0 <= r < self.r1:
+                self.agents.add(r, c, self.agents.species_index(species_id))
+                self.occupancy[r, c] = True
+        self.sync_stocks()
+
+    # --- BOOKS ---
+
+    def sync_stocks(self, kind=None):
+        """
+        Re-anchors the tile's running stocks of `kind` ('mass', 'energy' or both
+        when None) to its own rows and agents. Returns the tile's ledger state.
+        """
+        ledger, pool = self.ledger, self.agents
+        if kind in (None, 'mass'):
+            for name, f in self.own.items():
+                if name != 'heat':
+                    ledger.field_totals[name].reset(np.sum(f))
+            ledger.bio_mass.reset(pool.bio_mass())
+        if kind in (None, 'energy'):
+            ledger.field_totals['heat'].reset(np.sum(self.own['heat']))
+            ledger.agent_energy.reset(pool.total_energy())
+        return ledger.state()
+
+    def dust(self, amount):
+        """Sweeps a sub-threshold mass error into necromass at the grid's center."""
+        r, c = self.shape[0] // 2, self.shape[1] // 2
+        self.fields['necromass'][r, c] += amount
+        self.ledger.move_field('necromass', amount)
+        return self.ledger.state()
+
+    def report(self):
+        """What the parent reduces after every step: ledger state, per-species sums, deaths."""
+        pool, n = self.agents, self.agents.size
+        species, n_species = pool.species[:n], len(self.species_ids)
+        stats = np.column_stack([np.bincount(species, minlength=n_species)]
+                                + [np.bincount(species, weights=column[:n], minlength=n_species)
+                                   for column in (pool.energy, pool.stored_mass, pool.age)])
+        return {'ledger': self.ledger.state(), 'stats': stats, 'deaths': self.deaths.copy()}
+
+    def agent_columns(self):
+        pool, n = self.agents, self.agents.size
+        return (pool.row[:n].copy(), pool.col[:n].copy(), pool.species[:n].copy(), pool.energy[:n].copy(),
+                pool.stored_mass[:n].copy(), pool.internal_toxins[:n].copy(), pool.age[:n].copy())
+
+    # --- STEP ---
+
+    def step(self):
+        """Simulation._step_pool for this tile, meeting the other tiles at every seam exchange."""
+        self._update_fields()
+        self.sources.apply(self.own, sim=self)
+
+        pool = self.agents
+        dead, repro = pool.metabolize(self.fields, self, self.streams['metabolism'], scheme=self.update_scheme)
+        self._handle_deaths(np.flatnonzero(dead))
+        parents = np.flatnonzero(repro)
+        child_rows, child_cols, placed = self._place_children(parents)
+
+        pool.stored_mass[parents[~placed]] += self.cfg.BASE_BODY_MASS # Refund
+        born = parents[placed]
+        child_energy = pool.energy[born] * 0.5
+        pool.energy[born] -= child_energy
+        pool.age[born] += pool.traits['repro_entropy_cost'][born]
+        child_species = pool.species[born]
+        child_traits = {name: column[born] for name, column in pool.traits.items()}
+        pool.compact(~dead)
+
+        # Children born on a neighbor's row are handed over; the rest stay
+        rows, cols = child_rows[placed], child_cols[placed]
+        offset = (rows - self.r0) % self.shape[0]
+        mine = offset < self.height
+        pool.add(rows[mine], cols[mine], child_species[mine], energy=child_energy[mine],
+                 traits={name: t[mine] for name, t in child_traits.items()})
+        for side, seam in ((UP, offset == self.shape[0] - 1), (DOWN, offset == self.height)):
+            n = np.count_nonzero(seam)
+            self.children_count[self.index, side] = n
+            self.children_out[self.index, side, :n] = np.column_stack(
+                [rows[seam], cols[seam], child_species[seam], child_energy[seam]]
+                + [child_traits[name][seam] for name in TRAIT_NAMES])
+        self.barrier.wait()  # Every tile has posted its children
+        for source, side in self._inboxes():
+            n = self.children_count[source, side]
+            box = self.children_out[source, side, :n]
+            pool.add(box[:, 0].astype(np.int64), box[:, 1].astype(np.int64), box[:, 2].astype(np.int64),
+                     energy=box[:, 3], traits={name: box[:, 4 + j] for j, name in enumerate(TRAIT_NAMES)})
+
+        self.occupancy[self.r0:self.r1] = False
+        self.occupancy[pool.row[:pool.size], pool.col[:pool.size]] = True
+        return self.report()
+
+    def _inboxes(self):
+        """(tile, side) of the outboxes aimed at this tile: the lower seam above, the upper seam below."""
+        return (((self.index - 1) % self.tiles, DOWN), ((self.index + 1) % self.tiles, UP))
+
+    def _update_fields(self):
+        """FieldManager._update_in_place for the tile's rows, from ghost rows read before anyone writes."""
+        self.ticks += 1
+        due = [name for name in self.names if self.ticks % self.intervals[name] == 0]
+        for name in due:
+            block = self._ghost_blocks[name]
+            np.take(self.fields[name], self._ghost_rows[name], axis=0, out=block)
+            self.backends[name].apply(block, out=self._diffused[name])
+        self.barrier.wait()  # Every tile has read its ghost rows
+        for name in due:
+            field, k = self.own[name], self.intervals[name]
+            field[...] = self._diffused[name][k:k + self.height]
+
+            factor = self.decay_factors[name]
+            if factor < 1:
+                total = np.sum(field)
+                field *= factor
+                loss = total * (1 - factor)
+                self._book_loss(name, loss, -loss)
+
+            if field.min() < 0:
+                neg_mask = field < 0
+                phantom_loss = -np.sum(field[neg_mask])
+                self._book_loss(name, phantom_loss, phantom_loss)
+                field[neg_mask] = 0.0
+
+    def _book_loss(self, name, loss, field_change):
+        self.ledger.book('heat_radiated' if name == 'heat' else 'mass_decayed', loss)
+        self.ledger.move_field(name, field_change)
+
+    def _handle_deaths(self, idx):
+        """
+        Simulation._handle_deaths for the tile's dead. Burst mass landing on a
+        neighbor's row goes to this tile's outbox instead of the field.
+        """
+        outbox = self.necromass_out[self.index]
+        outbox[...] = 0.0
+        if idx.size == 0:
+            return
+        pool = self.agents
+        h, w = self.shape
+        heat, necromass = self.fields['heat'], self.fields['necromass']
+        r, c = pool.row[idx], pool.col[idx]
+        energy = pool.energy[idx]
+
+        # Necroburst: energy becomes heat on the tile, mass spreads over the 3x3 block
+        np.add.at(heat, (r, c), energy)
+        burst_mass = self.cfg.BASE_BODY_MASS + pool.stored_mass[idx] + pool.internal_toxins[idx]
+        share = burst_mass / 9.0
+        for dr in [-1, 0, 1]:
+            for dc in [-1, 0, 1]:
+                rows, cols = (r + dr) % h, (c + dc) % w
+                offset = (rows - self.r0) % h
+                mine = offset < self.height
+                np.add.at(necromass, (rows[mine], cols[mine]), share[mine])
+                for side, seam in ((UP, offset == h - 1), (DOWN, offset == self.height)):
+                    np.add.at(outbox[side], cols[seam & ~mine], share[seam & ~mine])
+
+        self.ledger.move_field('heat', np.sum(energy))
+        self.ledger.agent_energy.add(-np.sum(energy))
+        self.ledger.move_field('necromass', np.sum(burst_mass))
+        self.ledger.bio_mass.add(-np.sum(burst_mass))
+
+        # Same cause precedence as Simulation._handle_death
+        t = pool.traits
+        senility = pool.age[idx] >= t['lifespan_limit'][idx]
+        starve = ~senility & (energy <= t['death_E'][idx])
+        too_hot = ~senility & ~starve & (heat[r, c] > t['heat_tolerance'][idx])
+        toxic = ~senility & ~starve & ~too_hot
+        species = pool.species[idx]
+        for cause, mask in (("senility", senility), ("starve", starve),
+                            ("heat", too_hot), ("toxic", toxic)):
+            self.deaths[:, DEATH_CAUSES.index(cause)] += np.bincount(species[mask],
+                                                                     minlength=len(self.species_ids))
+
+    def _receive_necromass(self):
+        necromass = self.own['necromass']
+        for source, side in self._inboxes():
+            necromass[0 if side == DOWN else -1] += self.necromass_out[source, side]
+
+    def _place_children(self, parents):
+        """
+        resolve_birth_sites for the tile's parents. Parents more than two rows
+        apart never compete for a cell, so with several tiles the births run in
+        two passes: first every parent off the tile's lower seam (its last two
+        rows), then, once all tiles have marked those children, the lower seam
+        parents against the rows around the seam. The barrier in between also
+        completes the necroburst exchange.
+        """
+        pool = self.agents
+        if self.tiles == 1:
+            placement = resolve_birth_sites(pool.row[parents], pool.col[parents], self.occupancy,
+                                            self.streams['repro'])
+            self.barrier.wait()
+            self._receive_necromass()
+            return placement
+
+        child_rows = np.zeros(parents.size, dtype=np.int64)
+        child_cols = np.zeros(parents.size, dtype=np.int64)
+        placed = np.zeros(parents.size, dtype=bool)
+        lower_seam = pool.row[parents] - self.r0 >= self.height - 2
+
+        # Pass 1 reaches from the row above the tile down to its third-last row
+        first = np.flatnonzero(~lower_seam)
+        child_rows[first], child_cols[first], placed[first] = self._resolve_window(
+            parents[first], self.r0 - 1, self.height)
+        self.barrier.wait()  # Every tile's first-pass children are marked
+        self._receive_necromass()
+
+        # Pass 2 reaches from the tile's fourth-last row to the first row below it
+        second = np.flatnonzero(lower_seam)
+        child_rows[second], child_cols[second], placed[second] = self._resolve_window(
+            parents[second], self.r1 - 3, 4)
+        return child_rows, child_cols, placed
+
+    def _resolve_window(self, parents, top, rows):
+        """Places `parents` within the `rows` grid rows from `top` on, marking their children as taken."""
+        pool = self.agents
+        window = np.arange(top, top + rows) % self.shape[0]
+        child_rows, child_cols, placed = resolve_birth_sites(
+            (pool.row[parents] - top) % self.shape[0], pool.col[parents], self.occupancy[window],
+            self.streams['repro'])
+        child_rows = window[child_rows]
+        self.occupancy[child_rows[placed], child_cols[placed]] = True
+        return child_rows, child_cols, placed
+
+
+def _run_tile(index, bounds, seed, cfg, names, barrier, conn):
+    """
+    Worker process of one tile: builds it, then runs the parent's commands
+    ('step', 'sync_stocks', 'dust', 'agent_columns') until told to 'stop'.
+    A failure breaks the barrier, so the other tiles fail instead of waiting.
+    """
+    shared = SharedArrays(shared_layout(cfg.GRID_SIZE, len(cfg.FIELD_CONFIGS), len(bounds) - 1), names)
+    try:
+        tile = Tile(index, bounds, seed, cfg, shared, barrier)
+        conn.send(('ok', tile.report()))
+        while True:
+            command, args = conn.recv()
+            if command == 'stop':
+                break
+            conn.send(('ok', getattr(tile, command)(*args)))
+    except Exception:
+        barrier.abort()
+        conn.send(('error', traceback.format_exc()))
+    finally:
+        shared.close()
+
+
+class DecomposedSimulation:
+    """
+    One universe too large for one process: the toroidal grid is split into
+    `tiles` bands of rows, each stepped by a worker process (see Tile).
+    Fields and occupancy live in shared memory; every step the tiles read
+    their neighbors' boundary rows for diffusion (ghost rows), and hand the
+    necroburst mass and the children that cross a seam to the tile that owns
+    them. Each tile keeps the agents on its rows and books its own Ledger;
+    this parent sums the ledgers after every step, so the audits, metrics and
+    reports are those of the whole world.
+
+    A single tile reproduces the vectorized Simulation exactly when its fields
+    pick the same backends as Simulation's (the choice is made for each
+    tile's block of rows, and FFT results differ in the last bits). With more
+    tiles, each tile draws from its own streams and seam births resolve in two
+    passes, so runs are reproducible for a given seed and tile count. Only the
+    'Grid' seed style is supported and runs write no checkpoints.
+    Call close() (or use a with block) to stop the workers.
+    """
+    engine_mode = 'decomposed'
+
+    def __init__(self, seed, logger, tiles=None, cfg=None):
+        self.cfg = cfg if cfg is not None else config
+        self.active_seed = seed
+        self.logger = logger
+        self.shape = tuple(self.cfg.GRID_SIZE)
+        self.tiles = tiles or os.cpu_count() or 1
+        self.bounds = tile_bounds(self.shape[0], self.tiles)
+        self.update_scheme = getattr(self.cfg, 'UPDATE_SCHEME', 'proportional')
+        if self.update_scheme not in BATCHED_SCHEMES:
+            raise ValueError(f"Unknown UPDATE_SCHEME '{self.update_scheme}' for a decomposed run. "
+                             f"Use one of {BATCHED_SCHEMES}")
+        if self.cfg.SEED_STYLE != 'Grid':
+            raise ValueError(f"A decomposed run only supports the 'Grid' SEED_STYLE, got '{self.cfg.SEED_STYLE}'")
+        self.species_ids = list(self.cfg.SPECIES_CONFIGS.keys())
+        names = list(self.cfg.FIELD_CONFIGS.keys())
+        self.shared = SharedArrays(shared_layout(self.shape, len(names), self.tiles))
+        data = self.shared.arrays['fields']
+        self.fields = SimpleNamespace(names=names, fields={name: data[f] for f, name in enumerate(names)})
+        self.ledger = Ledger(names)
+        self.frame_count = 0
+
+        self.profiler = None
+        if getattr(self.cfg, 'PROFILE', False):
+            self.profiler = StepProfiler(DOMAIN_PHASES, getattr(self.cfg, 'PROFILE_BUFFER', 10000))
+        self._snapshot = None
+        self._init_metrics()
+
+        # Workers get plain settings: the config module itself cannot be pickled
+        worker_cfg = self.cfg if isinstance(self.cfg, RunConfig) else RunConfig.from_module(self.cfg)
+        ctx = get_context('spawn')
+        self._barrier = ctx.Barrier(self.tiles)
+        self._conns, self._processes = [], []
+        self._closed = False
+        try:
+            for index in range(self.tiles):
+                parent_end, child_end = ctx.Pipe()
+                process = ctx.Process(target=_run_tile, daemon=True,
+                                      args=(index, self.bounds, seed, worker_cfg, self.shared.names,
+                                            self._barrier, child_end))
+                process.start()
+                child_end.close()
+                self._conns.append(parent_end)
+                self._processes.append(process)
+            self._load_reports(self._collect(range(self.tiles)))
+        except BaseException:
+            self.close()
+            raise
+
+        # --- LEDGERS ---
+        # Genesis leaves the fields untouched, so the opening books are Simulation's
+        self.initial_env_mass = self.ledger.env_mass()
+        self.initial_bio_mass = self.ledger.bio_mass.value
+        self.initial_heat = self.ledger.heat()
+        self.initial_agent_energy = self.ledger.agent_energy.value
+
+    # --- WORKERS ---
+
+    def _command(self, command, *args, tiles=None):
+        """Runs `command` on every tile (or on `tiles`) at once; returns their replies in tile order."""
+        tiles = range(self.tiles) if tiles is None else tiles
+        for k in tiles:
+            self._conns[k].send((command, args))
+        return self._collect(tiles)
+
+    def _collect(self, tiles):
+        replies, errors = [], []
+        for k in tiles:
+            try:
+                status, payload = self._conns[k].recv()
+            except EOFError:
+                status, payload = 'error', f"tile {k} worker exited (code {self._processes[k].exitcode})"
+            if status == 'ok':
+                replies.append(payload)
+            else:
+                errors.append(payload)
+        if errors:
+            self._barrier.abort()
+            # A tile that failed on its own explains more than the ones it took down
+            errors.sort(key=lambda text: 'BrokenBarrierError' in text)
+            raise RuntimeError(f"Decomposed simulation failed:\n{errors[0]}")
+        return replies
+
+    def close(self):
+        """Stops the tile workers and releases the shared memory. Field views die with it."""
+        if self._closed:
+            return
+        self._closed = True
+        for conn in self._conns:
+            try:
+                conn.send(('stop', ()))
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(10)
+            if process.is_alive():
+                process.terminate()
+        self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load_reports(self, reports):
+        """Sums the tiles' ledgers, per-species sums and death counts."""
+        self.ledger.load_state(reduce_ledgers([r['ledger'] for r in reports]))
+        self._stats = sum(r['stats'] for r in reports)
+        self._deaths = sum(r['deaths'] for r in reports)
+
+    # --- STEP ---
+
+    def step(self):
+        prof = self.profiler
+        if prof:
+            prof.start()
+        self._snapshot = None
+        self.frame_count += 1
+        self._load_reports(self._command('step'))
+        if prof:
+            prof.lap('tiles')
+        self._log_metrics()
+        if prof:
+            prof.lap('logging')
+            prof.end()
+
+    def population(self):
+        """Number of live agents, summed over the tiles."""
+        return int(self._stats[:, 0].sum())
+
+    @property
+    def deaths(self):
+        return {sid: dict(zip(DEATH_CAUSES, self._deaths[s].tolist())) for s, sid in enumerate(self.species_ids)}
+
+    def snapshot(self):
+        """
+        Read-only WorldSnapshot of the current step, gathering every tile's
+        agents (tile by tile) at most once per step. Its fields are views of
+        the shared arrays.
+        """
+        if self._snapshot is not None and self._snapshot.step == self.frame_count:
+            return self._snapshot
+        columns = [np.concatenate(column) for column in zip(*self._command('agent_columns'))]
+        self._snapshot = WorldSnapshot.build(self.frame_count, self.species_ids, self.fields.fields, *columns)
+        return self._snapshot
+
+    # --- LEDGERS & AUDITS ---
+
+    def _stock_values(self, kind):
+        ledger = self.ledger
+        if kind == 'mass':
+            return [s.value for name, s in ledger.field_totals.items() if name != 'heat'] + [ledger.bio_mass.value]
+        return [ledger.heat(), ledger.agent_energy.value]
+
+    def _sync_ledger_stocks(self, kind):
+        """
+        Has every tile re-anchor its stocks of `kind` to recomputed sums.
+        Returns the largest drift this corrected in the world-wide books.
+        """
+        before = self._stock_values(kind)
+        self.ledger.load_state(reduce_ledgers(self._command('sync_stocks', kind)))
+        return max(abs(a - b) for a, b in zip(before, self._stock_values(kind)))
+
+    def mass_residual(self):
+        """(Initial + In) - (Current + Out) from the summed tile ledgers."""
+        ledger = self.ledger
+        total_start = self.initial_env_mass + self.initial_bio_mass + ledger.flow('mass_sourced')
+        total_end = ledger.env_mass() + ledger.bio_mass.value + ledger.flow('mass_decayed')
+        return total_start - total_end
+
+    def energy_residual(self):
+        """Energy counterpart of mass_residual."""
+        ledger = self.ledger
+        total_in = self.initial_agent_energy + self.initial_heat + ledger.flow('total_energy_generated')
+        total_out = ledger.agent_energy.value + ledger.heat() + ledger.flow('heat_radiated')
+        return total_in - total_out
+
+    def audit(self):
+        """Simulation.audit from the summed tile ledgers. Returns (mass, energy) records."""
+        ledger = self.ledger
+        mass_error, energy_error = self.mass_residual(), self.energy_residual()
+        mass = AuditRecord(
+            step=self.frame_count, kind='mass', error=mass_error,
+            ok=abs(mass_error) < MASS_TOLERANCE, method='incremental',
+            breakdown={'env': ledger.env_mass(), 'bio': ledger.bio_mass.value,
+                       'sourced': ledger.flow('mass_sourced'), 'decayed': ledger.flow('mass_decayed')})
+        energy = AuditRecord(
+            step=self.frame_count, kind='energy', error=energy_error,
+            ok=abs(energy_error) < ENERGY_TOLERANCE, method='incremental',
+            breakdown={'heat': ledger.heat(), 'bio_energy': ledger.agent_energy.value,
+                       'generated': ledger.flow('total_energy_generated'),
+                       'radiated': ledger.flow('heat_radiated')})
+        return mass, energy
+
+    def check_mass_integrity(self):
+        """
+        Simulation.check_mass_integrity over the whole world: the tiles recompute
+        their sums in parallel, and the tile holding the grid's center does the dusting.
+        """
+        drift = self._sync_ledger_stocks('mass')
+        ledger = self.ledger
+        current_env = ledger.env_mass()
+        current_bio = ledger.bio_mass.value
+        sourced, decayed = ledger.flow('mass_sourced'), ledger.flow('mass_decayed')
+
+        total_start = self.initial_env_mass + self.initial_bio_mass + sourced
+        total_end = current_env + current_bio + decayed
+        mass_error = total_start - total_end
+
+        # --- THE SAFETY VALVE ---
+        dusted = False
+        if abs(mass_error) < DUST_THRESHOLD and mass_error != 0:
+            center = np.searchsorted(self.bounds, self.shape[0] // 2, side='right') - 1
+            self._command('dust', mass_error, tiles=[center])
+
+            # Re-calculate for the record
+            self._sync_ledger_stocks('mass')
+            current_env = ledger.env_mass()
+            mass_error = total_start - (current_env + current_bio + decayed)
+            dusted = True
+
+        return AuditRecord(
+            step=self.frame_count, kind='mass', error=mass_error,
+            ok=abs(mass_error) < MASS_TOLERANCE, method='full', drift=drift, dusted=dusted,
+            breakdown={'env': current_env, 'bio': current_bio, 'sourced': sourced, 'decayed': decayed})
+
+    def check_energy_integrity(self):
+        """Simulation.check_energy_integrity over the whole world."""
+        drift = self._sync_ledger_stocks('energy')
+        ledger = self.ledger
+        current_agent_energy = ledger.agent_energy.value
+        current_env_heat = ledger.heat()
+        generated, radiated = ledger.flow('total_energy_generated'), ledger.flow('heat_radiated')
+
+        total_in = self.initial_agent_energy + self.initial_heat + generated
+        total_out = current_agent_energy + current_env_heat + radiated
+        energy_error = total_in - total_out
+        return AuditRecord(
+            step=self.frame_count, kind='energy', error=energy_error,
+            ok=abs(energy_error) < ENERGY_TOLERANCE, method='full', drift=drift,
+            breakdown={'heat': current_env_heat, 'bio_energy': current_agent_energy,
+                       'generated': generated, 'radiated': radiated})
+
+    def save_audit_report(self, mass_record, energy_record):
+        write_audit_report(self.logger.run_dir, mass_record, energy_record)
+
+    # --- METRICS ---
+
+    def _init_metrics(self):
+        """Simulation._init_metrics; the profile columns time the whole tile step."""
+        self.audit_every_step = getattr(self.cfg, 'AUDIT_EVERY_STEP', False)
+        columns, int_columns = metric_columns(self.species_ids, self.audit_every_step)
+        self._profile_offset = None
+        if self.profiler and getattr(self.cfg, 'PROFILE_COLUMNS', False):
+            self._profile_offset = len(columns)
+            columns += [f"time_{phase}_us" for phase in self.profiler.phases[:-1]]
+        self.metric_columns = columns
+        self._metric_row = np.zeros(len(columns))
+        self._species_offset = columns.index(f"pop_{self.species_ids[0]}")
+        self._species_width = 4 + len(DEATH_CAUSES)
+        self.logger.set_columns(columns, int_columns)
+
+    def _log_metrics(self):
+        """Simulation._log_metrics from the tiles' summed per-species counts and sums."""
+        stats = self._stats  # Per species: count, energy, stored mass and age sums
+        n_species = len(self.species_ids)
+        row = self._metric_row
+        counts = stats[:, 0]
+        population = counts.sum()
+
+        # 1. Global columns
+        row[0] = self.frame_count
+        row[1] = population
+        row[2] = stats[:, 3].sum() / population if population else 0
+        if self.audit_every_step:
+            row[3] = self.mass_residual()
+            row[4] = self.energy_residual()
+
+        # 2. Per-species counts and averages
+        safe = np.maximum(counts, 1)
+        species_end = self._species_offset + n_species * self._species_width
+        block = row[self._species_offset:species_end].reshape(n_species, self._species_width)
+        block[:, 0] = counts
+        block[:, 1:4] = stats[:, 1:4] / safe[:, None]
+
+        # 3. Per-species death metrics
+        block[:, 4:] = self._deaths
+
+        if self._profile_offset is not None:
+            row[self._profile_offset:] = self.profiler.current()[:-1] / 1e3
+
+        self.logger.log_row(row)
@@ -12,96 +12,234 @@ import numpy as np
 
 from src.logger import DataLogger
 from src.biology import Agent, Genome
+from src.population import AgentPool
+from src.contention import BATCHED_SCHEMES, resolve_birth_sites
 from src.environment import FieldManager,SourceController
+from src.snapshot import WorldSnapshot
+from src.run_config import load_run_config
+from src.profiler import StepProfiler, SCALAR_PHASES, POOL_PHASES
+from src.ledger import Ledger, AuditRecord, write_audit_report, MASS_TOLERANCE, ENERGY_TOLERANCE
+from src.checkpoint import (write_checkpoint, write_snapshot, read_checkpoint, restore_state,
+                            latest_checkpoint, nearest_seek_point)
+
+ENGINE_MODES = ('scalar', 'vectorized')
+DEATH_CAUSES = ("starve", "toxic", "senility", "heat")
+STREAM_NAMES = ('sources', 'shuffle', 'repro', 'metabolism')
+# Full mass audits sweep residuals below this into necromass
+DUST_THRESHOLD = 1e-5
+
+
+def seed_streams(seed):
+    """
+    The generators of one universe: a root Generator plus one named stream
+    per subsystem, all derived from `seed`.
+    """
+    seed_seq = np.random.SeedSequence(seed)
+    rng = np.random.default_rng(seed_seq)
+    streams = {name: np.random.default_rng(child)
+               for name, child in zip(STREAM_NAMES, seed_seq.spawn(len(STREAM_NAMES)))}
+    return rng, streams
+
+
+def genesis_sites(shape, cfg):
+    """
+    Genesis placement of the 'Grid' seed style as a list of (row, col, species_id).
+    Species are seeded in local 'clusters' across the grid so each species has
+    identical access to local resource patches.
+    """
+    species_keys = list(cfg.SPECIES_CONFIGS.keys())
+    # We'll use the count of the first species to define the number of 'Twin Sites'
+    # Assuming for a baseline they have the same init_count
+    site_count = cfg.SPECIES_CONFIGS[species_keys[0]]['init_count']
+    taken = np.zeros(shape, dtype=bool)
+    sites = []
+
+    # 1. Calculate the number of 'Spawn Sites'
+    cols = int(np.ceil(np.sqrt(site_count * (shape[1] / shape[0]))))
+    rows = int(np.ceil(site_count / cols))
+    x_space = shape[1] / cols
+    y_space = shape[0] / rows
+
+    # 2. Iterate through sites
+    for idx in range(site_count):
+        r_idx = idx // cols
+        c_idx = idx % cols
+        
+        # Base coordinate for the 'Twin Site'
+        base_r = int((r_idx * y_space) + (y_space / 2)) % shape[0]
+        base_c = int((c_idx * x_space) + (x_space / 2)) % shape[1]
+        
+        # 3. Place one of EACH species at this site (in immediate neighborhood)
+        # Offset list: [Center, East, South, West, North...]
+        offsets = [(0,0), (0,1), (1,0), (0,-1), (-1,0)]
+        
+        for s_idx, species_id in enumerate(species_keys):
+            dr, dc = offsets[s_idx % len(offsets)]
+            r = (base_r + dr) % shape[0]
+            c = (base_c + dc) % shape[1]
+            
+            # Safety check for overlap
+            if not taken[r, c]:
+                sites.append((r, c, species_id))
+                taken[r, c] = True
+    return sites
+
+
+def metric_columns(species_ids, audit_every_step):
+    """
+    (columns, int_columns) of the per-step metrics row: global columns, then one
+    block per species of pop, avg_energy, avg_stored_mass, avg_age and death counts.
+    """
+    columns = ["step", "total_population", "avg_age"]
+    if audit_every_step:
+        columns += ["mass_residual", "energy_residual"]
+    int_columns = ["step", "total_population"]
+    for sid in species_ids:
+        columns += [f"pop_{sid}", f"{sid}_avg_energy", f"{sid}_avg_stored_mass", f"{sid}_avg_age"]
+        columns += [f"{sid}_{cause}" for cause in DEATH_CAUSES]
+        int_columns += [f"pop_{sid}"] + [f"{sid}_{cause}" for cause in DEATH_CAUSES]
+    return columns, int_columns
+
+
+def _flow_property(name):
+    """Exposes a Ledger flow as a plain Simulation attribute."""
+    return property(lambda self: self.ledger.flow(name),
+                    lambda self, value: self.ledger.flows[name].reset(value))
+
+
 class Simulation:
-    def __init__(self, seed, logger, run_name=None):
+    # --- LEDGER FLOWS (backed by self.ledger) ---
+    mass_sourced = _flow_property('mass_sourced')
+    mass_decayed = _flow_property('mass_decayed')
+    heat_radiated = _flow_property('heat_radiated')
+    total_energy_generated = _flow_property('total_energy_generated')
+
+    def __init__(self, seed, logger, run_name=None, cfg=None):
         
-        # --- Random Seeding ---
+        # --- Random Streams ---
+        # Each universe owns its generators; nothing touches the global RNG,
+        # so several simulations can run side by side in one process.
         self.active_seed = seed    
-        np.random.seed(self.active_seed)
+        self.rng, self.streams = seed_streams(self.active_seed)
         
+        # --- Run Settings ---
+        # A RunConfig (see src/run_config.py) or, by default, the config module itself
+        self.cfg = cfg if cfg is not None else config
+
         # --- Initialize Infrastructure ---
         #self.logger = DataLogger(run_name=run_name, seed=self.active_seed) 
         self.logger = logger
-        self.shape = config.GRID_SIZE
-        self.fields = FieldManager(self.shape)
-        self.sources = SourceController(self.shape)
-        self.agents = []
+        self.shape = self.cfg.GRID_SIZE
+        self.fields = FieldManager(self.shape, cfg=self.cfg)
+        self.ledger = Ledger(self.fields.names)
+        self.sources = SourceController(self.shape, rng=self.streams['sources'], cfg=self.cfg)
+
+        # --- Agent Storage ---
+        # 'scalar' keeps a list of Agent objects (reference path),
+        # 'vectorized' keeps an AgentPool of contiguous columns.
+        self.engine_mode = getattr(self.cfg, 'ENGINE_MODE', 'vectorized')
+        if self.engine_mode not in ENGINE_MODES:
+            raise ValueError(f"Unknown ENGINE_MODE '{self.engine_mode}'. Use one of {ENGINE_MODES}")
+        if self.engine_mode == 'vectorized':
+            self.agents = AgentPool(self.shape, self.fields.fields.keys(), cfg=self.cfg)
+        else:
+            self.agents = []
+
+        # --- Update Scheme ---
+        # How agents reading the same tile in one step share its matter
+        if self.engine_mode == 'scalar':
+            self.update_scheme = 'sequential'
+        else:
+            self.update_scheme = getattr(self.cfg, 'UPDATE_SCHEME', 'proportional')
+            if self.update_scheme not in BATCHED_SCHEMES:
+                raise ValueError(f"Unknown UPDATE_SCHEME '{self.update_scheme}' for the vectorized engine. "
+                                 f"Use one of {BATCHED_SCHEMES}")
         self.occupancy = np.zeros(self.shape, dtype=bool)
         self.frame_count = 0
+
+        # --- Profiler ---
+        # Opt-in per-phase step timings; None keeps step() free of timing calls
+        self.profiler = None
+        if getattr(self.cfg, 'PROFILE', False):
+            phases = POOL_PHASES if self.engine_mode == 'vectorized' else SCALAR_PHASES
+            self.profiler = StepProfiler(phases, getattr(self.cfg, 'PROFILE_BUFFER', 10000))
+        self._snapshot = None  # WorldSnapshot cache, see snapshot()
         
         # --- LEDGERS ---
-        self.mass_sourced = 0.0
-        self.mass_decayed = 0.0
-        self.heat_radiated = 0.0
-        self.total_energy_generated = 0.0
-        
+        # Flows start at zero inside self.ledger; stocks are opened after genesis
         self.initial_env_mass = self._get_current_env_mass()
         
         # Stats
         #self.deaths = {"starve": 0, "toxic": 0, "senility": 0, "heat": 0}
         self.deaths = {
-            sid: {"starve": 0, "toxic": 0, "senility": 0, "heat": 0} 
-            for sid in config.SPECIES_CONFIGS.keys()
+            sid: dict.fromkeys(DEATH_CAUSES, 0)
+            for sid in self.cfg.SPECIES_CONFIGS.keys()
         }
 
+        self._init_metrics()
+
         #for species_id in config.SPECIES_CONFIGS.keys():
         #    self._seed_species(species_id)
         self._seed_all_species()
         
         self.initial_bio_mass = self._get_current_bio_mass()
         self.initial_heat = np.sum(self.fields.fields['heat'])
-        self.initial_agent_energy = sum(a.energy for a in self.agents)
+        self.initial_agent_energy = self._get_current_agent_energy()
+        self._sync_ledger_stocks()
+
+    def _sync_ledger_stocks(self, kind=None):
+        """
+        Re-anchors the running stocks of `kind` ('mass', 'energy' or both when None)
+        to freshly recomputed sums. Returns the largest drift that was corrected.
+        """
+        ledger = self.ledger
+        stocks = []
+        if kind in (None, 'mass'):
+            stocks += [(ledger.field_totals[name], np.sum(f))
+                       for name, f in self.fields.fields.items() if name != 'heat']
+            stocks.append((ledger.bio_mass, self._get_current_bio_mass()))
+        if kind in (None, 'energy'):
+            stocks.append((ledger.field_totals['heat'], np.sum(self.fields.fields['heat'])))
+            stocks.append((ledger.agent_energy, self._get_current_agent_energy()))
+        drift = 0.0
+        for stock, exact in stocks:
+            drift = max(drift, abs(stock.value - exact))
+            stock.reset(exact)
+        return drift
 
     def _get_current_env_mass(self):
         return sum(np.sum(f) for name, f in self.fields.fields.items() if name != 'heat')
 
     def _get_current_bio_mass(self):
-        return sum(config.BASE_BODY_MASS + a.stored_mass + a.internal_toxins for a in self.agents)
+        return self.snapshot().bio_mass(self.cfg.BASE_BODY_MASS)
+
+    def _get_current_agent_energy(self):
+        return self.snapshot().total_energy()
+
+    def population(self):
+        """Number of live agents."""
+        return len(self.agents)
+
+    def _spawn(self, pos, species_id):
+        """Places a fresh genesis agent of `species_id` at `pos`."""
+        self._snapshot = None
+        if self.engine_mode == 'vectorized':
+            self.agents.add(pos[0], pos[1], self.agents.species_index(species_id))
+        else:
+            self.agents.append(Agent(pos, Genome(species_id, self.cfg), self, rng=self.streams['metabolism']))
 
     def _seed_all_species(self):
         """
         Seeds species in local 'clusters' across the grid to ensure 
         each species has identical access to local resource patches.
         """
-        species_keys = list(config.SPECIES_CONFIGS.keys())
-        # We'll use the count of the first species to define the number of 'Twin Sites'
-        # Assuming for a baseline they have the same init_count
-        site_count = config.SPECIES_CONFIGS[species_keys[0]]['init_count']
-        
-        if config.SEED_STYLE == 'Grid':
-            # 1. Calculate the number of 'Spawn Sites'
-            cols = int(np.ceil(np.sqrt(site_count * (self.shape[1] / self.shape[0]))))
-            rows = int(np.ceil(site_count / cols))
-            x_space = self.shape[1] / cols
-            y_space = self.shape[0] / rows
-
-            # 2. Iterate through sites
-            for idx in range(site_count):
-                r_idx = idx // cols
-                c_idx = idx % cols
-                
-                # Base coordinate for the 'Twin Site'
-                base_r = int((r_idx * y_space) + (y_space / 2)) % self.shape[0]
-                base_c = int((c_idx * x_space) + (x_space / 2)) % self.shape[1]
-                
-                # 3. Place one of EACH species at this site (in immediate neighborhood)
-                # Offset list: [Center, East, South, West, North...]
-                offsets = [(0,0), (0,1), (1,0), (0,-1), (-1,0)]
-                
-                for s_idx, species_id in enumerate(species_keys):
-                    dr, dc = offsets[s_idx % len(offsets)]
-                    r = (base_r + dr) % self.shape[0]
-                    c = (base_c + dc) % self.shape[1]
-                    
-                    # Safety check for overlap
-                    if not self.occupancy[r, c]:
-                        spec_genome = Genome(species_id)
-                        self.agents.append(Agent((r, c), spec_genome, self))
-                        self.occupancy[r, c] = True
+        if self.cfg.SEED_STYLE == 'Grid':
+            for r, c, species_id in genesis_sites(self.shape, self.cfg):
+                self._spawn((r, c), species_id)
+                self.occupancy[r, c] = True
         else:
             # Random fallback
-            for sid in species_keys:
+            for sid in self.cfg.SPECIES_CONFIGS.keys():
                 self._seed_species_random(sid)
 
     def _handle_death(self, agent):
@@ -110,12 +248,18 @@ class Simulation:
 
         # Necroburst
         self.fields.fields['heat'][r, c] += agent.energy
-        total_burst_mass = config.BASE_BODY_MASS + agent.stored_mass + agent.internal_toxins
+        total_burst_mass = self.cfg.BASE_BODY_MASS + agent.stored_mass + agent.internal_toxins
         share = total_burst_mass / 9.0
         for dr in [-1, 0, 1]:
             for dc in [-1, 0, 1]:
                 nr, nc = (r + dr) % self.shape[0], (c + dc) % self.shape[1]
                 self.fields.fields['necromass'][nr, nc] += share
+
+        # Body energy becomes heat, body mass becomes necromass
+        self.ledger.move_field('heat', agent.energy)
+        self.ledger.agent_energy.add(-agent.energy)
+        self.ledger.move_field('necromass', total_burst_mass)
+        self.ledger.bio_mass.add(-total_burst_mass)
         
         # Log cause specifically for THIS species
         if agent.age_accumulated >= agent.my_traits['lifespan_limit']: 
@@ -127,14 +271,71 @@ class Simulation:
         else: 
             self.deaths[sid]["toxic"] += 1
 
+    def _handle_deaths(self, idx):
+        """Batched _handle_death for the AgentPool rows in `idx`."""
+        if idx.size == 0:
+            return
+        pool = self.agents
+        heat, necromass = self.fields.fields['heat'], self.fields.fields['necromass']
+        r, c = pool.row[idx], pool.col[idx]
+        energy = pool.energy[idx]
+
+        # Necroburst: energy becomes heat on the tile, mass spreads over the 3x3 block
+        np.add.at(heat, (r, c), energy)
+        burst_mass = self.cfg.BASE_BODY_MASS + pool.stored_mass[idx] + pool.internal_toxins[idx]
+        share = burst_mass / 9.0
+        for dr in [-1, 0, 1]:
+            for dc in [-1, 0, 1]:
+                np.add.at(necromass, ((r + dr) % self.shape[0], (c + dc) % self.shape[1]), share)
+
+        self.ledger.move_field('heat', np.sum(energy))
+        self.ledger.agent_energy.add(-np.sum(energy))
+        self.ledger.move_field('necromass', np.sum(burst_mass))
+        self.ledger.bio_mass.add(-np.sum(burst_mass))
+
+        # Same cause precedence as _handle_death
+        t = pool.traits
+        senility = pool.age[idx] >= t['lifespan_limit'][idx]
+        starve = ~senility & (energy <= t['death_E'][idx])
+        too_hot = ~senility & ~starve & (heat[r, c] > t['heat_tolerance'][idx])
+        toxic = ~senility & ~starve & ~too_hot
+        n_species = len(pool.species_ids)
+        species = pool.species[idx]
+        for cause, mask in (("senility", senility), ("starve", starve),
+                            ("heat", too_hot), ("toxic", toxic)):
+            counts = np.bincount(species[mask], minlength=n_species)
+            for s, sid in enumerate(pool.species_ids):
+                self.deaths[sid][cause] += int(counts[s])
+
     def step(self):
+        prof = self.profiler
+        if prof:
+            prof.start()
+        self._snapshot = None
         self.frame_count += 1
         self.fields.update(sim=self)
+        if prof:
+            prof.lap('fields')
         self.sources.apply(self.fields.fields, sim=self)
+        if prof:
+            prof.lap('sources')
+
+        if self.engine_mode == 'vectorized':
+            self._step_pool()
+        else:
+            self._step_scalar()
+        self._log_metrics()
+        if prof:
+            prof.lap('logging')
+            prof.end()
 
+    def _step_scalar(self):
+        """Reference path: shuffled, sequential Agent.step calls."""
         next_agents = []
         new_occupancy = np.zeros(self.shape, dtype=bool)
-        np.random.shuffle(self.agents)
+        self.streams['shuffle'].shuffle(self.agents)
+        if self.profiler:
+            self.profiler.lap('shuffle')
 
         for agent in self.agents:
             action = agent.step(self.fields.fields, self.occupancy)
@@ -147,38 +348,117 @@ class Simulation:
                 if self._attempt_repro(agent, next_agents, new_occupancy):
                     pass # Success handled in method
                 else:
-                    agent.stored_mass += config.BASE_BODY_MASS # Refund
+                    agent.stored_mass += self.cfg.BASE_BODY_MASS # Refund
 
             next_agents.append(agent)
             new_occupancy[agent.pos] = True
 
         self.agents = next_agents
         self.occupancy = new_occupancy
-        self._log_metrics()
+        if self.profiler:
+            self.profiler.lap('agents')  # Includes the deaths and births handled in the loop
 
-    def _attempt_repro(self, agent, next_agents, new_occupancy):
-        r, c = agent.pos
+    def _step_pool(self):
+        """Vectorized path: one metabolism pass over the whole AgentPool."""
+        pool = self.agents
+        dead, repro = pool.metabolize(self.fields.fields, self, self.streams['metabolism'],
+                                      scheme=self.update_scheme)
+        prof = self.profiler
+        if prof:
+            prof.lap('metabolism')
+
+        self._handle_deaths(np.flatnonzero(dead))
+        if prof:
+            prof.lap('deaths')
+
+        # Births: all parents claim free neighbors in one batch. Cells of agents
+        # that died this step stay blocked, exactly as in the scalar path.
+        parents = np.flatnonzero(repro)
+        child_rows, child_cols, placed = resolve_birth_sites(
+            pool.row[parents], pool.col[parents], self.occupancy, self.streams['repro'])
+        pool.stored_mass[parents[~placed]] += self.cfg.BASE_BODY_MASS # Refund
+        born = parents[placed]
+        child_energy = pool.energy[born] * 0.5
+        pool.energy[born] -= child_energy
+        pool.age[born] += pool.traits['repro_entropy_cost'][born]
+        child_species = pool.species[born]
+        child_traits = {name: column[born] for name, column in pool.traits.items()}
+
+        pool.compact(~dead)
+        pool.add(child_rows[placed], child_cols[placed], child_species,
+                 energy=child_energy, traits=child_traits)
+
+        self.occupancy = np.zeros(self.shape, dtype=bool)
+        self.occupancy[pool.row[:pool.size], pool.col[:pool.size]] = True
+        if prof:
+            prof.lap('births')
+
+    def _find_free_neighbor(self, r, c, new_occupancy):
+        """Returns a random free cell in the Moore neighborhood of (r, c), or None."""
         neighbors = [
             (dr, dc) for dr in [-1, 0, 1] for dc in [-1, 0, 1] 
             if not (dr == 0 and dc == 0) # Can't spawn on yourself
         ]
-        np.random.shuffle(neighbors)
+        self.streams['repro'].shuffle(neighbors)
         for dr, dc in neighbors:
             nr, nc = (r + dr) % self.shape[0], (c + dc) % self.shape[1]
             if not self.occupancy[nr, nc] and not new_occupancy[nr, nc]:
-                e_half = agent.energy * 0.5
-                agent.energy -= e_half
-                agent.age_accumulated += agent.my_traits.get('repro_entropy_cost', 40.0)
-                child = Agent((nr, nc), agent.genome, self, energy=e_half, parent_traits=agent.my_traits)
-                next_agents.append(child)
-                new_occupancy[nr, nc] = True
-                return True
-        return False
+                return (nr, nc)
+        return None
+
+    def _attempt_repro(self, agent, next_agents, new_occupancy):
+        target = self._find_free_neighbor(*agent.pos, new_occupancy)
+        if target is None:
+            return False
+        nr, nc = target
+        e_half = agent.energy * 0.5
+        agent.energy -= e_half
+        agent.age_accumulated += agent.my_traits.get('repro_entropy_cost', 40.0)
+        child = Agent((nr, nc), agent.genome, self, energy=e_half, parent_traits=agent.my_traits,
+                      rng=self.streams['metabolism'])
+        next_agents.append(child)
+        new_occupancy[nr, nc] = True
+        return True
+
+    def mass_residual(self):
+        """(Initial + In) - (Current + Out) from the running ledgers, in O(n_fields)."""
+        ledger = self.ledger
+        total_start = self.initial_env_mass + self.initial_bio_mass + ledger.flow('mass_sourced')
+        total_end = ledger.env_mass() + ledger.bio_mass.value + ledger.flow('mass_decayed')
+        return total_start - total_end
+
+    def energy_residual(self):
+        """Energy counterpart of mass_residual, from the running ledgers."""
+        ledger = self.ledger
+        total_in = self.initial_agent_energy + self.initial_heat + ledger.flow('total_energy_generated')
+        total_out = ledger.agent_energy.value + ledger.heat() + ledger.flow('heat_radiated')
+        return total_in - total_out
+
+    def audit(self):
+        """Cheap per-step audit from the running ledgers. Returns (mass, energy) records."""
+        ledger = self.ledger
+        mass_error, energy_error = self.mass_residual(), self.energy_residual()
+        mass = AuditRecord(
+            step=self.frame_count, kind='mass', error=mass_error,
+            ok=abs(mass_error) < MASS_TOLERANCE, method='incremental',
+            breakdown={'env': ledger.env_mass(), 'bio': ledger.bio_mass.value,
+                       'sourced': ledger.flow('mass_sourced'), 'decayed': ledger.flow('mass_decayed')})
+        energy = AuditRecord(
+            step=self.frame_count, kind='energy', error=energy_error,
+            ok=abs(energy_error) < ENERGY_TOLERANCE, method='incremental',
+            breakdown={'heat': ledger.heat(), 'bio_energy': ledger.agent_energy.value,
+                       'generated': ledger.flow('total_energy_generated'),
+                       'radiated': ledger.flow('heat_radiated')})
+        return mass, energy
 
     def check_mass_integrity(self):
-        """Verifies if (Initial + In) == (Current + Out) with  dusting for floatpoint drift"""
-        current_env = self._get_current_env_mass()
-        current_bio = self._get_current_bio_mass()
+        """
+        Full cross-check: verifies if (Initial + In) == (Current + Out) from recomputed
+        sums, with dusting for floatpoint drift. Re-anchors the running ledgers.
+        """
+        drift = self._sync_ledger_stocks('mass')
+        current_env = self.ledger.env_mass()
+        current_bio = self.ledger.bio_mass.value
         
         total_start = self.initial_env_mass + self.initial_bio_mass + self.mass_sourced
         total_end = current_env + current_bio + self.mass_decayed
@@ -186,35 +466,31 @@ class Simulation:
         mass_error = total_start - total_end
         
         # --- THE SAFETY VALVE ---
-        DUST_THRESHOLD = 1e-5
+        dusted = False
         
         if abs(mass_error) < DUST_THRESHOLD and mass_error != 0:
             # Small drift? Dust it into Necromass at the center of the grid
             r, c = self.shape[0] // 2, self.shape[1] // 2
             # Subtracting the error from the field effectively reconciles the ledger
             self.fields.fields['necromass'][r, c] += mass_error 
+            self.ledger.move_field('necromass', mass_error)
             
-            # Re-calculate for the printout
+            # Re-calculate for the record
             current_env = self._get_current_env_mass()
             mass_error = total_start - (current_env + current_bio + self.mass_decayed)
-            dusting_status = " (Dusting Applied 🧹)"
-        else:
-            dusting_status = ""
+            dusted = True
 
-        status = "✅" if abs(mass_error) < 1e-8 else "❌"
-        
-        # ALARM: If the error was too big to dust, print a warning
-        if status == "❌":
-            print(f"🚨 ALERT: SIGNIFICANT MASS LEAK DETECTED!")
-        
-        print(f"--- ⚖️ MASS AUDIT [Step {self.frame_count}] ---")
-        print(f"Status: {status} | Error: {mass_error:.10f} units{dusting_status}")
-        
-        return mass_error
+        return AuditRecord(
+            step=self.frame_count, kind='mass', error=mass_error,
+            ok=abs(mass_error) < MASS_TOLERANCE, method='full', drift=drift, dusted=dusted,
+            breakdown={'env': current_env, 'bio': current_bio,
+                       'sourced': self.mass_sourced, 'decayed': self.mass_decayed})
 
     def check_energy_integrity(self):
-        current_agent_energy = sum(a.energy for a in self.agents)
-        current_env_heat = np.sum(self.fields.fields['heat'])
+        """Full cross-check of the energy books from recomputed sums."""
+        drift = self._sync_ledger_stocks('energy')
+        current_agent_energy = self.ledger.agent_energy.value
+        current_env_heat = self.ledger.heat()
         
         # Energy produced by agents + starting energy
         total_in = self.initial_agent_energy + self.initial_heat+self.total_energy_generated
@@ -222,97 +498,145 @@ class Simulation:
         total_out = current_agent_energy + current_env_heat + self.heat_radiated
         
         energy_error = total_in - total_out
-        print(f"--- ⚡ ENERGY AUDIT [Step {self.frame_count}] ---")
-        print(f"Status: {'✅' if abs(energy_error) < 1e-4 else '❌'} | Error: {energy_error:.4f}")
-
-        return energy_error
+        return AuditRecord(
+            step=self.frame_count, kind='energy', error=energy_error,
+            ok=abs(energy_error) < ENERGY_TOLERANCE, method='full', drift=drift,
+            breakdown={'heat': current_env_heat, 'bio_energy': current_agent_energy,
+                       'generated': self.total_energy_generated, 'radiated': self.heat_radiated})
         
-    def save_audit_report(self, mass_error, energy_error):
+    def save_audit_report(self, mass_record, energy_record):
         """Saves a detailed thermodynamic report to the run folder."""
-        report_path = os.path.join(self.logger.run_dir, "physics_audit.txt")
-        
-        # Calculate current states for the report
-        cur_env_mass = self._get_current_env_mass()
-        cur_bio_mass = self._get_current_bio_mass()
-        cur_heat = np.sum(self.fields.fields['heat'])
-        cur_agent_e = sum(a.energy for a in self.agents)
-
-        with open(report_path, "a") as f:
-            f.write(f"--- ⚖️ PHYSICS AUDIT [Step {self.frame_count}] ---\n")
-            
-            # MASS SECTION
-            f.write(f"  [MASS]\n")
-            f.write(f"    Error:     {mass_error:.12f}\n")
-            f.write(f"    Breakdown: Env: {cur_env_mass:.4f} | Bio: {cur_bio_mass:.4f}\n")
-            f.write(f"    Flow:      Sourced: {self.mass_sourced:.4f} | Decayed: {self.mass_decayed:.4f}\n")
-            
-            # ENERGY SECTION
-            f.write(f"  [ENERGY]\n")
-            f.write(f"    Error:     {energy_error:.12f}\n")
-            f.write(f"    Breakdown: Heat Field: {cur_heat:.4f} | Bio Energy: {cur_agent_e:.4f}\n")
-            f.write(f"    Flow:      Generated: {self.total_energy_generated:.4f} | Radiated: {self.heat_radiated:.4f}\n")
-            
-            f.write("-" * 40 + "\n")
+        write_audit_report(self.logger.run_dir, mass_record, energy_record)
+
+    def _init_metrics(self):
+        """Fixes the per-step metric columns and preallocates the row they fill."""
+        self.species_ids = list(self.cfg.SPECIES_CONFIGS.keys())
+        self.audit_every_step = getattr(self.cfg, 'AUDIT_EVERY_STEP', False)
+        columns, int_columns = metric_columns(self.species_ids, self.audit_every_step)
+        # Phase timings of the step being logged ('logging' itself is still running)
+        self._profile_offset = None
+        if self.profiler and getattr(self.cfg, 'PROFILE_COLUMNS', False):
+            self._profile_offset = len(columns)
+            columns += [f"time_{phase}_us" for phase in self.profiler.phases[:-1]]
+        self.metric_columns = columns
+        self._metric_row = np.zeros(len(columns))
+        # Per-species block: pop, avg_energy, avg_stored_mass, avg_age, then death counts
+        self._species_offset = columns.index(f"pop_{self.species_ids[0]}")
+        self._species_width = 4 + len(DEATH_CAUSES)
+        self.logger.set_columns(columns, int_columns)
+
+    def snapshot(self):
+        """
+        Read-only WorldSnapshot of the current step, built at most once per step
+        and shared by the metrics, audits, recorders and viewers.
+        """
+        if self._snapshot is not None and self._snapshot.step == self.frame_count:
+            return self._snapshot
+        if self.engine_mode == 'vectorized':
+            pool, n = self.agents, self.agents.size
+            columns = (pool.row[:n], pool.col[:n], pool.species[:n], pool.energy[:n],
+                       pool.stored_mass[:n], pool.internal_toxins[:n], pool.age[:n])
+        else:
+            index = {sid: s for s, sid in enumerate(self.species_ids)}
+            n = len(self.agents)
+            pos = np.fromiter((x for a in self.agents for x in a.pos), np.int64, 2 * n).reshape(n, 2)
+            columns = (pos[:, 0], pos[:, 1],
+                       np.fromiter((index[a.genome.species_id] for a in self.agents), np.int64, n),
+                       np.fromiter((a.energy for a in self.agents), np.float64, n),
+                       np.fromiter((a.stored_mass for a in self.agents), np.float64, n),
+                       np.fromiter((a.internal_toxins for a in self.agents), np.float64, n),
+                       np.fromiter((a.age_accumulated for a in self.agents), np.float64, n))
+        self._snapshot = WorldSnapshot.build(self.frame_count, self.species_ids, self.fields.fields, *columns)
+        return self._snapshot
 
     def _log_metrics(self):
-        # 1. Population Counts
-        species_stats = {}
-        for sid in config.SPECIES_CONFIGS.keys():
-            # Filter agents once per species for efficiency
-            s_agents = [a for a in self.agents if a.genome.species_id == sid]
-            count = len(s_agents)
-
-            species_stats[f"pop_{sid}"] = count
-            
-            # Averages
-            if count > 0:
-                species_stats[f"{sid}_avg_energy"] = np.mean([a.energy for a in s_agents])
-                species_stats[f"{sid}_avg_stored_mass"] = np.mean([a.stored_mass for a in s_agents])
-                species_stats[f"{sid}_avg_age"] = np.mean([a.age_accumulated for a in s_agents])
-            else:
-                species_stats[f"{sid}_avg_energy"] = 0
-                species_stats[f"{sid}_avg_stored_mass"] = 0
-                species_stats[f"{sid}_avg_age"] = 0
-            
-            # 2. Add per-species death metrics to the log
-            for cause, count in self.deaths[sid].items():
-                species_stats[f"{sid}_{cause}"] = count
-
-        # 3. Aggregate Global Log Data
-        log_data = {
-            "step": self.frame_count,
-            "total_population": len(self.agents),
-            "avg_age": np.mean([a.age_accumulated for a in self.agents]) if self.agents else 0
-        }
-        
-        # Merge species-specific data into the main log
-        log_data.update(species_stats)
-        self.logger.log_step(log_data)
+        snap = self.snapshot()
+        species, energy, stored, age = snap.species, snap.energy, snap.stored_mass, snap.age
+        n_species = len(self.species_ids)
+        row = self._metric_row
+
+        # 1. Global columns
+        row[0] = self.frame_count
+        row[1] = species.size
+        row[2] = np.mean(age) if species.size else 0
+        if self.audit_every_step:
+            # O(n_fields) residuals from the running ledgers
+            row[3] = self.mass_residual()
+            row[4] = self.energy_residual()
+
+        # 2. Per-species counts and averages in one grouped pass each
+        counts = np.bincount(species, minlength=n_species)
+        safe = np.maximum(counts, 1)
+        species_end = self._species_offset + n_species * self._species_width
+        block = row[self._species_offset:species_end].reshape(n_species, self._species_width)
+        block[:, 0] = counts
+        block[:, 1] = np.bincount(species, weights=energy, minlength=n_species) / safe
+        block[:, 2] = np.bincount(species, weights=stored, minlength=n_species) / safe
+        block[:, 3] = np.bincount(species, weights=age, minlength=n_species) / safe
+
+        # 3. Per-species death metrics
+        for s, sid in enumerate(self.species_ids):
+            block[s, 4:] = list(self.deaths[sid].values())
+
+        if self._profile_offset is not None:
+            row[self._profile_offset:] = self.profiler.current()[:-1] / 1e3
+
+        self.logger.log_row(row)
 
     @classmethod
-    def from_history(cls, run_folder):
-        """Reconstructs a simulation instance from a past run's metadata."""
+    def from_history(cls, run_folder, logger=None, step=0):
+        """
+        Reconstructs a simulation instance from a past run's metadata, advanced
+        to `step`. Starts from the nearest snapshot or checkpoint at or before
+        `step` when the run left one, so only the remainder is simulated.
+        """
         import json
         meta_path = os.path.join(run_folder, "metadata.json")
         
         with open(meta_path, 'r') as f:
             meta = json.load(f)
             
-        # 1. Temporarily set the global seed BEFORE creating the instance
-        # This ensures any random calls inside __init__ match the history
+        # 1. The seed (plus the run's RunConfig, if it had one) fixes every random stream
         active_seed = meta['seed']
-        np.random.seed(active_seed)
+        cfg = load_run_config(run_folder)
+        if logger is None:
+            logger = DataLogger(run_name=f"Replay_{meta['run_id']}", seed=active_seed, cfg=cfg)
         
         # 2. Create instance (This will run __init__ and _seed_species)
-        sim = cls(run_name=f"Replay_{meta['run_id']}")
-        
-        # 3. Explicitly ensure the instance seed matches
-        sim.active_seed = active_seed
-        
-        # NOTE: We no longer need to manually reset agents and re-call _seed_species
-        # because the __init__ call above already did it using the freshly set seed.
+        sim = cls(active_seed, logger, cfg=cfg)
+
+        # 3. Seek, then simulate the remainder
+        seek = nearest_seek_point(run_folder, step) if step else None
+        if seek is not None:
+            restore_state(sim, *read_checkpoint(seek[1]))
+        while sim.frame_count < step:
+            sim.step()
             
-        print(f"--- Replay Initialized from Seed: {sim.active_seed} ---")
+        print(f"--- Replay Initialized from Seed: {sim.active_seed} at Step {sim.frame_count} ---")
         return sim
     
+    def save_checkpoint(self):
+        """Writes a full-state checkpoint into the run folder. Returns its path."""
+        return write_checkpoint(self, keep=getattr(self.cfg, 'CHECKPOINT_KEEP', None))
+
+    def save_snapshot(self):
+        """Leaves a permanent seek point for replays. Returns its path."""
+        return write_snapshot(self)
+
+    @classmethod
+    def resume(cls, run_folder, checkpoint=None):
+        """
+        Continues a run bit for bit from `checkpoint` (default: the latest one
+        in `run_folder`). Logging picks up in the same folder.
+        """
+        path = checkpoint or latest_checkpoint(run_folder)
+        if path is None:
+            raise FileNotFoundError(f"No checkpoint found in {run_folder}")
+        arrays, state = read_checkpoint(path)
+        cfg = load_run_config(run_folder)
+        logger = DataLogger.resume(run_folder, state['logger'], cfg=cfg)
+        sim = cls(state['seed'], logger, cfg=cfg)
+        restore_state(sim, arrays, state)
+        return sim
+
     # ... (Include check_mass_integrity, check_energy_integrity, save_audit_report here) ...
\ No newline at end of file
@@ -0,0 +1,190 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import os
+import json
+import time
+import traceback
+from datetime import datetime
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+import numpy as np
+
+from src.logger import FileSystemManager
+from src.run_config import RunConfig
+
+MANIFEST_FILE = "manifest.json"
+REPEAT_LOG = "run.log"
+
+
+def ensemble_seeds(base_seed, n):
+    """N independent simulation seeds derived from one base seed."""
+    return [int(s) for s in np.random.SeedSequence(base_seed).generate_state(n)]
+
+
+def run_repeat(index, seed, run_dir, steps, cfg):
+    """
+    Worker: runs one repeat with settings `cfg` into `run_dir`, with its console
+    output going to run_dir/run.log. Errors are caught and reported, never
+    raised, so one failed repeat cannot take the others down.
+    """
+    os.makedirs(run_dir, exist_ok=True)
+    entry = {'index': index, 'seed': seed, 'run_dir': os.path.basename(run_dir)}
+    start = time.perf_counter()
+    with open(os.path.join(run_dir, REPEAT_LOG), 'w') as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            from src.logger import DataLogger
+            from src.engine import Simulation
+            from src.runner import headless_loop
+
+            sim = Simulation(seed, DataLogger(seed=seed, run_dir=run_dir, cfg=cfg), cfg=cfg)
+            mass, energy = headless_loop(sim, steps)
+            entry.update(status='ok', steps=sim.frame_count, final_population=int(sim.snapshot().size),
+                         mass_ok=bool(mass.ok), energy_ok=bool(energy.ok))
+        except Exception as e:
+            traceback.print_exc()
+            entry.update(status='failed', error=f"{type(e).__name__}: {e}")
+    entry['seconds'] = time.perf_counter() - start
+    return entry
+
+
+def run_batch(repeats):
+    """
+    Worker: runs `repeats` [(index, seed, run_dir, steps, cfg), ...] of one
+    configuration as a single BatchedSimulation. Each repeat still logs into its
+    own run_dir, with its console output in run_dir/run.log. An error fails the
+    whole batch and is reported in every repeat's entry and log.
+    """
+    steps, cfg = repeats[0][3], repeats[0][4]
+    entries, logs = [], []
+    for index, seed, run_dir, *_ in repeats:
+        os.makedirs(run_dir, exist_ok=True)
+        entries.append({'index': index, 'seed': seed, 'run_dir': os.path.basename(run_dir),
+                        'batch': len(repeats)})
+        logs.append(open(os.path.join(run_dir, REPEAT_LOG), 'w'))
+    start = time.perf_counter()
+    try:
+        from src.logger import DataLogger
+        from src.batch import BatchedSimulation
+        from src.runner import batch_headless_loop
+
+        loggers = [DataLogger(seed=seed, run_dir=run_dir, cfg=cfg) for _, seed, run_dir, *_ in repeats]
+        batch = BatchedSimulation([seed for _, seed, *_ in repeats], loggers, cfg=cfg)
+        records = batch_headless_loop(batch, steps, logs=logs)
+        population = batch.population()
+        for u, entry in enumerate(entries):
+            mass, energy = records[u]
+            entry.update(status='ok', steps=batch.loggers[u].total_steps, final_population=int(population[u]),
+                         mass_ok=bool(mass.ok), energy_ok=bool(energy.ok))
+    except Exception as e:
+        for log, entry in zip(logs, entries):
+            traceback.print_exc(file=log)
+            entry.update(status='failed', error=f"{type(e).__name__}: {e}")
+    finally:
+        for log in logs:
+            log.close()
+    seconds = time.perf_counter() - start
+    for entry in entries:
+        entry['seconds'] = seconds
+    return entries
+
+
+def _batches(tasks, size):
+    """Splits tasks into runs of up to `size` consecutive keys sharing steps and config."""
+    batches = []
+    for key, args in tasks.items():
+        last = batches[-1] if batches else None
+        if (last is None or len(last) == size
+                or tasks[last[0]][3:] != args[3:]):
+            batches.append([key])
+        else:
+            last.append(key)
+    return batches
+
+
+def run_repeats(tasks, workers, on_result, batch=1):
+    """
+    Runs `tasks` {key: (index, seed, run_dir, steps, cfg)} on a spawn-based
+    pool of `workers` processes, calling on_result(key, entry) in the parent
+    as each one finishes. With `batch` > 1, up to `batch` consecutive repeats
+    of the same configuration share a worker as one BatchedSimulation.
+    """
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+        if batch > 1:
+            futures = {pool.submit(run_batch, [tasks[key] for key in keys]): keys
+                       for keys in _batches(tasks, batch)}
+        else:
+            futures = {pool.submit(run_repeat, *args): [key] for key, args in tasks.items()}
+        for future in as_completed(futures):
+            keys = futures[future]
+            try:
+                entries = future.result()
+                if batch <= 1:
+                    entries = [entries]
+            except BrokenProcessPool as e:
+                # A worker died outright (e.g. killed for memory); its siblings are lost with it
+                entries = [{'index': tasks[key][0], 'seed': tasks[key][1],
+                            'run_dir': os.path.basename(tasks[key][2]),
+                            'status': 'crashed', 'error': str(e)} for key in keys]
+            for key, entry in zip(keys, entries):
+                on_result(key, entry)
+
+
+def write_manifest(case_dir, manifest):
+    path = os.path.join(case_dir, MANIFEST_FILE)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(path + ".tmp", path)
+
+
+def run_ensemble(n, workers=None, base_seed=0, name="Ensemble", steps=None, case_dir=None, cfg=None,
+                 batch=1):
+    """
+    Runs `n` seeds of one configuration (`cfg`, default: a RunConfig of the
+    config module as it is now) on a pool of `workers` processes, `batch`
+    seeds per BatchedSimulation.
+    Repeat i is logged into <case>/<i>/ (the layout plot_case reads), and
+    <case>/manifest.json records every repeat's seed, status and timing as
+    repeats finish. Returns (case_dir, manifest).
+    """
+    cfg = cfg if cfg is not None else RunConfig.from_module()
+    steps = steps or cfg.MAX_STEPS_HEADLESS
+    workers = workers or os.cpu_count() or 1
+    fs = FileSystemManager()
+    if case_dir is None:
+        case_dir = fs.create_run_folder(name)
+    else:
+        os.makedirs(case_dir, exist_ok=True)
+    fs.snapshot_config(case_dir, cfg)
+
+    seeds = ensemble_seeds(base_seed, n)
+    manifest = {
+        'name': name,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'base_seed': base_seed,
+        'seeds': seeds,
+        'steps': steps,
+        'workers': workers,
+        'batch': batch,
+        'repeats': [{'index': i, 'seed': seed, 'run_dir': str(i), 'status': 'pending'}
+                    for i, seed in enumerate(seeds)],
+    }
+    write_manifest(case_dir, manifest)
+
+    def on_result(i, entry):
+        manifest['repeats'][i] = entry
+        write_manifest(case_dir, manifest)
+        print(f"  [{entry['status'].upper()}] repeat {i} (seed {entry['seed']})"
+              + (f" in {entry['seconds']:.1f}s" if 'seconds' in entry else ""))
+
+    start = time.perf_counter()
+    run_repeats({i: (i, seed, os.path.join(case_dir, str(i)), steps, cfg) for i, seed in enumerate(seeds)},
+                workers, on_result, batch)
+    manifest['seconds'] = time.perf_counter() - start
+    write_manifest(case_dir, manifest)
+    return case_dir, manifest
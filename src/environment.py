@@ -5,77 +5,293 @@
 # the Free Software Foundation.
 
 import numpy as np
+from scipy import ndimage
 from scipy.signal import convolve2d
 import config
 
+FIELD_LAYOUTS = ('stacked', 'separate')
+DIFFUSION_BACKENDS = ('direct', 'stencil', 'fft')
+# 'auto' picks the stencil up to this many cells; past it the grid no longer
+# fits in cache and the direct convolution's single pass wins (measured).
+AUTO_STENCIL_MAX_CELLS = 640 * 640
+
+
+def kernel_power(kernel, steps):
+    """Footprint of `steps` successive applications of a diffusion kernel."""
+    result = kernel
+    for _ in range(steps - 1):
+        result = convolve2d(result, kernel, mode='full')
+    return result
+
+
+def diffusion_kernel(rate):
+    """Builds a 3x3 diffusion kernel that conserves mass."""
+    diag = rate / 2
+    center = 1.0 - (4 * rate) - (4 * diag)
+    return np.array([
+        [diag, rate,   diag],
+        [rate, center, rate],
+        [diag, rate,   diag]
+    ])
+
+
+class DirectDiffusion:
+    """Periodic scipy convolution with the kernel (the reference backend)."""
+    in_place = False
+
+    def __init__(self, kernel, shape, steps=1, batch=()):
+        self.kernel = kernel_power(kernel, steps)
+        # Batched (..., H, W) fields convolve with a kernel that is flat along the batch axes
+        self._nd_kernel = self.kernel.reshape((1,) * len(batch) + self.kernel.shape)
+
+    def apply(self, field, out=None):
+        if out is None:
+            return convolve2d(field, self.kernel, mode='same', boundary='wrap')
+        ndimage.convolve(field, self._nd_kernel, output=out, mode='grid-wrap')
+        return out
+
+
+class StencilDiffusion:
+    """
+    3x3 stencil built from shifted slices of a wrapped halo buffer.
+    The field is copied into the halo first, so `out` may be the field itself.
+    A multi-step update simply repeats the stencil. With `batch` leading
+    dimensions, every (H, W) plane of a (*batch, H, W) field is its own torus.
+    """
+    in_place = True
+
+    def __init__(self, kernel, shape, steps=1, batch=()):
+        h, w = shape
+        lead = tuple(batch)
+        self.steps = steps
+        self.center, self.edge, self.diag = kernel[1, 1], kernel[0, 1], kernel[0, 0]
+        self._halo = np.empty(lead + (h + 2, w + 2))
+        self._vertical = np.empty(lead + (h, w + 2))
+        self._tmp = np.empty(lead + (h, w))
+
+    def apply(self, field, out=None):
+        if out is None:
+            out = np.empty_like(field)
+        self._pass(field, out)
+        for _ in range(self.steps - 1):
+            self._pass(out, out)
+        return out
+
+    def _pass(self, field, out):
+        halo, vert, tmp = self._halo, self._vertical, self._tmp
+
+        # Wrap the torus into a one-cell halo (rows first, then columns incl. corners)
+        halo[..., 1:-1, 1:-1] = field
+        halo[..., 0, 1:-1] = field[..., -1, :]
+        halo[..., -1, 1:-1] = field[..., 0, :]
+        halo[..., 0] = halo[..., -2]
+        halo[..., -1] = halo[..., 1]
+        core = halo[..., 1:-1, 1:-1]
+
+        # North + South for every column; shifting it sideways gives the diagonals
+        np.add(halo[..., :-2, :], halo[..., 2:, :], out=vert)
+        np.add(vert[..., :-2], vert[..., 2:], out=tmp)
+        np.multiply(tmp, self.diag, out=tmp)
+        # East + West + North + South
+        np.add(halo[..., 1:-1, :-2], halo[..., 1:-1, 2:], out=out)
+        np.add(out, vert[..., 1:-1], out=out)
+        np.multiply(out, self.edge, out=out)
+        np.add(out, tmp, out=out)
+        np.multiply(core, self.center, out=tmp)
+        np.add(out, tmp, out=out)
+
+
+class FFTDiffusion:
+    """
+    Multiplies the field spectrum by the kernel's precomputed spectrum.
+    Exact for periodic domains; `steps` applications cost the same as one
+    because the k-step spectrum is just the 1-step spectrum to the k-th power.
+    The transforms run over the last two axes, so batched fields need nothing extra.
+    """
+    in_place = False
+
+    def __init__(self, kernel, shape, steps=1, batch=()):
+        self.shape = tuple(shape)
+        # Embed the kernel centred on cell (0, 0), folding it onto the torus
+        kh, kw = kernel.shape
+        rows = (np.arange(kh) - kh // 2) % self.shape[0]
+        cols = (np.arange(kw) - kw // 2) % self.shape[1]
+        embedded = np.zeros(self.shape)
+        np.add.at(embedded, np.ix_(rows, cols), kernel)
+        self.spectrum = np.fft.rfft2(embedded) ** steps
+
+    def apply(self, field, out=None):
+        result = np.fft.irfft2(np.fft.rfft2(field) * self.spectrum, s=self.shape)
+        if out is None:
+            return result
+        out[...] = result
+        return out
+
+
+BACKEND_CLASSES = {'direct': DirectDiffusion, 'stencil': StencilDiffusion, 'fft': FFTDiffusion}
+
+
+def build_backend(name, choice, kernel, shape, steps, batch=()):
+    """
+    Instance of the diffusion backend `choice` for field `name` on a periodic
+    `shape` grid; 'auto' picks one by grid size and update interval.
+    """
+    if choice == 'auto':
+        cells = shape[0] * shape[1]
+        if steps > 1:
+            choice = 'fft'  # Cost does not grow with the k-step footprint
+        else:
+            choice = 'stencil' if cells <= AUTO_STENCIL_MAX_CELLS else 'direct'
+    if choice not in BACKEND_CLASSES:
+        raise ValueError(f"Unknown diffusion_backend '{choice}' for {name}. "
+                         f"Use 'auto' or one of {DIFFUSION_BACKENDS}")
+    return BACKEND_CLASSES[choice](kernel, shape, steps, batch=batch)
+
 class FieldManager:
-    def __init__(self, shape):
+    """
+    The fields of one universe, or with `batch=B` of B universes in lockstep:
+    then the stacked buffer is (B, n_fields, H, W), every field is a (B, H, W)
+    view, and the losses booked to sim.ledger are (B,) arrays.
+    """
+    def __init__(self, shape, layout=None, cfg=None, batch=None):
         self.shape = shape
+        self.cfg = cfg if cfg is not None else config
+        self.batch = batch
+        self.layout = layout or getattr(self.cfg, 'FIELD_LAYOUT', 'stacked')
+        if self.layout not in FIELD_LAYOUTS:
+            raise ValueError(f"Unknown FIELD_LAYOUT '{self.layout}'. Use one of {FIELD_LAYOUTS}")
+        if batch is not None and self.layout != 'stacked':
+            raise ValueError("A batch of universes needs the 'stacked' FIELD_LAYOUT")
+        lead = () if batch is None else (batch,)
+        # Per-universe totals sum each (H, W) plane; a lone universe sums everything
+        self._sum_axes = None if batch is None else (-2, -1)
+        self.names = list(self.cfg.FIELD_CONFIGS.keys())
         self.fields = {}
         self.kernels = {}
+        self.backends = {}
+        self.intervals = {}
+        self.decay_factors = {}
+        self.ticks = 0  # Number of update() calls so far
         
+        if self.layout == 'stacked':
+            # One contiguous (n_fields, H, W) tensor; self.fields holds views into it,
+            # so every physics pass must write in place and never rebind a field.
+            self.data = np.empty(lead + (len(self.names),) + tuple(shape), dtype=np.float64)
+            self._scratch = np.empty(lead + tuple(shape), dtype=np.float64)
+
         # Initialize fields and their unique kernels based on config
-        for name, specs in config.FIELD_CONFIGS.items():
+        for idx, (name, specs) in enumerate(self.cfg.FIELD_CONFIGS.items()):
             # Use float64 for thermodynamic precision
-            self.fields[name] = np.full(shape, specs['init_value'], dtype=np.float64)
+            if self.layout == 'stacked':
+                self.fields[name] = self.data[..., idx, :, :]
+                self.fields[name].fill(specs['init_value'])
+            else:
+                self.fields[name] = np.full(shape, specs['init_value'], dtype=np.float64)
             self.kernels[name] = self._build_kernel(specs['diffusion'])
 
+            # Slow fields advance every k steps with a k-step kernel and compounded decay
+            k = int(specs.get('update_interval', 1))
+            if k < 1:
+                raise ValueError(f"update_interval for {name} must be >= 1, got {k}")
+            self.intervals[name] = k
+            self.decay_factors[name] = (1 - specs.get('decay', 0.0)) ** k
+            self.backends[name] = self._build_backend(name, self.kernels[name], k)
+
+    def _build_backend(self, name, kernel, steps):
+        """Resolves a field's 'diffusion_backend' ('auto' by default) to an instance."""
+        batch = () if self.batch is None else (self.batch,)
+        return build_backend(name, self.cfg.FIELD_CONFIGS[name].get('diffusion_backend', 'auto'),
+                             kernel, self.shape, steps, batch=batch)
+
     def _build_kernel(self, rate):
-        """Builds a 3x3 diffusion kernel that conserves mass."""
-        diag = rate / 2
-        center = 1.0 - (4 * rate) - (4 * diag)
-        return np.array([
-            [diag, rate,   diag],
-            [rate, center, rate],
-            [diag, rate,   diag]
-        ])
+        return diffusion_kernel(rate)
+
+    def _book_loss(self, name, loss, sim, field_change):
+        """Credits matter/energy leaving a field to the right ledger flow."""
+        sim.ledger.book('heat_radiated' if name == 'heat' else 'mass_decayed', loss)
+        sim.ledger.move_field(name, field_change)
 
     def update(self, sim):
         """Processes the physics of the world: Diffusion and Decay."""
-        for name in self.fields:
-            # 1. DIFFUSION
-            self.fields[name] = convolve2d(
-                self.fields[name], 
-                self.kernels[name], 
-                mode='same', 
-                boundary='wrap'
-            )
-            
-            # 2. DECAY / RADIATION
-            decay_rate = config.FIELD_CONFIGS[name].get('decay', 0.0)
-            if decay_rate > 0:
-                pre_decay_sum = np.sum(self.fields[name])
-                self.fields[name] *= (1 - decay_rate)
-                loss = pre_decay_sum - np.sum(self.fields[name])
-                
-                if name == 'heat':
-                    sim.heat_radiated += loss
-                else:
-                    sim.mass_decayed += loss
-            
-            # 3. FLOORING (The Ledger Guard)
-            # If any negative values exist (precision errors), they must be accounted for
-            neg_mask = self.fields[name] < 0
-            if np.any(neg_mask):
-                # Calculate the "phantom mass/energy" about to be floored to zero
-                phantom_loss = -np.sum(self.fields[name][neg_mask])
-                
-                if name == 'heat':
-                    sim.heat_radiated += phantom_loss
-                else:
-                    sim.mass_decayed += phantom_loss
-                
-                self.fields[name][neg_mask] = 0.0
+        self.ticks += 1
+        for name in self.names:
+            # Fields with update_interval k only advance on every k-th call
+            if self.ticks % self.intervals[name]:
+                continue
+            if self.layout == 'stacked':
+                self._update_in_place(name, sim)
+            else:
+                self._update_separate(name, sim)
+
+    def _update_separate(self, name, sim):
+        # 1. DIFFUSION
+        self.fields[name] = self.backends[name].apply(self.fields[name])
+        
+        # 2. DECAY / RADIATION
+        if self.decay_factors[name] < 1:
+            pre_decay_sum = np.sum(self.fields[name])
+            self.fields[name] *= self.decay_factors[name]
+            loss = pre_decay_sum - np.sum(self.fields[name])
+            self._book_loss(name, loss, sim, -loss)
+        
+        # 3. FLOORING (The Ledger Guard)
+        # If any negative values exist (precision errors), they must be accounted for
+        neg_mask = self.fields[name] < 0
+        if np.any(neg_mask):
+            # Calculate the "phantom mass/energy" about to be floored to zero
+            phantom_loss = -np.sum(self.fields[name][neg_mask])
+            self._book_loss(name, phantom_loss, sim, phantom_loss)
+            self.fields[name][neg_mask] = 0.0
+
+    def _update_in_place(self, name, sim):
+        """Stacked layout: the same physics without allocating per-step arrays."""
+        field = self.fields[name]
+
+        # 1. DIFFUSION (straight into the view, or via preallocated scratch)
+        backend = self.backends[name]
+        if backend.in_place:
+            backend.apply(field, out=field)
+        else:
+            backend.apply(field, out=self._scratch)
+            field[...] = self._scratch
+
+        # 2. DECAY / RADIATION
+        # What leaves is exactly (1 - factor) x total, so one sum prices the decay
+        factor = self.decay_factors[name]
+        if factor < 1:
+            total = np.sum(field, axis=self._sum_axes)
+            field *= factor
+            loss = total * (1 - factor)
+            self._book_loss(name, loss, sim, -loss)
+
+        # 3. FLOORING (The Ledger Guard)
+        # A min() check costs no temporary; the mask is only built when needed
+        if field.min() < 0:
+            neg_mask = field < 0
+            if self.batch is None:
+                phantom_loss = -np.sum(field[neg_mask])
+            else:
+                phantom_loss = -np.sum(field, axis=self._sum_axes, where=neg_mask)
+            self._book_loss(name, phantom_loss, sim, phantom_loss)
+            field[neg_mask] = 0.0
+
+SCHEDULE_KINDS = ('constant', 'seasonal', 'pulse')
+
 
 class SourceController:
-    def __init__(self, shape):
+    def __init__(self, shape, rng=None, cfg=None):
         self.shape = shape
+        self.cfg = cfg if cfg is not None else config
+        # Random stream for procedural placement (owned by the Simulation)
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.active_sources = []
+        self.ticks = 0  # Number of apply() calls so far
         self._initialize_procedural_sources()
+        self._compile_injections()
 
     def _initialize_procedural_sources(self):
         """Resolves config sources into fixed or global injection points."""
-        for entry in config.SOURCES:
+        for entry in self.cfg.SOURCES:
             field = entry['field']
             stype = entry['type']
             
@@ -89,44 +305,188 @@ class SourceController:
                     if count == 1 and 'pos' in entry:
                         pos = entry['pos']
                     else:
-                        pos = (np.random.randint(0, self.shape[0]), 
-                               np.random.randint(0, self.shape[1]))
+                        pos = (int(self.rng.integers(0, self.shape[0])), 
+                               int(self.rng.integers(0, self.shape[1])))
                     
                     amount = entry['amount']
                     if 'range' in entry:
-                        amount = np.random.uniform(*entry['range'])
+                        amount = self.rng.uniform(*entry['range'])
                         
-                    self.active_sources.append({
+                    vent = {
                         'field': field,
                         'type': 'vent',
                         'pos': pos,
                         'amount': amount
-                    })
+                    }
+                    if 'schedule' in entry:
+                        vent['schedule'] = entry['schedule']
+                    self.active_sources.append(vent)
+
+    def _compile_injections(self):
+        """
+        Folds every active source into one injection per (field, schedule).
+        Rain and vents sharing a field and schedule become a single dense map;
+        vents alone stay a sparse (rows, cols, amounts) triple with merged duplicates.
+        The mass each injection adds per step is precomputed for the ledger.
+        """
+        h, w = self.shape
+        schedules = [None]  # Index 0 is the constant schedule
+        groups = {}
+        for src in self.active_sources:
+            sched = src.get('schedule')
+            if sched not in schedules:
+                schedules.append(sched)
+            group = groups.setdefault((src['field'], schedules.index(sched)), {'rain': 0.0, 'vents': {}})
+            if src['type'] == 'rain':
+                group['rain'] += src['amount']
+            elif src['type'] == 'vent':
+                r, c = src['pos']
+                if 0 <= r < h and 0 <= c < w:
+                    group['vents'][(r, c)] = group['vents'].get((r, c), 0.0) + src['amount']
+
+        self.injections = []
+        for (field, sched_idx), group in groups.items():
+            cells = np.array(list(group['vents'].keys()), dtype=np.int64).reshape(-1, 2)
+            amounts = np.array(list(group['vents'].values()), dtype=np.float64)
+            injection = {
+                'field': field,
+                'schedule': sched_idx,
+                'rain': group['rain'],
+                'dense': None,
+                'rows': cells[:, 0],
+                'cols': cells[:, 1],
+                'amounts': amounts,
+                'total': group['rain'] * h * w + np.sum(amounts),
+            }
+            if group['rain'] and amounts.size:
+                dense = np.full(self.shape, group['rain'])
+                dense[injection['rows'], injection['cols']] += amounts
+                injection['dense'] = dense
+            self.injections.append(injection)
+
+        self._compile_schedules(schedules[1:])
+
+    def crop_rows(self, r0, r1):
+        """
+        Keeps only what the injections put into rows r0..r1-1, shifted so row r0
+        becomes row 0: apply() then feeds the (r1 - r0, W) row band of every
+        field (one tile of a decomposed grid, see src/domain.py) and books only
+        that band's share.
+        """
+        w = self.shape[1]
+        for inj in self.injections:
+            inside = (inj['rows'] >= r0) & (inj['rows'] < r1)
+            inj['rows'] = inj['rows'][inside] - r0
+            inj['cols'] = inj['cols'][inside]
+            inj['amounts'] = inj['amounts'][inside]
+            if inj['dense'] is not None:
+                inj['dense'] = inj['dense'][r0:r1].copy()
+            inj['total'] = inj['rain'] * (r1 - r0) * w + np.sum(inj['amounts'])
+
+    def _compile_schedules(self, schedules):
+        """Builds the parameter table evaluated for every schedule at once."""
+        kinds = ['constant'] + [sched.get('type', 'constant') for sched in schedules]
+        for kind in kinds:
+            if kind not in SCHEDULE_KINDS:
+                raise ValueError(f"Unknown source schedule '{kind}'. Use one of {SCHEDULE_KINDS}")
+        params = [{}] + list(schedules)
+        self._sched_kind = np.array([SCHEDULE_KINDS.index(k) for k in kinds])
+        self._sched_period = np.array([float(p.get('period', 1)) for p in params])
+        self._sched_phase = np.array([float(p.get('phase', 0.0)) for p in params])
+        self._sched_amplitude = np.array([float(p.get('amplitude', 0.0)) for p in params])
+        self._sched_duty = np.array([float(p.get('duty', 1.0)) for p in params])
+        if np.any(np.abs(self._sched_amplitude) > 1.0):
+            raise ValueError("Seasonal amplitude must lie in [-1, 1] so sources never turn negative")
+
+    def schedule_multipliers(self, step):
+        """Strength of every schedule at `step` (1.0 = the configured amount)."""
+        period = self._sched_period
+        cycle = ((step + self._sched_phase * period) % period) / period
+        seasonal = 1.0 + self._sched_amplitude * np.sin(2 * np.pi * cycle)
+        pulse = (cycle < self._sched_duty).astype(np.float64)
+        return np.select([self._sched_kind == 1, self._sched_kind == 2], [seasonal, pulse], 1.0)
 
     def apply(self, fields_dict, sim):
         """Injects new mass/energy into the system and logs to ledger."""
-        for src in self.active_sources:
-            field_name = src['field']
+        self.ticks += 1
+        strength = self.schedule_multipliers(self.ticks)
+        for inj in self.injections:
+            field_name = inj['field']
             if field_name not in fields_dict:
                 continue
+            m = strength[inj['schedule']]
+            if m == 0.0:
+                continue
+            field = fields_dict[field_name]
             
-            amount_to_add = 0.0
-            
-            if src['type'] == 'rain':
-                # Rain adds amount to EVERY cell
-                added = src['amount'] * self.shape[0] * self.shape[1]
-                fields_dict[field_name] += src['amount']
-                amount_to_add = added
-                
-            elif src['type'] == 'vent':
-                r, c = src['pos']
-                if 0 <= r < self.shape[0] and 0 <= c < self.shape[1]:
-                    fields_dict[field_name][r, c] += src['amount']
-                    amount_to_add = src['amount']
+            if inj['dense'] is not None:
+                # Rain and vents together: one fused add of the injection map
+                field += inj['dense'] if m == 1.0 else m * inj['dense']
+            else:
+                if inj['rain']:
+                    # Rain adds amount to EVERY cell
+                    field += m * inj['rain']
+                if inj['amounts'].size:
+                    field[inj['rows'], inj['cols']] += m * inj['amounts']
             
             # Update the ledger (exclude heat from mass sourcing)
+            sim.ledger.move_field(field_name, m * inj['total'])
             if field_name != 'heat':
-                sim.mass_sourced += amount_to_add
+                sim.ledger.book('mass_sourced', m * inj['total'])
+
+
+class BatchedSources:
+    """
+    The sources of a batch of universes, injected into (B, H, W) fields at once.
+    Built from one SourceController per universe, so each universe places its
+    vents with its own stream; their compiled injections line up one to one
+    because the universes share a config. The ledger is booked (B,) arrays.
+    """
+    def __init__(self, controllers):
+        self.controllers = list(controllers)
+        self.ticks = 0  # Number of apply() calls so far
+        self.injections = []
+        first = self.controllers[0]
+        for k, inj in enumerate(first.injections):
+            group = [c.injections[k] for c in self.controllers]
+            if any((g['field'], g['schedule'], g['dense'] is None) != (inj['field'], inj['schedule'],
+                                                                       inj['dense'] is None)
+                   for g in group):
+                raise ValueError("Universes of a batch must share their source configuration")
+            self.injections.append({
+                'field': inj['field'],
+                'schedule': inj['schedule'],
+                'rain': inj['rain'],
+                'dense': None if inj['dense'] is None else np.stack([g['dense'] for g in group]),
+                'universes': np.concatenate([np.full(g['rows'].size, u, dtype=np.int64)
+                                             for u, g in enumerate(group)]),
+                'rows': np.concatenate([g['rows'] for g in group]),
+                'cols': np.concatenate([g['cols'] for g in group]),
+                'amounts': np.concatenate([g['amounts'] for g in group]),
+                'total': np.array([g['total'] for g in group]),
+            })
+
+    def apply(self, fields_dict, sim):
+        """Injects every universe's sources, one array operation per injection."""
+        self.ticks += 1
+        strength = self.controllers[0].schedule_multipliers(self.ticks)
+        for inj in self.injections:
+            field_name = inj['field']
+            if field_name not in fields_dict:
+                continue
+            m = strength[inj['schedule']]
+            if m == 0.0:
+                continue
+            field = fields_dict[field_name]
+
+            if inj['dense'] is not None:
+                field += inj['dense'] if m == 1.0 else m * inj['dense']
             else:
-                # If you decide to track heat sourcing later
-                pass
\ No newline at end of file
+                if inj['rain']:
+                    field += m * inj['rain']
+                if inj['amounts'].size:
+                    field[inj['universes'], inj['rows'], inj['cols']] += m * inj['amounts']
+
+            sim.ledger.move_field(field_name, m * inj['total'])
+            if field_name != 'heat':
+                sim.ledger.book('mass_sourced', m * inj['total'])
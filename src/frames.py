@@ -0,0 +1,214 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import os
+import glob
+import json
+from types import SimpleNamespace
+import numpy as np
+
+from src.snapshot import WorldSnapshot
+
+FRAMES_DIR = "frames"
+FRAMES_META = "meta.json"
+FRAMES_VERSION = 1
+
+
+def downsample(field, factor):
+    """Block mean over factor x factor tiles (edge rows/cols that don't fill a block are dropped)."""
+    if factor == 1:
+        return field
+    h, w = (field.shape[0] // factor) * factor, (field.shape[1] // factor) * factor
+    return field[:h, :w].reshape(h // factor, factor, w // factor, factor).mean(axis=(1, 3))
+
+
+def has_frames(run_dir):
+    return os.path.exists(os.path.join(run_dir, FRAMES_DIR, FRAMES_META))
+
+
+class FrameRecorder:
+    """
+    Records what the renderer needs every `stride` steps: downsampled fields
+    quantized to uint8 (with one float scale per field and frame), agent
+    positions, species and energy, and the death counters.
+    Frames are buffered and written as compressed chunk files
+    (frames/chunk_<first step>.npz), each one atomically.
+    """
+    def __init__(self, run_dir, sim, stride, factor=1, fields=None, chunk_frames=64):
+        self.path = os.path.join(run_dir, FRAMES_DIR)
+        os.makedirs(self.path, exist_ok=True)
+        self.stride = stride
+        self.factor = factor
+        self.fields = list(fields or sim.fields.names)
+        self.species_ids = list(sim.deaths)
+        self.causes = list(next(iter(sim.deaths.values())))
+        self.chunk_frames = chunk_frames
+        self._pending = []
+
+        meta = {
+            "version": FRAMES_VERSION,
+            "shape": list(sim.shape),
+            "stride": stride,
+            "downsample": factor,
+            "fields": self.fields,
+            "species": self.species_ids,
+            "causes": self.causes,
+        }
+        with open(os.path.join(self.path, FRAMES_META), 'w') as f:
+            json.dump(meta, f, indent=4)
+        # A resumed run rewinds the stream to the step it restarts from
+        self._truncate_after(sim.frame_count)
+
+    def _truncate_after(self, step):
+        for path in sorted(glob.glob(os.path.join(self.path, "chunk_*.npz"))):
+            with np.load(path) as data:
+                chunk = {name: data[name] for name in data.files}
+            keep = chunk['steps'] <= step
+            if keep.all():
+                continue
+            os.remove(path)
+            if keep.any():
+                frames = [self._frame_from_chunk(chunk, i) for i in np.flatnonzero(keep)]
+                self._write_chunk(frames)
+
+    def maybe_record(self, sim):
+        if sim.frame_count % self.stride == 0:
+            self.record(sim)
+
+    def record(self, sim):
+        """Captures the current state of `sim` as one frame."""
+        stack = np.stack([downsample(sim.snapshot().fields[name], self.factor) for name in self.fields])
+        scales = np.maximum(stack.reshape(len(self.fields), -1).max(axis=1), 1e-12)
+        quantized = np.rint(np.clip(stack, 0.0, None) / scales[:, None, None] * 255).astype(np.uint8)
+
+        snap = sim.snapshot()
+        self._pending.append({
+            'step': sim.frame_count,
+            'fields': quantized,
+            'scales': scales.astype(np.float32),
+            'rows': snap.rows.astype(np.uint16),
+            'cols': snap.cols.astype(np.uint16),
+            'species': snap.species.astype(np.uint8),
+            'energy': snap.energy.astype(np.float32),
+            'deaths': np.array([[sim.deaths[sid][c] for c in self.causes] for sid in self.species_ids],
+                               dtype=np.int64),
+        })
+        if len(self._pending) >= self.chunk_frames:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._write_chunk(self._pending)
+            self._pending = []
+
+    def _write_chunk(self, frames):
+        offsets = np.cumsum([0] + [f['rows'].size for f in frames])
+        chunk = {
+            'steps': np.array([f['step'] for f in frames], dtype=np.int64),
+            'fields': np.stack([f['fields'] for f in frames]),
+            'scales': np.stack([f['scales'] for f in frames]),
+            'deaths': np.stack([f['deaths'] for f in frames]),
+            'offsets': offsets,
+        }
+        for key in ('rows', 'cols', 'species', 'energy'):
+            chunk[key] = np.concatenate([f[key] for f in frames])
+
+        path = os.path.join(self.path, f"chunk_{frames[0]['step']:010d}.npz")
+        with open(path + ".tmp", 'wb') as f:
+            np.savez_compressed(f, **chunk)
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def _frame_from_chunk(chunk, i):
+        lo, hi = chunk['offsets'][i], chunk['offsets'][i + 1]
+        frame = {'step': int(chunk['steps'][i])}
+        for key in ('fields', 'scales', 'deaths'):
+            frame[key] = chunk[key][i]
+        for key in ('rows', 'cols', 'species', 'energy'):
+            frame[key] = chunk[key][lo:hi]
+        return frame
+
+
+class FrameReader:
+    """Random access to a recorded frame stream. Chunks are decompressed on first use."""
+    def __init__(self, run_dir):
+        self.path = os.path.join(run_dir, FRAMES_DIR)
+        with open(os.path.join(self.path, FRAMES_META)) as f:
+            self.meta = json.load(f)
+        self.chunks = sorted(glob.glob(os.path.join(self.path, "chunk_*.npz")))
+        steps, where = [], []
+        for c, path in enumerate(self.chunks):
+            with np.load(path) as data:
+                chunk_steps = data['steps']
+            steps.append(chunk_steps)
+            where += [(c, i) for i in range(chunk_steps.size)]
+        self.steps = np.concatenate(steps) if steps else np.zeros(0, dtype=np.int64)
+        self._where = where
+        self._cached = (None, None)
+
+    def __len__(self):
+        return self.steps.size
+
+    def index_at(self, step):
+        """Index of the first frame recorded at or after `step`."""
+        return int(np.searchsorted(self.steps, step))
+
+    def _chunk(self, c):
+        if self._cached[0] != c:
+            with np.load(self.chunks[c]) as data:
+                self._cached = (c, {name: data[name] for name in data.files})
+        return self._cached[1]
+
+    def frame(self, idx):
+        """Returns frame `idx` with fields dequantized to float32."""
+        c, i = self._where[idx]
+        frame = FrameRecorder._frame_from_chunk(self._chunk(c), i)
+        frame['fields'] = {name: frame['fields'][f].astype(np.float32) * (frame['scales'][f] / 255.0)
+                           for f, name in enumerate(self.meta['fields'])}
+        return frame
+
+
+class FramePlayer:
+    """
+    Stands in for a Simulation when drawing recorded frames: exposes the
+    attributes Visualizer reads plus snapshot(), and step() advances to the
+    next frame.
+    """
+    def __init__(self, run_dir):
+        self.reader = FrameReader(run_dir)
+        meta = self.reader.meta
+        self.shape = tuple(meta['shape'])
+        self.frame_stride = meta['stride']
+        self.logger = SimpleNamespace(run_dir=run_dir)
+        self.fields = SimpleNamespace(fields={})
+        self.index = -1
+        self.frame_count = 0
+        self.deaths = {}
+        self._snapshot = None
+        if len(self.reader):
+            self.seek(0)
+
+    def __len__(self):
+        return len(self.reader)
+
+    def seek(self, idx):
+        frame = self.reader.frame(idx)
+        meta = self.reader.meta
+        self.index = idx
+        self.frame_count = frame['step']
+        self.fields.fields = frame['fields']
+        self._snapshot = WorldSnapshot.build(frame['step'], meta['species'], frame['fields'], frame['rows'],
+                                             frame['cols'], frame['species'], frame['energy'])
+        self.deaths = {sid: dict(zip(meta['causes'], map(int, frame['deaths'][s])))
+                       for s, sid in enumerate(meta['species'])}
+
+    def snapshot(self):
+        return self._snapshot
+
+    def step(self):
+        """Advances one recorded frame; stays on the last one at the end of the stream."""
+        if self.index + 1 < len(self.reader):
+            self.seek(self.index + 1)
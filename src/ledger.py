@@ -0,0 +1,173 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import os
+from dataclasses import dataclass, field
+import numpy as np
+
+# Error bounds used by the auditors
+MASS_TOLERANCE = 1e-8
+ENERGY_TOLERANCE = 1e-4
+
+
+class CompensatedSum:
+    """Running sum with Neumaier compensation, so millions of small updates don't drift."""
+    __slots__ = ('total', 'compensation')
+
+    def __init__(self, value=0.0):
+        self.total = float(value)
+        self.compensation = 0.0
+
+    def add(self, amount):
+        amount = float(amount)
+        t = self.total + amount
+        if abs(self.total) >= abs(amount):
+            self.compensation += (self.total - t) + amount
+        else:
+            self.compensation += (amount - t) + self.total
+        self.total = t
+
+    def reset(self, value):
+        self.total = float(value)
+        self.compensation = 0.0
+
+    @property
+    def value(self):
+        return self.total + self.compensation
+
+
+class CompensatedArray:
+    """
+    One CompensatedSum per universe of a batch, updated elementwise.
+    add() takes a scalar or a (size,) array of amounts.
+    """
+    __slots__ = ('total', 'compensation')
+
+    def __init__(self, size, value=0.0):
+        self.total = np.full(size, value, dtype=np.float64)
+        self.compensation = np.zeros(size)
+
+    def add(self, amount):
+        t = self.total + amount
+        self.compensation += np.where(np.abs(self.total) >= np.abs(amount),
+                                      (self.total - t) + amount, (amount - t) + self.total)
+        self.total = t
+
+    def reset(self, value, which=None):
+        """Re-anchors every universe (or only the universes in `which`) to `value`."""
+        which = slice(None) if which is None else which
+        self.total[which] = value
+        self.compensation[which] = 0.0
+
+    @property
+    def value(self):
+        return self.total + self.compensation
+
+
+class Ledger:
+    """
+    Incremental thermodynamic books for one universe.
+
+    Stocks (what is in the universe right now):
+      field_totals  - matter (or heat, for 'heat') held by each field
+      bio_mass      - body + stored + toxin mass held by agents
+      agent_energy  - energy held by agents
+    Flows (what crossed the universe boundary, or was generated):
+      mass_sourced, mass_decayed, heat_radiated, total_energy_generated
+
+    Every subsystem books the deltas it causes, so the conservation residual
+    is an O(n_fields) computation at any step.
+
+    With `size` set, the ledger keeps the books of a batch of `size`
+    universes: every sum is a CompensatedArray and amounts are (size,) arrays.
+    """
+    FLOWS = ('mass_sourced', 'mass_decayed', 'heat_radiated', 'total_energy_generated')
+
+    def __init__(self, field_names, size=None):
+        new = CompensatedSum if size is None else (lambda: CompensatedArray(size))
+        self.field_totals = {name: new() for name in field_names}
+        self.bio_mass = new()
+        self.agent_energy = new()
+        self.flows = {name: new() for name in self.FLOWS}
+
+    def book(self, flow, amount):
+        self.flows[flow].add(amount)
+
+    def move_field(self, name, amount):
+        self.field_totals[name].add(amount)
+
+    def flow(self, name):
+        return self.flows[name].value
+
+    def env_mass(self):
+        return sum(s.value for name, s in self.field_totals.items() if name != 'heat')
+
+    def heat(self):
+        return self.field_totals['heat'].value
+
+    def state(self):
+        """Exact (total, compensation) pairs of every running sum, for checkpoints."""
+        pair = lambda s: [s.total, s.compensation]
+        return {
+            'field_totals': {name: pair(s) for name, s in self.field_totals.items()},
+            'bio_mass': pair(self.bio_mass),
+            'agent_energy': pair(self.agent_energy),
+            'flows': {name: pair(s) for name, s in self.flows.items()},
+        }
+
+    def load_state(self, state):
+        def restore(s, pair):
+            s.total, s.compensation = float(pair[0]), float(pair[1])
+        for name, pair in state['field_totals'].items():
+            restore(self.field_totals[name], pair)
+        restore(self.bio_mass, state['bio_mass'])
+        restore(self.agent_energy, state['agent_energy'])
+        for name, pair in state['flows'].items():
+            restore(self.flows[name], pair)
+
+
+@dataclass
+class AuditRecord:
+    """Outcome of one mass or energy audit."""
+    step: int
+    kind: str                  # 'mass' or 'energy'
+    error: float               # (initial + in) - (current + out)
+    ok: bool
+    method: str                # 'incremental' (running ledgers) or 'full' (recomputed sums)
+    breakdown: dict = field(default_factory=dict)
+    drift: float = 0.0         # |running ledger - recomputed stock| found by a full audit
+    dusted: bool = False       # A sub-threshold mass error was swept into necromass
+
+    def summary(self):
+        status = "✅" if self.ok else "❌"
+        icon = "⚖️ MASS" if self.kind == 'mass' else "⚡ ENERGY"
+        note = " (Dusting Applied 🧹)" if self.dusted else ""
+        return (f"--- {icon} AUDIT [Step {self.step}] ({self.method}) ---\n"
+                f"Status: {status} | Error: {self.error:.10f} | Drift: {self.drift:.3e}{note}")
+
+
+def write_audit_report(run_dir, mass_record, energy_record):
+    """Appends a detailed thermodynamic report to <run_dir>/physics_audit.txt."""
+    report_path = os.path.join(run_dir, "physics_audit.txt")
+    m, e = mass_record.breakdown, energy_record.breakdown
+
+    with open(report_path, "a") as f:
+        f.write(f"--- ⚖️ PHYSICS AUDIT [Step {mass_record.step}] ({mass_record.method}) ---\n")
+        
+        # MASS SECTION
+        f.write(f"  [MASS]\n")
+        f.write(f"    Error:     {mass_record.error:.12f}\n")
+        f.write(f"    Breakdown: Env: {m['env']:.4f} | Bio: {m['bio']:.4f}\n")
+        f.write(f"    Flow:      Sourced: {m['sourced']:.4f} | Decayed: {m['decayed']:.4f}\n")
+        f.write(f"    Drift:     {mass_record.drift:.3e}\n")
+        
+        # ENERGY SECTION
+        f.write(f"  [ENERGY]\n")
+        f.write(f"    Error:     {energy_record.error:.12f}\n")
+        f.write(f"    Breakdown: Heat Field: {e['heat']:.4f} | Bio Energy: {e['bio_energy']:.4f}\n")
+        f.write(f"    Flow:      Generated: {e['generated']:.4f} | Radiated: {e['radiated']:.4f}\n")
+        
+        f.write("-" * 40 + "\n")
@@ -0,0 +1,268 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import time
+import queue
+from types import SimpleNamespace
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+from src.snapshot import WorldSnapshot
+from src.run_config import RunConfig
+
+# Header slots of the shared snapshot (RATE holds sim steps/sec as float64 bits;
+# FAILED is set when the writer raised mid-copy and the counter stays odd)
+SEQ, STEP, N_AGENTS, RATE, FAILED = 0, 1, 2, 3, 4
+HEADER_SLOTS = 5
+READ_TIMEOUT = 1.0         # Seconds a reader waits out an odd counter before giving up
+READ_RETRY = 0.001         # Seconds between retries while a write is in progress
+
+
+class SharedSnapshot:
+    """
+    Latest simulation state in shared memory, guarded by a sequence counter
+    (seqlock): the writer makes the counter odd while it copies and even when
+    done, and a reader retries until it sees the same even value before and
+    after its copy. A writer that raises mid-copy marks the header FAILED, so
+    readers raise instead of waiting for an even counter that never comes.
+    Agent arrays hold at most one agent per tile.
+    """
+    def __init__(self, shape, field_names, species_ids, causes, names=None):
+        self.shape = tuple(shape)
+        self.field_names = list(field_names)
+        self.species_ids = list(species_ids)
+        self.causes = list(causes)
+        cells = self.shape[0] * self.shape[1]
+        layout = {
+            'header': ((HEADER_SLOTS,), np.int64),
+            'fields': ((len(self.field_names),) + self.shape, np.float64),
+            'rows': ((cells,), np.int32),
+            'cols': ((cells,), np.int32),
+            'species': ((cells,), np.int32),
+            'energy': ((cells,), np.float64),
+            'deaths': ((len(self.species_ids), len(self.causes)), np.int64),
+        }
+        self.owner = names is None
+        self._blocks = {}
+        self.arrays = {}
+        for key, (shape, dtype) in layout.items():
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            if self.owner:
+                block = SharedMemory(create=True, size=nbytes)
+            else:
+                # Spawned children share the creator's resource tracker, which
+                # unlinks the blocks once, when the creator closes them
+                block = SharedMemory(name=names[key])
+            self._blocks[key] = block
+            self.arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        if self.owner:
+            self.arrays['header'][:] = 0
+
+    @property
+    def names(self):
+        return {key: block.name for key, block in self._blocks.items()}
+
+    def spec(self):
+        """Arguments that let another process attach to the same blocks."""
+        return (self.shape, self.field_names, self.species_ids, self.causes, self.names)
+
+    def publish(self, sim, steps_per_sec):
+        a = self.arrays
+        header = a['header']
+        snap = sim.snapshot()
+        n = snap.size
+        header[SEQ] += 1  # Odd: write in progress
+        try:
+            for f, name in enumerate(self.field_names):
+                a['fields'][f] = snap.fields[name]
+            a['rows'][:n] = snap.rows
+            a['cols'][:n] = snap.cols
+            a['species'][:n] = snap.species
+            a['energy'][:n] = snap.energy
+            for s, sid in enumerate(self.species_ids):
+                a['deaths'][s] = [sim.deaths[sid][c] for c in self.causes]
+            header[STEP] = sim.frame_count
+            header[N_AGENTS] = n
+            header[RATE] = np.float64(steps_per_sec).view(np.int64)
+        except BaseException:
+            header[FAILED] = 1
+            raise
+        header[SEQ] += 1  # Even: consistent
+
+    def read(self, timeout=READ_TIMEOUT):
+        """
+        Consistent copy of the newest snapshot, or None if nothing was
+        published yet or no write finished within `timeout` seconds.
+        Raises RuntimeError if the writer failed mid-copy.
+        """
+        a = self.arrays
+        header = a['header']
+        deadline = time.perf_counter() + timeout
+        while True:
+            if header[FAILED]:
+                raise RuntimeError("Live simulation worker failed while publishing a snapshot")
+            seq = int(header[SEQ])
+            if seq == 0:
+                return None
+            if seq % 2:
+                if time.perf_counter() > deadline:
+                    return None
+                time.sleep(READ_RETRY)
+                continue
+            n = int(header[N_AGENTS])
+            copy = {
+                'step': int(header[STEP]),
+                'steps_per_sec': float(header[RATE:RATE + 1].view(np.float64)[0]),
+                'fields': a['fields'].copy(),
+                'rows': a['rows'][:n].copy(),
+                'cols': a['cols'][:n].copy(),
+                'species': a['species'][:n].copy(),
+                'energy': a['energy'][:n].copy(),
+                'deaths': a['deaths'].copy(),
+            }
+            if int(header[SEQ]) == seq:
+                return copy
+
+    def close(self):
+        for block in self._blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+
+
+def _run_worker(seed, run_name, cfg, spec, stop, results):
+    """Background process: steps the universe with settings `cfg` and publishes it until `stop` is set."""
+    from src.logger import DataLogger
+    from src.engine import Simulation
+
+    snapshot = SharedSnapshot(*spec)
+    sim = Simulation(seed, DataLogger(run_name=run_name, seed=seed, cfg=cfg), cfg=cfg)
+    results.put(('run_dir', sim.logger.run_dir))
+    publish_period = 1.0 / getattr(cfg, 'LIVE_PUBLISH_HZ', 60)
+    steps_per_sec = 0.0
+    try:
+        snapshot.publish(sim, steps_per_sec)
+        last_publish = last_rate = time.perf_counter()
+        steps_since = 0
+        while not stop.is_set():
+            sim.step()
+            steps_since += 1
+            now = time.perf_counter()
+            if now - last_rate >= 0.5:
+                steps_per_sec = steps_since / (now - last_rate)
+                last_rate, steps_since = now, 0
+            if now - last_publish >= publish_period:
+                snapshot.publish(sim, steps_per_sec)
+                last_publish = now
+    finally:
+        m, e = sim.check_mass_integrity(), sim.check_energy_integrity()
+        sim.save_audit_report(m, e)
+        sim.logger.save_to_disk()
+        if sim.profiler:
+            sim.profiler.save(sim.logger.run_dir, sim.engine_mode)
+        results.put(('audit', (m, e)))
+        snapshot.close()
+
+
+class LiveView:
+    """
+    Stands in for a Simulation in the Visualizer: step() only samples the
+    newest published snapshot, so drawing never waits for the physics.
+    With the worker `process` given, step() raises once it has died.
+    """
+    def __init__(self, shared, run_dir, process=None):
+        self.shared = shared
+        self.process = process
+        self.shape = shared.shape
+        self.logger = SimpleNamespace(run_dir=run_dir)
+        self.fields = SimpleNamespace(fields={})
+        self.frame_count = 0
+        self.steps_per_sec = 0.0
+        self.deaths = {}
+        self._snapshot = None
+
+    def snapshot(self):
+        return self._snapshot
+
+    def step(self):
+        if self.process is not None and not self.process.is_alive():
+            raise RuntimeError("Live simulation worker stopped unexpectedly")
+        state = self.shared.read()
+        if state is None:
+            return
+        self.frame_count = state['step']
+        self.steps_per_sec = state['steps_per_sec']
+        self.fields.fields = dict(zip(self.shared.field_names, state['fields']))
+        self._snapshot = WorldSnapshot.build(state['step'], self.shared.species_ids, self.fields.fields,
+                                             state['rows'], state['cols'], state['species'], state['energy'])
+        self.deaths = {sid: dict(zip(self.shared.causes, map(int, state['deaths'][s])))
+                       for s, sid in enumerate(self.shared.species_ids)}
+
+
+class LiveSimulation:
+    """
+    Runs a Simulation in a background process and exposes a LiveView of it.
+    The worker gets settings `cfg` (default: a RunConfig of the config module
+    as it is now), the same ones the shared blocks are sized from.
+    """
+    def __init__(self, seed, run_name=None, cfg=None):
+        from src.engine import DEATH_CAUSES
+        self.seed = seed
+        self.run_name = run_name
+        self.cfg = cfg if cfg is not None else RunConfig.from_module()
+        self.shared = SharedSnapshot(self.cfg.GRID_SIZE, self.cfg.FIELD_CONFIGS.keys(),
+                                     self.cfg.SPECIES_CONFIGS.keys(), DEATH_CAUSES)
+        ctx = get_context('spawn')
+        self._stop = ctx.Event()
+        self._results = ctx.Queue()
+        self._process = ctx.Process(target=_run_worker, daemon=True,
+                                    args=(seed, run_name, self.cfg, self.shared.spec(), self._stop,
+                                          self._results))
+        self.view = None
+
+    def _receive(self, timeout):
+        """Next (kind, payload) from the worker, or None once it has died without sending one."""
+        deadline = time.perf_counter() + timeout
+        while True:
+            try:
+                return self._results.get(timeout=0.1)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    try:
+                        return self._results.get(timeout=0.5)  # Sent just before it exited
+                    except queue.Empty:
+                        return None
+                if time.perf_counter() > deadline:
+                    return None
+
+    def start(self, timeout=60.0):
+        """Starts the worker and waits for its first snapshot."""
+        self._process.start()
+        message = self._receive(timeout)
+        if message is None:
+            raise RuntimeError("Live simulation worker failed to start")
+        self.view = LiveView(self.shared, message[1], self._process)
+        deadline = time.perf_counter() + timeout
+        while self.shared.read() is None:
+            if time.perf_counter() > deadline or not self._process.is_alive():
+                raise RuntimeError("Live simulation worker failed to publish a first snapshot")
+            time.sleep(0.01)
+        self.view.step()
+        return self.view
+
+    def stop(self, timeout=60.0):
+        """Stops the worker; returns its closing (mass, energy) audit records (None if it never sent them)."""
+        self._stop.set()
+        records = None
+        try:
+            message = self._receive(timeout)
+            if message is not None and message[0] == 'audit':
+                records = message[1]
+        finally:
+            self._process.join(timeout)
+            self.shared.close()
+        return records
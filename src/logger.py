@@ -4,11 +4,18 @@
 # it under the terms of the GNU General Public License as published by
 # the Free Software Foundation.
 
+import numpy as np
 import pandas as pd
 import os
 import shutil
 import json
+import config
 from datetime import datetime
+from src.columnar import ColumnarWriter
+from src.run_config import RunConfig, RUN_CONFIG_FILE
+
+# On-disk timeseries formats the logger can write
+LOG_FORMATS = ('columnar', 'csv')
 
 class FileSystemManager:
     def __init__(self, base_dir="Results"):
@@ -20,60 +27,182 @@ class FileSystemManager:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         folder_label = f"{timestamp}_{run_name}" if run_name else timestamp
         run_path = os.path.join(self.base_dir, folder_label)
-        os.makedirs(run_path, exist_ok=True)
-        return run_path
+        # Runs started within the same second get a numeric suffix, since the
+        # logger appends to whatever timeseries it finds in its folder
+        suffix = 1
+        while True:
+            try:
+                os.makedirs(run_path)
+                return run_path
+            except FileExistsError:
+                run_path = os.path.join(self.base_dir, f"{folder_label}_{suffix}")
+                suffix += 1
 
-    def snapshot_config(self, run_path):
-        """Copies the current config.py into the results folder for provenance."""
-        if os.path.exists("config.py"):
+    def snapshot_config(self, run_path, cfg=None):
+        """
+        Records the run's settings in the results folder for provenance: a copy
+        of config.py, or run_config.json when the run was given a RunConfig.
+        """
+        if isinstance(cfg, RunConfig):
+            with open(os.path.join(run_path, RUN_CONFIG_FILE), 'w') as f:
+                json.dump(cfg.to_dict(), f, indent=4)
+        elif os.path.exists("config.py"):
             shutil.copy("config.py", os.path.join(run_path, "config_snapshot.py"))
 
 class DataLogger:
-    def __init__(self, run_name=None, seed=None):
+    """
+    Streams per-step metrics to disk.
+    Rows go into a preallocated (chunk_size, n_columns) NumPy buffer; every
+    full chunk is appended to the binary column store and/or timeseries.csv
+    (see LOG_FORMATS) and metadata.json is rewritten, so memory stays bounded
+    and a crash loses at most one chunk.
+    """
+    def __init__(self, run_name=None, seed=None, chunk_size=None, run_dir=None, cfg=None):
         self.active_seed = seed
+        self.cfg = cfg if cfg is not None else config
         self.fs = FileSystemManager()
-        self.run_dir = self.fs.create_run_folder(run_name)
+        if run_dir is None:
+            self.run_dir = self.fs.create_run_folder(run_name)
+        else:
+            # Caller-chosen folder (resumed runs, ensembles, sweeps)
+            self.run_dir = run_dir
+            os.makedirs(self.run_dir, exist_ok=True)
         self.csv_path = os.path.join(self.run_dir, "timeseries.csv")
         self.meta_path = os.path.join(self.run_dir, "metadata.json")
-        self.history = []
+        self.chunk_size = chunk_size or getattr(self.cfg, 'LOG_CHUNK_SIZE', 1000)
+        self.formats = tuple(getattr(self.cfg, 'LOG_FORMATS', ('columnar', 'csv')))
+        unknown = set(self.formats) - set(LOG_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown LOG_FORMATS {sorted(unknown)}. Use any of {LOG_FORMATS}")
+        self.store = None
+        self.columns = None
+        self.int_columns = []
+        self._buffer = None
+        self._fill = 0
+        self.total_steps = 0
+        self.complete = False
+        self.final_row = {}
+        self.max_population = 0
         
         # Immediate snapshot upon initialization
-        self.fs.snapshot_config(self.run_dir)
+        if not any(os.path.exists(os.path.join(self.run_dir, name))
+                   for name in ("config_snapshot.py", RUN_CONFIG_FILE)):
+            self.fs.snapshot_config(self.run_dir, cfg)
+        self._write_metadata()
+
+    @classmethod
+    def resume(cls, run_dir, state, cfg=None):
+        """
+        Reopens `run_dir` to continue a run from a checkpoint `state` (see state()).
+        Rows logged after the checkpoint are cut from every on-disk format.
+        """
+        with open(os.path.join(run_dir, "metadata.json")) as f:
+            seed = json.load(f)['seed']
+        logger = cls(seed=seed, run_dir=run_dir, cfg=cfg)
+        logger.formats = tuple(state['formats'])
+        logger.columns = state['columns']
+        logger.total_steps = state['rows']
+        logger.max_population = state['max_population']
+        logger.final_row = state['final_row']
+        logger.set_columns(state['columns'], state['int_columns'])
+        if 'columnar' in logger.formats:
+            logger.store = ColumnarWriter.reopen(run_dir, state['rows'])
+        if 'csv' in logger.formats and os.path.exists(logger.csv_path):
+            with open(logger.csv_path, 'r+b') as f:
+                for _ in range(state['rows'] + 1):  # header + rows
+                    f.readline()
+                f.truncate(f.tell())
+        logger._write_metadata()
+        return logger
+
+    def state(self):
+        """Flushes pending rows and returns what resume() needs to continue this log."""
+        self.flush()
+        return {
+            'rows': self.total_steps,
+            'formats': list(self.formats),
+            'columns': self.columns,
+            'int_columns': self.int_columns,
+            'max_population': self.max_population,
+            'final_row': self.final_row,
+        }
+
+    def set_columns(self, columns, int_columns=()):
+        """Declares the fixed column layout of the rows passed to log_row."""
+        columns = list(columns)
+        if self.total_steps and columns != self.columns:
+            raise ValueError("Cannot change the logged columns once rows have been written")
+        self.columns = columns
+        self.int_columns = [c for c in int_columns if c in columns]
+        self._buffer = np.empty((self.chunk_size, len(columns)))
+        self._fill = 0
+        if 'columnar' in self.formats and not self.total_steps:
+            self.store = ColumnarWriter(self.run_dir, self.columns, self.int_columns)
         
     def log_step(self, step_data):
-        """Appends the step dictionary provided by Simulation.step()."""
-        self.history.append(step_data)
+        """Logs one step given as a dict. The first dict fixes the column layout."""
+        if self.columns is None:
+            self.set_columns(step_data.keys(),
+                             [k for k, v in step_data.items() if isinstance(v, (int, np.integer))])
+        self.log_row([step_data.get(c, np.nan) for c in self.columns])
+
+    def log_row(self, row):
+        """Appends one metrics row laid out as declared by set_columns."""
+        self._buffer[self._fill] = row
+        self._fill += 1
+        self.total_steps += 1
+        if self._fill == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Appends the buffered rows to every enabled format and refreshes metadata.json."""
+        if not self._fill:
+            return
+        block = self._buffer[:self._fill]
+        if self.store is not None:
+            self.store.append(block)
+        if 'csv' in self.formats:
+            chunk = pd.DataFrame(block, columns=self.columns)
+            chunk[self.int_columns] = chunk[self.int_columns].astype(np.int64)
+            header = not os.path.exists(self.csv_path)
+            chunk.to_csv(self.csv_path, mode='a', header=header, index=False)
+
+        pop_key = 'total_population' if 'total_population' in self.columns else 'population'
+        if pop_key in self.columns:
+            self.max_population = max(self.max_population,
+                                      int(block[:, self.columns.index(pop_key)].max()))
+        self.final_row = dict(zip(self.columns, block[-1].tolist()))
+        self._fill = 0
+        self._write_metadata()
+
+    def _write_metadata(self):
+        pop_key = 'total_population' if 'total_population' in self.final_row else 'population'
+        metadata = {
+            "run_id": os.path.basename(self.run_dir),
+            "seed": self.active_seed,
+            "timestamp": datetime.now().isoformat(),
+            "total_steps": self.total_steps - self._fill,
+            "complete": self.complete,
+            "formats": list(self.formats),
+            "final_population": int(self.final_row.get(pop_key, 0)),
+            "max_population": self.max_population,
+            "species_final_counts": {k: int(v) for k, v in self.final_row.items() if k.startswith('pop_')},
+        }
+        # Write-then-rename, so a crash never leaves a truncated metadata.json
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(metadata, f, indent=4)
+        os.replace(tmp_path, self.meta_path)
 
     def save_to_disk(self):
-        if not self.history:
+        if not self.total_steps:
             print("❌ Warning: No data in history to save.")
             return
 
         try:
-            # 1. Save CSV
-            df = pd.DataFrame(self.history)
-            df.to_csv(self.csv_path, index=False)
-            
-            # 2. Key Check
-            pop_key = 'total_population' if 'total_population' in df.columns else 'population'
-            
-            # 3. Metadata
-            # Use .get() everywhere to prevent KeyErrors from stopping the save
-            metadata = {
-                "run_id": os.path.basename(self.run_dir),
-                "seed": self.active_seed,
-                "timestamp": datetime.now().isoformat(),
-                "total_steps": len(self.history),
-                "final_population": int(df[pop_key].iloc[-1]) if not df.empty else 0,
-                "max_population": int(df[pop_key].max()) if not df.empty else 0,
-                "species_final_counts": {k: int(df[k].iloc[-1]) for k in df.columns if k.startswith('pop_')},
-            }
-            
-            
-
-            with open(self.meta_path, 'w') as f:
-                json.dump(metadata, f, indent=4)
-                
+            self.complete = True
+            self.flush()
+            self._write_metadata()
             print(f"✅ Data successfully saved to: {self.run_dir}")
         except Exception as e:
-            print(f"❌ Failed to save data: {e}")
\ No newline at end of file
+            print(f"❌ Failed to save data: {e}")
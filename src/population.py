@@ -0,0 +1,296 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import numpy as np
+import config
+from src.biology import Genome
+from src.contention import resolve_contention, grouped_random
+
+# Trait columns carried by every agent (same keys as Genome.traits)
+TRAIT_NAMES = (
+    'starting_energy', 'growth_efficiency', 'metabolism', 'max_bite',
+    'toxin_tolerance', 'heat_tolerance', 'entropy_coeff', 'repro_threshold',
+    'repro_prob', 'death_E', 'entropy_tax', 'lifespan_limit', 'repro_entropy_cost'
+)
+# Fallbacks for traits a Genome does not define (mirrors the scalar engine's .get())
+TRAIT_DEFAULTS = {'repro_entropy_cost': 40.0}
+
+
+class AgentView:
+    """
+    Read-only window onto one row of an AgentPool.
+    Exposes the same attributes as an Agent so code that iterates over
+    `sim.agents` keeps working. Views are invalidated by pool compaction.
+    """
+    __slots__ = ('pool', 'idx')
+
+    def __init__(self, pool, idx):
+        self.pool = pool
+        self.idx = idx
+
+    @property
+    def pos(self):
+        return (int(self.pool.row[self.idx]), int(self.pool.col[self.idx]))
+
+    @property
+    def genome(self):
+        return self.pool.genomes[self.pool.species[self.idx]]
+
+    @property
+    def energy(self):
+        return self.pool.energy[self.idx]
+
+    @property
+    def stored_mass(self):
+        return self.pool.stored_mass[self.idx]
+
+    @property
+    def internal_toxins(self):
+        return self.pool.internal_toxins[self.idx]
+
+    @property
+    def age_accumulated(self):
+        return self.pool.age[self.idx]
+
+    @property
+    def my_traits(self):
+        return {name: self.pool.traits[name][self.idx] for name in TRAIT_NAMES}
+
+
+class AgentPool:
+    """
+    Struct-of-arrays agent population.
+    Every per-agent quantity lives in a contiguous NumPy column so the whole
+    population can be stepped with array operations instead of a Python loop.
+    Only the first `size` rows of each column are live.
+
+    A pool built with `universes=B` holds the agents of a batch of B universes
+    (see src/batch.py): each row carries a `universe` index and metabolize()
+    reads (B, H, W) fields.
+    """
+    def __init__(self, shape, field_names, capacity=256, cfg=None, universes=None):
+        self.shape = shape
+        self.cfg = cfg if cfg is not None else config
+        self.universes = universes
+        self.field_names = list(field_names)
+        self.species_ids = list(self.cfg.SPECIES_CONFIGS.keys())
+        self.genomes = [Genome(sid, self.cfg) for sid in self.species_ids]
+        self.size = 0
+        self.capacity = 0
+        self._allocate(max(1, capacity))
+        self._build_species_tables()
+
+    # --- STORAGE ---
+
+    def _allocate(self, capacity):
+        """(Re)allocates every column, preserving the live rows."""
+        def grow(old, dtype):
+            new = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                new[:self.size] = old[:self.size]
+            return new
+
+        get = lambda name: getattr(self, name, None)
+        self.row = grow(get('row'), np.int64)
+        self.col = grow(get('col'), np.int64)
+        self.species = grow(get('species'), np.int64)
+        self.universe = grow(get('universe'), np.int64)
+        self.energy = grow(get('energy'), np.float64)
+        self.stored_mass = grow(get('stored_mass'), np.float64)
+        self.internal_toxins = grow(get('internal_toxins'), np.float64)
+        self.age = grow(get('age'), np.float64)
+        old_traits = get('traits') or {}
+        self.traits = {name: grow(old_traits.get(name), np.float64) for name in TRAIT_NAMES}
+        self.capacity = capacity
+
+    def _build_species_tables(self):
+        """Builds (species, field) lookup matrices from each Genome's mappings."""
+        n_s, n_f = len(self.species_ids), len(self.field_names)
+        self.intake_eff = np.zeros((n_s, n_f))
+        self.is_intake = np.zeros((n_s, n_f), dtype=bool)
+        self.toxin_mult = np.zeros((n_s, n_f))
+        self.excretion_w = np.zeros((n_s, n_f))
+        self.interacts = np.zeros((n_s, n_f), dtype=bool)
+        for s, genome in enumerate(self.genomes):
+            for f, name in enumerate(self.field_names):
+                if name in genome.intakes:
+                    self.intake_eff[s, f] = genome.intakes[name]
+                    self.is_intake[s, f] = True
+                if name in genome.toxin_sens:
+                    self.toxin_mult[s, f] = genome.toxin_sens[name]
+                if name in genome.excretions:
+                    self.excretion_w[s, f] = genome.excretions[name]
+                self.interacts[s, f] = (name in genome.intakes or name in genome.toxin_sens
+                                        or name in genome.excretions)
+        self.heat_idx = self.field_names.index('heat')
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (AgentView(self, i) for i in range(self.size))
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self.size
+        if not 0 <= idx < self.size:
+            raise IndexError("AgentPool index out of range")
+        return AgentView(self, idx)
+
+    def species_index(self, species_id):
+        return self.species_ids.index(species_id)
+
+    def add(self, rows, cols, species, energy=None, traits=None, universe=0):
+        """
+        Appends agents in bulk. `energy` defaults to each species' starting energy;
+        `traits` (dict of arrays) defaults to each species' genome traits.
+        `universe` places them in a universe of a batched pool.
+        """
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        cols = np.atleast_1d(np.asarray(cols, dtype=np.int64))
+        species = np.broadcast_to(np.asarray(species, dtype=np.int64), rows.shape)
+        n = rows.size
+        if n == 0:
+            return
+        if self.size + n > self.capacity:
+            self._allocate(max(2 * self.capacity, self.size + n))
+
+        sl = slice(self.size, self.size + n)
+        self.row[sl] = rows
+        self.col[sl] = cols
+        self.species[sl] = species
+        self.universe[sl] = universe
+        for name in TRAIT_NAMES:
+            if traits is not None:
+                self.traits[name][sl] = traits[name]
+            else:
+                defaults = np.array([g.traits.get(name, TRAIT_DEFAULTS.get(name, 0.0))
+                                     for g in self.genomes])
+                self.traits[name][sl] = defaults[species]
+        self.energy[sl] = self.traits['starting_energy'][sl] if energy is None else energy
+        self.stored_mass[sl] = 0.0
+        self.internal_toxins[sl] = 0.0
+        self.age[sl] = 0.0
+        self.size += n
+
+    def compact(self, keep):
+        """Drops every live row where `keep` is False, preserving order."""
+        idx = np.flatnonzero(keep)
+        n = idx.size
+        for column in (self.row, self.col, self.species, self.universe, self.energy,
+                       self.stored_mass, self.internal_toxins, self.age, *self.traits.values()):
+            column[:n] = column[idx]
+        self.size = n
+
+    # --- AGGREGATES ---
+
+    def bio_mass(self):
+        n = self.size
+        return (n * self.cfg.BASE_BODY_MASS + np.sum(self.stored_mass[:n])
+                + np.sum(self.internal_toxins[:n]))
+
+    def total_energy(self):
+        return np.sum(self.energy[:self.size])
+
+    # --- METABOLISM ---
+
+    def metabolize(self, fields_dict, sim, rng, scheme='proportional'):
+        """
+        Vectorized equivalent of Agent.step for every live agent.
+        Runs the senility, intake, thermodynamics, excretion and survival phases
+        and returns boolean masks (dead, reproduce) over the live rows.
+
+        Every agent reads its tile as it stood before this pass; agents sharing
+        a tile split its matter according to the contention `scheme`.
+        `rng` is the Generator used for contention priority and reproduction draws
+        (one Generator per universe for a batched pool, whose ledger then books
+        (B,) arrays of per-universe amounts).
+        """
+        n = self.size
+        dead = np.zeros(n, dtype=bool)
+        repro = np.zeros(n, dtype=bool)
+        if n == 0:
+            return dead, repro
+        t = {name: col[:n] for name, col in self.traits.items()}
+
+        # --- PHASE 1: SENILITY ---
+        self.age[:n] += t['entropy_tax']
+        dead[:] = self.age[:n] >= t['lifespan_limit']
+        a = np.flatnonzero(~dead)
+        if a.size == 0:
+            return dead, repro
+        r, c, s = self.row[a], self.col[a], self.species[a]
+        if self.universes is None:
+            u = None
+            loc, tiles = (r, c), r * self.shape[1] + c
+            total = np.sum
+        else:
+            u = self.universe[a]
+            loc, tiles = (u, r, c), (u * self.shape[0] + r) * self.shape[1] + c
+            # Per-universe totals for the batch's ledger
+            total = lambda x: np.bincount(u, weights=x if x.ndim == 1 else x.sum(axis=1),
+                                          minlength=self.universes)
+
+        # --- PHASE 2: INTAKE & SELECTIVE PROCESSING ---
+        interacts = self.interacts[s]
+        values = np.stack([fields_dict[f][loc] for f in self.field_names], axis=1)
+        total_matter = np.sum(values * interacts, axis=1)
+        harvest_ratio = np.minimum(1.0, t['max_bite'][a] / np.maximum(1e-6, total_matter))
+        requests = values * harvest_ratio[:, None] * interacts
+        grabbed = resolve_contention(tiles, requests, values, scheme, rng, universe=u)
+
+        toxin_part = grabbed * self.toxin_mult[s]
+        remaining = grabbed - toxin_part
+        is_intake = self.is_intake[s]
+        intake_mass_processable = np.sum(remaining * is_intake, axis=1)
+        energy_gain = np.sum(remaining * self.intake_eff[s], axis=1)
+        self.internal_toxins[a] += np.sum(toxin_part, axis=1)
+
+        # --- PHASE 3: THERMODYNAMICS ---
+        maintenance_cost = t['metabolism'][a]
+        conversion_heat = energy_gain * t['entropy_coeff'][a]
+        self.energy[a] += energy_gain - maintenance_cost
+
+        # --- PHASE 4: GROWTH AND EXCRETION (MASS ONLY) ---
+        kept_mass = intake_mass_processable * t['growth_efficiency'][a]
+        self.stored_mass[a] += kept_mass
+        metabolic_waste = intake_mass_processable - kept_mass
+
+        # Net exchange with each field: rejected matter goes back, waste is excreted
+        delta = (np.where(is_intake, 0.0, remaining) - grabbed
+                 + metabolic_waste[:, None] * self.excretion_w[s])
+        delta[:, self.heat_idx] += conversion_heat + maintenance_cost
+        for f, name in enumerate(self.field_names):
+            np.add.at(fields_dict[name], loc, delta[:, f])
+
+        # --- THE AUDIT LOG ---
+        # Field and body books are fed from separate arithmetic, so a leak in
+        # the exchange above shows up as a residual.
+        ledger = sim.ledger
+        for f, name in enumerate(self.field_names):
+            ledger.move_field(name, total(delta[:, f]))
+        ledger.bio_mass.add(total(toxin_part) + total(kept_mass))
+        ledger.agent_energy.add(total(energy_gain) - total(maintenance_cost))
+        ledger.book('total_energy_generated', total(energy_gain + conversion_heat))
+
+        # --- PHASE 5: SURVIVAL FILTERS ---
+        dies = ((self.energy[a] <= t['death_E'][a])
+                | (self.internal_toxins[a] > t['toxin_tolerance'][a])
+                | (fields_dict['heat'][loc] > t['heat_tolerance'][a]))
+        dead[a] = dies
+
+        # --- PHASE 6: REPRODUCTION (MASS TRANSFER) ---
+        ready = a[~dies]
+        ready = ready[(self.energy[ready] >= t['repro_threshold'][ready])
+                      & (self.stored_mass[ready] >= self.cfg.BASE_BODY_MASS)]
+        if self.universes is None:
+            draws = rng.random(ready.size)
+        else:
+            draws = grouped_random(rng, self.universe[ready])
+        ready = ready[draws < t['repro_prob'][ready]]
+        self.stored_mass[ready] -= self.cfg.BASE_BODY_MASS
+        repro[ready] = True
+        return dead, repro
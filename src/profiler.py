@@ -0,0 +1,100 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import os
+import json
+from time import perf_counter_ns
+import numpy as np
+
+PROFILE_FILE = "profile.json"
+
+# Phases of Simulation.step, in the order they run
+SCALAR_PHASES = ('fields', 'sources', 'shuffle', 'agents', 'logging')
+POOL_PHASES = ('fields', 'sources', 'metabolism', 'deaths', 'births', 'logging')
+# A DecomposedSimulation only sees its tiles step together (see src/domain.py)
+DOMAIN_PHASES = ('tiles', 'logging')
+
+
+class StepProfiler:
+    """
+    Wall time of each step phase, in nanoseconds, for the newest `capacity`
+    steps (a ring buffer), plus running totals over the whole run.
+    A step calls start() once, then lap(phase) as each phase finishes.
+    """
+    def __init__(self, phases, capacity=10000):
+        self.phases = tuple(phases)
+        self._column = {name: j for j, name in enumerate(self.phases)}
+        self.buffer = np.zeros((capacity, len(self.phases)), dtype=np.int64)
+        self.totals = np.zeros(len(self.phases), dtype=np.int64)
+        self.steps = 0
+        self._row = self.buffer[0]
+        self._last = 0
+
+    def start(self):
+        self._row = self.buffer[self.steps % self.buffer.shape[0]]
+        self._row[:] = 0
+        self.steps += 1
+        self._last = perf_counter_ns()
+
+    def lap(self, phase):
+        now = perf_counter_ns()
+        self._row[self._column[phase]] = now - self._last
+        self._last = now
+
+    def current(self):
+        """Phase times of the step in progress (or the last one), in phase order."""
+        return self._row
+
+    def window(self):
+        """(steps, phases) times of the retained steps, oldest first."""
+        capacity = self.buffer.shape[0]
+        if self.steps <= capacity:
+            return self.buffer[:self.steps]
+        return np.roll(self.buffer, -(self.steps % capacity), axis=0)
+
+    def summary(self):
+        """Per phase: mean over the whole run, p50/p99 over the retained window (microseconds)."""
+        window = self.window()
+        totals = np.append(self.totals, self.totals.sum())
+        per_step = np.column_stack((window, window.sum(axis=1))) if window.size else window
+        result = {}
+        for j, name in enumerate(self.phases + ('step',)):
+            if self.steps == 0:
+                result[name] = {'mean_us': 0.0, 'p50_us': 0.0, 'p99_us': 0.0, 'total_s': 0.0}
+                continue
+            p50, p99 = np.percentile(per_step[:, j], [50, 99]) / 1e3
+            result[name] = {'mean_us': totals[j] / self.steps / 1e3,
+                            'p50_us': float(p50), 'p99_us': float(p99),
+                            'total_s': totals[j] / 1e9}
+        return result
+
+    def end(self):
+        """Adds the finished step to the running totals."""
+        self.totals += self._row
+
+    def save(self, run_dir, engine_mode=None):
+        """Writes the summary to <run_dir>/profile.json and returns it."""
+        summary = self.summary()
+        report = {
+            "engine_mode": engine_mode,
+            "steps": self.steps,
+            "window": int(min(self.steps, self.buffer.shape[0])),
+            "phases": summary,
+        }
+        path = os.path.join(run_dir, PROFILE_FILE)
+        with open(path + ".tmp", 'w') as f:
+            json.dump(report, f, indent=4)
+        os.replace(path + ".tmp", path)
+        return summary
+
+
+def format_summary(summary):
+    """Fixed-width table of a StepProfiler summary."""
+    lines = [f"{'PHASE':<12}{'MEAN us':>12}{'P50 us':>12}{'P99 us':>12}{'TOTAL s':>10}"]
+    for name, s in summary.items():
+        lines.append(f"{name:<12}{s['mean_us']:>12.1f}{s['p50_us']:>12.1f}{s['p99_us']:>12.1f}"
+                     f"{s['total_s']:>10.2f}")
+    return "\n".join(lines)
@@ -0,0 +1,108 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import os
+import json
+from types import MappingProxyType
+import config
+
+# Written into run folders of runs that were given a RunConfig
+RUN_CONFIG_FILE = "run_config.json"
+
+
+def _freeze(value):
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class RunConfig:
+    """
+    Immutable settings of one run, with the same attribute names as the
+    config module (GRID_SIZE, SPECIES_CONFIGS, ...), so components read
+    `cfg.NAME` whether they were handed a RunConfig or the module itself.
+    Nested dicts become read-only mappings and lists become tuples.
+    """
+    __slots__ = ('_values',)
+
+    def __init__(self, values):
+        object.__setattr__(self, '_values', {name: _freeze(v) for name, v in values.items()})
+
+    @classmethod
+    def from_module(cls, module=config):
+        """Snapshot of the module's UPPER_CASE settings as they are right now."""
+        return cls({name: getattr(module, name) for name in dir(module) if name.isupper()})
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(f"RunConfig has no setting '{name}'") from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RunConfig is immutable; use with_overrides() to derive a new one")
+
+    def __reduce__(self):
+        # Read-only mappings don't pickle; workers rebuild from plain values
+        return (RunConfig, (self.to_dict(),))
+
+    def __eq__(self, other):
+        return isinstance(other, RunConfig) and self.to_dict() == other.to_dict()
+
+    def to_dict(self):
+        """Plain, JSON-serializable copy of every setting."""
+        return {name: _thaw(v) for name, v in self._values.items()}
+
+    def with_overrides(self, overrides):
+        """
+        New RunConfig with `overrides` applied. Keys are dotted paths into the
+        settings, e.g. 'GRID_SIZE', 'FIELD_CONFIGS.heat.decay' or
+        'SPECIES_CONFIGS.standard.max_bite' (list items by index: 'SOURCES.0.amount').
+        Every part below the top level must already exist, so typos fail loudly.
+        """
+        values = self.to_dict()
+        for path, value in overrides.items():
+            parts = path.split('.')
+            if len(parts) == 1:
+                values[path] = value
+                continue
+            if parts[0] not in values:
+                raise KeyError(f"Unknown setting '{parts[0]}' in override '{path}'")
+            target = values[parts[0]]
+            for depth, part in enumerate(parts[1:], start=1):
+                if isinstance(target, list):
+                    part = int(part)
+                    if not -len(target) <= part < len(target):
+                        raise KeyError(f"Index {part} out of range in override '{path}'")
+                elif part not in target:
+                    raise KeyError(f"Unknown key '{part}' in override '{path}'")
+                if depth == len(parts) - 1:
+                    target[part] = value
+                else:
+                    target = target[part]
+        return RunConfig(values)
+
+    def __repr__(self):
+        return f"RunConfig({len(self._values)} settings)"
+
+
+def load_run_config(run_dir):
+    """The RunConfig a run was started with, or None if it used the config module."""
+    path = os.path.join(run_dir, RUN_CONFIG_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return RunConfig(json.load(f))
@@ -0,0 +1,129 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+from contextlib import redirect_stdout, nullcontext
+import numpy as np
+
+from src.frames import FrameRecorder
+from src.profiler import format_summary
+
+
+def report_audit(*records):
+    for record in records:
+        if not record.ok and record.kind == 'mass':
+            print(f"🚨 ALERT: SIGNIFICANT MASS LEAK DETECTED!")
+        print(record.summary())
+
+
+def headless_loop(sim, steps):
+    """
+    Steps `sim` up to `steps` times (stopping early on extinction) with the
+    configured audits, checkpoints, snapshots and frame recording, then runs
+    the closing audit and saves the run. Returns the closing (mass, energy) records.
+    """
+    checkpoint_interval = getattr(sim.cfg, 'CHECKPOINT_INTERVAL', None)
+    snapshot_interval = getattr(sim.cfg, 'SNAPSHOT_INTERVAL', None)
+    if not hasattr(sim, 'save_checkpoint'):
+        # A DecomposedSimulation's state is spread over its tile processes
+        checkpoint_interval = snapshot_interval = None
+    record_stride = getattr(sim.cfg, 'RECORD_STRIDE', None)
+    recorder = None
+    if record_stride:
+        recorder = FrameRecorder(sim.logger.run_dir, sim, record_stride,
+                                 factor=getattr(sim.cfg, 'RECORD_DOWNSAMPLE', 1),
+                                 fields=getattr(sim.cfg, 'RECORD_FIELDS', None))
+    try:
+        for _ in range(steps):
+            sim.step()
+            if recorder:
+                recorder.maybe_record(sim)
+            if sim.frame_count % sim.cfg.AUDIT_INTERVAL == 0:
+                report_audit(sim.check_mass_integrity(), sim.check_energy_integrity())
+            if checkpoint_interval and sim.frame_count % checkpoint_interval == 0:
+                if recorder:
+                    recorder.flush()
+                sim.save_checkpoint()
+            if snapshot_interval and sim.frame_count % snapshot_interval == 0:
+                sim.save_snapshot()
+            if not sim.population(): break
+    finally:
+        if recorder:
+            recorder.flush()
+        m, e = sim.check_mass_integrity(), sim.check_energy_integrity()
+        report_audit(m, e)
+        sim.save_audit_report(m, e)
+        sim.logger.save_to_disk()
+        report_profile(sim)
+    return m, e
+
+
+def report_profile(sim, run_dir=None):
+    """Writes (to the run's folder, or `run_dir`) and prints the per-phase step timings of a profiled run."""
+    if sim.profiler:
+        summary = sim.profiler.save(run_dir or sim.logger.run_dir, sim.engine_mode)
+        print(f"⏱️ STEP PROFILE ({sim.profiler.steps} steps):")
+        print(format_summary(summary))
+
+
+def batch_headless_loop(batch, steps, logs=None):
+    """
+    headless_loop for a BatchedSimulation: steps every universe in lockstep
+    with the configured audits and frame recording, and closes each universe
+    (closing audit, report, saved logs) as soon as it goes extinct or the steps
+    run out. Whatever concerns universe u is printed to logs[u] when given.
+    A profiled batch saves its timings (those of whole batch steps so far)
+    with each universe as it closes. Batched runs write no checkpoints or
+    replay seek points.
+    Returns the closing (mass, energy) records of every universe.
+    """
+    record_stride = getattr(batch.cfg, 'RECORD_STRIDE', None)
+    recorders = None
+    if record_stride:
+        recorders = [FrameRecorder(view.logger.run_dir, view, record_stride,
+                                   factor=getattr(batch.cfg, 'RECORD_DOWNSAMPLE', 1),
+                                   fields=getattr(batch.cfg, 'RECORD_FIELDS', None))
+                     for view in batch.universes]
+    records = [None] * batch.size
+
+    def console(u):
+        if logs is not None:
+            return redirect_stdout(logs[u])
+        print(f"--- 🌌 UNIVERSE {u} (seed {batch.seeds[u]}) ---")
+        return nullcontext()
+
+    def close(which):
+        if recorders:
+            for u in which:
+                recorders[u].flush()
+        closing = zip(which, batch.check_mass_integrity(which), batch.check_energy_integrity(which))
+        for u, m, e in closing:
+            with console(u):
+                report_audit(m, e)
+                batch.universes[u].save_audit_report(m, e)
+                batch.loggers[u].save_to_disk()
+                report_profile(batch, batch.loggers[u].run_dir)
+            records[u] = (m, e)
+        batch.retire(which)
+
+    try:
+        for _ in range(steps):
+            batch.step()
+            active = np.flatnonzero(batch.active)
+            if recorders:
+                for u in active:
+                    recorders[u].maybe_record(batch.universes[u])
+            if batch.frame_count % batch.cfg.AUDIT_INTERVAL == 0:
+                audits = zip(active, batch.check_mass_integrity(active), batch.check_energy_integrity(active))
+                for u, m, e in audits:
+                    with console(u):
+                        report_audit(m, e)
+            extinct = active[batch.population()[active] == 0]
+            if extinct.size:
+                close(extinct)
+            if not batch.active.any(): break
+    finally:
+        close(np.flatnonzero(batch.active))
+    return records
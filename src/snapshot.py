@@ -0,0 +1,60 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+from dataclasses import dataclass
+from types import MappingProxyType
+import numpy as np
+
+
+def read_only(array):
+    """A view of `array` that refuses writes."""
+    view = np.asarray(array).view()
+    view.flags.writeable = False
+    return view
+
+
+@dataclass(frozen=True)
+class WorldSnapshot:
+    """
+    Read-only arrays describing the world at one step, one entry per live agent.
+    Views may share memory with the running simulation: they describe `step`
+    only, so take a fresh snapshot after stepping instead of holding on to one.
+    Recorded and live players leave `stored_mass`, `toxins` and `age` as None.
+    """
+    step: int
+    species_ids: tuple     # species_ids[species[i]] is agent i's species
+    rows: np.ndarray
+    cols: np.ndarray
+    species: np.ndarray    # Index into species_ids
+    energy: np.ndarray
+    stored_mass: np.ndarray
+    toxins: np.ndarray
+    age: np.ndarray
+    fields: MappingProxyType
+
+    @classmethod
+    def build(cls, step, species_ids, fields, rows, cols, species, energy,
+              stored_mass=None, toxins=None, age=None):
+        def wrap(a):
+            return None if a is None else read_only(a)
+        return cls(step=step, species_ids=tuple(species_ids),
+                   rows=wrap(rows), cols=wrap(cols), species=wrap(species), energy=wrap(energy),
+                   stored_mass=wrap(stored_mass), toxins=wrap(toxins), age=wrap(age),
+                   fields=MappingProxyType({name: read_only(f) for name, f in fields.items()}))
+
+    @property
+    def size(self):
+        return self.species.size
+
+    def counts(self):
+        """Live agents per species, in species_ids order."""
+        return np.bincount(self.species, minlength=len(self.species_ids))
+
+    def bio_mass(self, body_mass):
+        return self.size * body_mass + np.sum(self.stored_mass) + np.sum(self.toxins)
+
+    def total_energy(self):
+        return np.sum(self.energy)
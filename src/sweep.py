@@ -0,0 +1,107 @@
+# Persistence vAlpha - The Entropy Audit
+# Copyright (C) 2026  emergent-complexity
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation.
+
+import os
+import json
+import time
+import itertools
+from datetime import datetime
+
+from src.logger import FileSystemManager
+from src.run_config import RunConfig
+from src.ensemble import ensemble_seeds, run_repeats, write_manifest
+
+POINT_FILE = "point.json"
+
+
+def expand_grid(grid):
+    """
+    Every combination of a {dotted path: [values]} grid, as override dicts.
+    The last path varies fastest.
+    """
+    paths = list(grid)
+    return [dict(zip(paths, values)) for values in itertools.product(*(grid[p] for p in paths))]
+
+
+def load_sweep_spec(path):
+    """
+    Reads a sweep file: {"grid": {path: [values]}, "points": [{path: value}],
+    "repeats": R, "steps": S}. Grid combinations follow the explicit points.
+    """
+    with open(path) as f:
+        spec = json.load(f)
+    points = list(spec.get('points', [])) + expand_grid(spec.get('grid', {}))
+    if not points:
+        raise ValueError(f"Sweep file {path} defines no 'points' and no 'grid'")
+    return points, spec.get('repeats', 1), spec.get('steps')
+
+
+def run_sweep(points, base=None, repeats=1, workers=None, base_seed=0, steps=None,
+              name="Sweep", sweep_dir=None, batch=1):
+    """
+    Runs every parameter point (a dict of dotted-path overrides applied to
+    `base`, default: a RunConfig of the config module as it is now) `repeats`
+    times, all on one pool of `workers` processes, stepping up to `batch`
+    repeats of a point together as one BatchedSimulation. Nothing touches the
+    config module: each run gets its own immutable RunConfig.
+
+    Point k is written to <sweep>/point_<k>/ with its overrides in point.json
+    and its repeats in numbered subfolders, so each point is a case plot_case
+    can read. Every point uses the same repeat seeds, and
+    <sweep>/manifest.json tracks every run. Returns (sweep_dir, manifest).
+    """
+    base = base if base is not None else RunConfig.from_module()
+    # Derive every point's config first, so a bad override fails before anything runs
+    configs = [base.with_overrides(point) for point in points]
+    steps = steps or base.MAX_STEPS_HEADLESS
+    workers = workers or os.cpu_count() or 1
+    fs = FileSystemManager()
+    if sweep_dir is None:
+        sweep_dir = fs.create_run_folder(name)
+    else:
+        os.makedirs(sweep_dir, exist_ok=True)
+    fs.snapshot_config(sweep_dir, base)
+
+    seeds = ensemble_seeds(base_seed, repeats)
+    manifest = {
+        'name': name,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'base_seed': base_seed,
+        'seeds': seeds,
+        'steps': steps,
+        'workers': workers,
+        'batch': batch,
+        'points': [],
+    }
+    tasks = {}
+    for k, (point, cfg) in enumerate(zip(points, configs)):
+        case_dir = os.path.join(sweep_dir, f"point_{k:03d}")
+        os.makedirs(case_dir, exist_ok=True)
+        with open(os.path.join(case_dir, POINT_FILE), 'w') as f:
+            json.dump({'index': k, 'overrides': point}, f, indent=4)
+        manifest['points'].append({
+            'index': k,
+            'case_dir': os.path.basename(case_dir),
+            'overrides': point,
+            'repeats': [{'index': r, 'seed': seed, 'run_dir': str(r), 'status': 'pending'}
+                        for r, seed in enumerate(seeds)],
+        })
+        for r, seed in enumerate(seeds):
+            tasks[(k, r)] = (r, seed, os.path.join(case_dir, str(r)), steps, cfg)
+    write_manifest(sweep_dir, manifest)
+
+    def on_result(key, entry):
+        k, r = key
+        manifest['points'][k]['repeats'][r] = entry
+        write_manifest(sweep_dir, manifest)
+        print(f"  [{entry['status'].upper()}] point {k} repeat {r} {points[k]}"
+              + (f" in {entry['seconds']:.1f}s" if 'seconds' in entry else ""))
+
+    start = time.perf_counter()
+    run_repeats(tasks, workers, on_result, batch)
+    manifest['seconds'] = time.perf_counter() - start
+    write_manifest(sweep_dir, manifest)
+    return sweep_dir, manifest
@@ -9,11 +9,13 @@ import os
 import numpy as np
 import tempfile
 import shutil
+from types import SimpleNamespace
 
 # Add parent directory to path so we can import the main modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import config
+from src.ledger import Ledger
 
 
 @pytest.fixture(autouse=True)
@@ -42,6 +44,26 @@ def test_config():
     config.AUDIT_INTERVAL = original_audit_interval
 
 
+@pytest.fixture
+def scalar_engine(monkeypatch):
+    """
+    Runs the test on the reference scalar engine (a list of Agent objects),
+    for tests that drive Agent.step directly.
+    """
+    monkeypatch.setattr(config, 'ENGINE_MODE', 'scalar')
+
+
+@pytest.fixture
+def ledger_host():
+    """
+    Factory for a minimal stand-in Simulation that only carries a Ledger,
+    for driving FieldManager, SourceController or agents on their own.
+    """
+    def make():
+        return SimpleNamespace(ledger=Ledger(config.FIELD_CONFIGS.keys()))
+    return make
+
+
 @pytest.fixture
 def temp_results_dir():
     """
@@ -39,6 +39,7 @@ class TestGenome:
             assert genome.traits[trait] > 0, f"Trait {trait} should be > 0"
 
 
+@pytest.mark.usefixtures("scalar_engine")
 class TestAgent:
     """Tests for Agent behavior."""
     
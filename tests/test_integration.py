@@ -5,9 +5,26 @@ Full simulation runs to verify everything works together.
 """
 
 import pytest
+import os
+import io
+import copy
+import json
+import pickle
+import time
+import numpy as np
+import pandas as pd
 import config
 from src.logger import DataLogger
 from src.engine import Simulation
+from src.batch import BatchedSimulation
+from src.domain import DecomposedSimulation, tile_bounds
+from src.runner import batch_headless_loop, headless_loop
+from src.columnar import ColumnarTimeseries, open_timeseries
+from src.frames import FrameRecorder, FrameReader, FramePlayer, downsample
+from src.live import SharedSnapshot, LiveView, LiveSimulation, SEQ
+from src.run_config import RunConfig, load_run_config
+from src.profiler import POOL_PHASES, SCALAR_PHASES, PROFILE_FILE
+from src.checkpoint import list_checkpoints, latest_checkpoint, seek_points, nearest_seek_point
 
 
 class TestFullSimulation:
@@ -41,4 +58,779 @@ class TestFullSimulation:
         # Check that files were created
         import os
         assert os.path.exists(logger.csv_path), "CSV not saved"
-        assert os.path.exists(logger.meta_path), "Metadata not saved"
\ No newline at end of file
+        assert os.path.exists(logger.meta_path), "Metadata not saved"
+
+    @pytest.mark.parametrize("mode", ["scalar", "vectorized"])
+    def test_metrics_row_matches_agents(self, test_config, monkeypatch, mode):
+        """The grouped metrics row agrees with per-agent means and keeps plot_results' columns."""
+        monkeypatch.setattr(config, 'ENGINE_MODE', mode)
+        logger = DataLogger(run_name="test_metrics", seed=42)
+        sim = Simulation(42, logger)
+        for _ in range(30):
+            sim.step()
+
+        logger.flush()
+        df = pd.read_csv(logger.csv_path)
+        last = df.iloc[-1]
+        assert len(df) == 30 and last['step'] == 30
+        for sid in config.SPECIES_CONFIGS:
+            members = [a for a in sim.agents if a.genome.species_id == sid]
+            assert last[f"pop_{sid}"] == len(members)
+            assert np.isclose(last[f"{sid}_avg_energy"], np.mean([a.energy for a in members]))
+            assert np.isclose(last[f"{sid}_avg_stored_mass"], np.mean([a.stored_mass for a in members]))
+            assert np.isclose(last[f"{sid}_avg_age"], np.mean([a.age_accumulated for a in members]))
+            for cause, count in sim.deaths[sid].items():
+                assert last[f"{sid}_{cause}"] == count
+        assert df['total_population'].dtype == np.int64
+
+
+class TestStreamingLogger:
+    """The logger keeps at most one chunk in memory and keeps disk files current."""
+
+    def test_chunks_flush_during_run(self, test_config):
+        logger = DataLogger(run_name="test_stream", seed=42, chunk_size=16)
+        sim = Simulation(42, logger)
+        for _ in range(40):
+            sim.step()
+
+        # Two full chunks are already on disk, the rest is still buffered
+        assert len(pd.read_csv(logger.csv_path)) == 32
+        with open(logger.meta_path) as f:
+            meta = json.load(f)
+        assert meta['total_steps'] == 32 and not meta['complete']
+        assert meta['seed'] == 42
+
+        logger.save_to_disk()
+        df = pd.read_csv(logger.csv_path)
+        with open(logger.meta_path) as f:
+            meta = json.load(f)
+        assert list(df['step']) == list(range(1, 41))
+        assert meta['total_steps'] == 40 and meta['complete']
+        assert meta['final_population'] == len(sim.agents)
+        assert meta['max_population'] == df['total_population'].max()
+
+    def test_dict_rows_still_accepted(self, test_config):
+        logger = DataLogger(run_name="test_stream_dict", seed=1, chunk_size=4)
+        for step in range(1, 7):
+            logger.log_step({"step": step, "total_population": 10 - step, "avg_age": 0.5 * step})
+        logger.save_to_disk()
+
+        df = pd.read_csv(logger.csv_path)
+        assert list(df.columns) == ["step", "total_population", "avg_age"]
+        assert list(df['total_population']) == [9, 8, 7, 6, 5, 4]
+        assert df['step'].dtype == np.int64
+
+
+class TestColumnarStore:
+    """The binary column store mirrors the CSV and is read lazily."""
+
+    def test_store_matches_csv(self, test_config):
+        logger = DataLogger(run_name="test_columnar", seed=42, chunk_size=8)
+        sim = Simulation(42, logger)
+        for _ in range(20):
+            sim.step()
+        logger.save_to_disk()
+
+        ts = open_timeseries(logger.run_dir)
+        df = pd.read_csv(logger.csv_path)
+        assert isinstance(ts, ColumnarTimeseries)
+        assert ts.columns == list(df.columns) and len(ts) == 20
+        pops = ts['total_population']
+        assert isinstance(pops, np.memmap) and pops.dtype == np.int64
+        assert list(ts._cache) == ['total_population']
+        for name in df.columns:
+            assert np.allclose(np.asarray(ts[name]), df[name].values), name
+
+    def test_columnar_only_run_can_export_csv(self, test_config, monkeypatch, tmp_path):
+        monkeypatch.setattr(config, 'LOG_FORMATS', ('columnar',))
+        logger = DataLogger(run_name="test_columnar_only", seed=1, chunk_size=4)
+        for step in range(1, 7):
+            logger.log_step({"step": step, "total_population": 10 - step})
+        logger.save_to_disk()
+        assert not os.path.exists(logger.csv_path)
+
+        csv_path = tmp_path / "export.csv"
+        open_timeseries(logger.run_dir).export_csv(csv_path)
+        assert list(pd.read_csv(csv_path)['total_population']) == [9, 8, 7, 6, 5, 4]
+
+
+class TestCheckpointResume:
+    """A resumed run must continue exactly where the checkpoint left off."""
+
+    @pytest.mark.parametrize("mode", ["scalar", "vectorized"])
+    def test_resume_is_bit_exact(self, test_config, monkeypatch, mode):
+        monkeypatch.setattr(config, 'ENGINE_MODE', mode)
+        straight = Simulation(5, DataLogger(run_name="test_ckpt_straight", seed=5, chunk_size=7))
+        for _ in range(80):
+            straight.step()
+        straight.logger.save_to_disk()
+
+        preempted = Simulation(5, DataLogger(run_name="test_ckpt_resumed", seed=5, chunk_size=7))
+        for _ in range(40):
+            preempted.step()
+        preempted.save_checkpoint()
+        for _ in range(13):  # Lost work, partly flushed to disk before the "crash"
+            preempted.step()
+        preempted.logger.flush()
+
+        resumed = Simulation.resume(preempted.logger.run_dir)
+        assert resumed.frame_count == 40
+        for _ in range(40):
+            resumed.step()
+        resumed.logger.save_to_disk()
+
+        for name in straight.fields.fields:
+            assert np.array_equal(straight.fields.fields[name], resumed.fields.fields[name]), name
+        assert [a.pos for a in straight.agents] == [a.pos for a in resumed.agents]
+        assert [a.energy for a in straight.agents] == [a.energy for a in resumed.agents]
+        assert straight.deaths == resumed.deaths
+        assert straight.ledger.state() == resumed.ledger.state()
+        assert pd.read_csv(straight.logger.csv_path).equals(pd.read_csv(resumed.logger.csv_path))
+        assert (open_timeseries(straight.logger.run_dir).to_frame()
+                .equals(open_timeseries(resumed.logger.run_dir).to_frame()))
+
+    def test_old_checkpoints_pruned(self, test_config, monkeypatch):
+        monkeypatch.setattr(config, 'CHECKPOINT_KEEP', 2)
+        sim = Simulation(5, DataLogger(run_name="test_ckpt_prune", seed=5))
+        for _ in range(3):
+            sim.step()
+            sim.save_checkpoint()
+
+        paths = list_checkpoints(sim.logger.run_dir)
+        assert [os.path.basename(p) for p in paths] == ["checkpoint_0000000002.npz",
+                                                        "checkpoint_0000000003.npz"]
+        assert latest_checkpoint(sim.logger.run_dir) == paths[-1]
+
+    def test_resume_rejects_other_engine(self, test_config, monkeypatch):
+        sim = Simulation(5, DataLogger(run_name="test_ckpt_engine", seed=5))
+        sim.step()
+        sim.save_checkpoint()
+
+        monkeypatch.setattr(config, 'ENGINE_MODE', 'scalar')
+        with pytest.raises(ValueError):
+            Simulation.resume(sim.logger.run_dir)
+
+
+class TestSeekableReplay:
+    """Replays start from the nearest snapshot instead of genesis."""
+
+    def test_from_history_seeks_to_snapshot(self, test_config):
+        run = Simulation(9, DataLogger(run_name="test_seek_run", seed=9))
+        for _ in range(60):
+            run.step()
+            if run.frame_count % 20 == 0:
+                run.save_snapshot()
+        run.logger.save_to_disk()
+
+        assert [step for step, _ in seek_points(run.logger.run_dir)] == [20, 40, 60]
+        assert nearest_seek_point(run.logger.run_dir, 50)[0] == 40
+        assert nearest_seek_point(run.logger.run_dir, 10) is None
+
+        replay = Simulation.from_history(run.logger.run_dir, step=50)
+        genesis = Simulation(9, DataLogger(run_name="test_seek_genesis", seed=9))
+        for _ in range(50):
+            genesis.step()
+
+        assert replay.frame_count == 50
+        assert replay.logger.total_steps == 10  # Only the remainder was simulated
+        for name in genesis.fields.fields:
+            assert np.array_equal(genesis.fields.fields[name], replay.fields.fields[name]), name
+        assert [a.pos for a in genesis.agents] == [a.pos for a in replay.agents]
+
+
+class TestFrameRecorder:
+    """Recorded frames let the renderer draw a run without re-simulating it."""
+
+    def test_frames_round_trip(self, test_config):
+        sim = Simulation(3, DataLogger(run_name="test_frames", seed=3))
+        recorder = FrameRecorder(sim.logger.run_dir, sim, stride=5, factor=2, chunk_frames=3)
+        expected = {}
+        for _ in range(40):
+            sim.step()
+            recorder.maybe_record(sim)
+            if sim.frame_count % 5 == 0:
+                expected[sim.frame_count] = ({n: downsample(f, 2) for n, f in sim.fields.fields.items()},
+                                             sorted(a.pos for a in sim.agents))
+        recorder.flush()
+
+        reader = FrameReader(sim.logger.run_dir)
+        assert list(reader.steps) == list(range(5, 45, 5))
+        assert reader.index_at(12) == 2
+        for idx, step in enumerate(reader.steps):
+            frame = reader.frame(idx)
+            fields, positions = expected[step]
+            for name, f in fields.items():
+                # uint8 quantization: at most half a level of the frame's scale
+                assert np.max(np.abs(frame['fields'][name] - f)) <= f.max() / 255 * 0.5 + 1e-6, name
+            assert sorted(zip(frame['rows'].tolist(), frame['cols'].tolist())) == positions
+
+        player = FramePlayer(sim.logger.run_dir)
+        player.seek(len(player) - 1)
+        assert player.frame_count == 40
+        assert player.deaths == sim.deaths
+        snap = player.snapshot()
+        assert sorted(zip(snap.rows.tolist(), snap.cols.tolist())) == sorted(a.pos for a in sim.agents)
+        player.step()
+        assert player.frame_count == 40  # Stays on the last frame
+
+    def test_resumed_recorder_drops_later_frames(self, test_config):
+        sim = Simulation(3, DataLogger(run_name="test_frames_resume", seed=3))
+        recorder = FrameRecorder(sim.logger.run_dir, sim, stride=2, chunk_frames=4)
+        for _ in range(20):
+            sim.step()
+            recorder.maybe_record(sim)
+        recorder.flush()
+
+        sim.frame_count = 11  # Pretend the run restarts from a step-11 checkpoint
+        FrameRecorder(sim.logger.run_dir, sim, stride=2, chunk_frames=4)
+        assert list(FrameReader(sim.logger.run_dir).steps) == [2, 4, 6, 8, 10]
+
+    def test_render_frame_selection(self, test_config, monkeypatch):
+        from utils.render import recorded_indices
+        sim = Simulation(3, DataLogger(run_name="test_frames_select", seed=3))
+        recorder = FrameRecorder(sim.logger.run_dir, sim, stride=5)
+        for _ in range(100):
+            sim.step()
+            recorder.maybe_record(sim)
+        recorder.flush()
+        reader = FrameReader(sim.logger.run_dir)
+
+        monkeypatch.setattr(config, 'RENDER_INTERVAL', 4)
+        assert recorded_indices(reader, "timelapse") == [0, 5, 10, 15]
+        assert recorded_indices(reader, "event", start_step=40, duration=20) == [7, 8, 9, 10]
+        assert recorded_indices(reader, "event", start_step=500) == [19]
+
+    def test_parallel_render_keeps_frame_order(self, test_config, tmp_path):
+        from PIL import Image
+        from utils.render import parallel_render, recorded_indices, _rasterize_block
+        sim = Simulation(3, DataLogger(run_name="test_frames_render", seed=3))
+        recorder = FrameRecorder(sim.logger.run_dir, sim, stride=5)
+        for _ in range(40):
+            sim.step()
+            recorder.maybe_record(sim)
+        recorder.flush()
+        indices = recorded_indices(FrameReader(sim.logger.run_dir), "event", start_step=10, duration=25)
+
+        path = parallel_render(sim.logger.run_dir, "event", start_step=10, duration=25, target_field='heat',
+                               workers=2, fmt='gif')
+        assert os.path.exists(path) and path.endswith(".gif")
+
+        # Serial reference frames; every GIF frame must be closest to the one in its slot
+        dpi = 150 if getattr(config, 'VISUAL_STYLE', 'SCIENTIFIC').upper() == 'TELEMETRIC' else 120
+        reference = [np.asarray(Image.open(p).convert('RGB'), dtype=np.int16)
+                     for p in _rasterize_block(sim.logger.run_dir, indices, 0, 'heat', str(tmp_path), dpi)]
+        with Image.open(path) as gif:
+            assert gif.n_frames == len(indices)
+            for slot in range(gif.n_frames):
+                gif.seek(slot)
+                frame = np.asarray(gif.convert('RGB'), dtype=np.int16)
+                distances = [np.abs(frame - ref).mean() for ref in reference]
+                assert int(np.argmin(distances)) == slot
+
+
+class TestWorldSnapshot:
+    """Simulation.snapshot() is the one read-only view consumers share."""
+
+    @pytest.mark.parametrize("mode", ['scalar', 'vectorized'])
+    def test_snapshot_matches_agents(self, test_config, monkeypatch, mode):
+        monkeypatch.setattr(config, 'ENGINE_MODE', mode)
+        sim = Simulation(3, DataLogger(run_name=f"test_snapshot_{mode}", seed=3))
+        for _ in range(10):
+            sim.step()
+        snap = sim.snapshot()
+        assert snap.step == 10
+        assert snap is sim.snapshot()  # Built once per step
+        agents = list(sim.agents)
+        assert sorted(zip(snap.rows.tolist(), snap.cols.tolist())) == sorted(a.pos for a in agents)
+        assert snap.counts().sum() == snap.size == len(agents)
+        assert snap.bio_mass(config.BASE_BODY_MASS) == pytest.approx(sim._get_current_bio_mass())
+        assert np.array_equal(snap.fields['carbon'], sim.fields.fields['carbon'])
+
+        with pytest.raises(ValueError):
+            snap.energy[:] = 0
+        with pytest.raises(ValueError):
+            snap.fields['carbon'][0, 0] = 1.0
+
+        sim.step()
+        assert sim.snapshot() is not snap
+        assert sim.snapshot().step == 11
+
+
+class TestStepProfiler:
+    """Opt-in per-phase step timings."""
+
+    def test_off_by_default(self, test_config):
+        sim = Simulation(3, DataLogger(run_name="test_profile_off", seed=3))
+        assert sim.profiler is None
+        assert not any(c.startswith("time_") for c in sim.metric_columns)
+
+    @pytest.mark.parametrize("mode, phases", [('scalar', SCALAR_PHASES), ('vectorized', POOL_PHASES)])
+    def test_phase_timings(self, test_config, monkeypatch, mode, phases):
+        monkeypatch.setattr(config, 'ENGINE_MODE', mode)
+        monkeypatch.setattr(config, 'PROFILE', True)
+        monkeypatch.setattr(config, 'PROFILE_BUFFER', 8)
+        monkeypatch.setattr(config, 'PROFILE_COLUMNS', True)
+        sim = Simulation(3, DataLogger(run_name=f"test_profile_{mode}", seed=3))
+        for _ in range(20):
+            sim.step()
+        prof = sim.profiler
+        assert prof.phases == phases
+        assert prof.steps == 20
+
+        window = prof.window()
+        assert window.shape == (8, len(phases))
+        assert np.array_equal(window[-1], prof.current())  # Oldest first, newest last
+        assert (window > 0).all()
+        assert prof.totals.sum() >= window.sum()
+
+        summary = prof.save(sim.logger.run_dir, sim.engine_mode)
+        assert list(summary) == list(phases) + ['step']
+        assert summary['step']['p50_us'] <= summary['step']['p99_us']
+        with open(os.path.join(sim.logger.run_dir, PROFILE_FILE)) as f:
+            assert json.load(f)['steps'] == 20
+
+        sim.logger.flush()
+        ts = open_timeseries(sim.logger.run_dir)
+        for phase in phases[:-1]:
+            assert (np.asarray(ts[f"time_{phase}_us"]) > 0).all(), phase
+
+
+class TestBenchmark:
+    """The benchmark suite builds its matrix, measures a case and flags regressions."""
+
+    def test_matrix_and_case(self, test_config):
+        from utils.benchmark import build_cases, run_case
+        cases = build_cases({'grid': [10, 40], 'population': [20, 200], 'species': [1, 9], 'fields': [3, 6]})
+        # 200 agents don't fit a 10x10 grid, 9 species can't be seeded, 3 < configured fields
+        assert [(c['grid'], c['population']) for c in cases] == [(10, 20), (40, 20), (40, 200)]
+
+        fields_before = dict(config.FIELD_CONFIGS)
+        result = run_case({'grid': 20, 'population': 10, 'species': 2, 'fields': 6}, steps=5, warmup=2)
+        assert result['id'] == "g20_p10_s2_f6"
+        assert result['steps_per_sec'] > 0 and result['median_steps_per_sec'] > 0
+        assert set(result['phase_mean_us']) >= {'fields', 'logging', 'step'}
+        assert result['peak_rss_mb'] > 0
+        assert config.FIELD_CONFIGS == fields_before  # Overrides are undone
+        assert config.GRID_SIZE == (20, 20)
+
+    def test_batched_case(self, test_config):
+        from utils.benchmark import build_cases, run_case
+        cases = build_cases({'grid': [20], 'population': [10], 'species': [1], 'fields': [4], 'batch': [1, 3]})
+        assert [c.get('batch', 1) for c in cases] == [1, 3]
+        result = run_case(cases[1], steps=5, warmup=2)
+        assert result['id'] == "g20_p10_s1_f4_b3"
+        assert result['final_population'] > 10  # Three universes' worth of agents
+
+    def test_tiled_case(self, test_config):
+        from utils.benchmark import build_cases, run_case
+        cases = build_cases({'grid': [20], 'population': [10], 'species': [1], 'fields': [4],
+                             'batch': [1, 2], 'tiles': [1, 2, 8]})
+        # A batch is never decomposed, and 8 tiles of a 20-row grid are too thin
+        assert [(c.get('batch', 1), c.get('tiles', 1)) for c in cases] == [(1, 1), (1, 2), (2, 1)]
+        result = run_case(cases[1], steps=5, warmup=2)
+        assert result['id'] == "g20_p10_s1_f4_t2"
+        assert set(result['phase_mean_us']) >= {'tiles', 'logging', 'step'}
+        assert result['final_population'] > 0
+
+    def test_compare_flags_regressions(self):
+        from utils.benchmark import compare
+        baseline = {'cases': [{'id': 'a', 'median_steps_per_sec': 100.0},
+                              {'id': 'b', 'median_steps_per_sec': 100.0}]}
+        results = [{'id': 'a', 'median_steps_per_sec': 95.0},
+                   {'id': 'b', 'median_steps_per_sec': 80.0},
+                   {'id': 'new', 'median_steps_per_sec': 1.0}]
+        rows = compare(results, baseline, threshold=0.1)
+        assert [(r[0], r[4]) for r in rows] == [('a', False), ('b', True)]
+
+
+class TestEnsemble:
+    """Seeded repeats on a process pool, in the numbered layout plot_case reads."""
+
+    def test_repeats_and_manifest(self, test_config, tmp_path):
+        from src.ensemble import run_ensemble, ensemble_seeds, MANIFEST_FILE
+        # The fixture's small grid reaches the workers through the RunConfig snapshot
+        case_dir, manifest = run_ensemble(2, workers=2, base_seed=5, steps=20, case_dir=str(tmp_path))
+        assert manifest['seeds'] == ensemble_seeds(5, 2)
+        assert len(set(manifest['seeds'])) == 2
+        with open(os.path.join(case_dir, MANIFEST_FILE)) as f:
+            on_disk = json.load(f)
+        assert [r['status'] for r in on_disk['repeats']] == ['ok', 'ok']
+        for i, seed in enumerate(manifest['seeds']):
+            repeat = os.path.join(case_dir, str(i))
+            with open(os.path.join(repeat, "metadata.json")) as f:
+                assert json.load(f)['seed'] == seed
+            assert len(open_timeseries(repeat)) == on_disk['repeats'][i]['steps']
+
+    def test_failed_repeat_is_isolated(self, test_config, tmp_path):
+        from src.ensemble import run_ensemble, REPEAT_LOG
+        cfg = RunConfig.from_module().with_overrides({'ENGINE_MODE': 'bogus'})
+        _, manifest = run_ensemble(1, workers=1, steps=5, case_dir=str(tmp_path), cfg=cfg)
+        repeat = manifest['repeats'][0]
+        assert repeat['status'] == 'failed'
+        assert "ENGINE_MODE" in repeat['error']
+        with open(os.path.join(tmp_path, "0", REPEAT_LOG)) as f:
+            assert "Traceback" in f.read()
+
+
+class TestRunConfig:
+    """Immutable per-run settings, so runs with different parameters can share a process."""
+
+    def test_overrides_leave_base_and_module_untouched(self, test_config):
+        base = RunConfig.from_module()
+        cfg = base.with_overrides({'SPECIES_CONFIGS.standard.max_bite': 9.0,
+                                   'FIELD_CONFIGS.heat.decay': 0.5, 'GRID_SIZE': (30, 30)})
+        assert cfg.SPECIES_CONFIGS['standard']['max_bite'] == 9.0
+        assert cfg.FIELD_CONFIGS['heat']['decay'] == 0.5
+        assert cfg.GRID_SIZE == (30, 30)
+        assert base.SPECIES_CONFIGS['standard']['max_bite'] == config.SPECIES_CONFIGS['standard']['max_bite']
+        assert config.GRID_SIZE == (20, 20)
+
+        with pytest.raises(AttributeError):
+            cfg.GRID_SIZE = (5, 5)
+        with pytest.raises(TypeError):
+            cfg.SPECIES_CONFIGS['standard']['max_bite'] = 1.0
+        with pytest.raises(KeyError):
+            base.with_overrides({'SPECIES_CONFIGS.standard.max_bight': 1.0})
+        assert pickle.loads(pickle.dumps(cfg)) == cfg
+
+    @pytest.mark.parametrize("mode", ["scalar", "vectorized"])
+    def test_matches_module_config(self, test_config, monkeypatch, mode):
+        monkeypatch.setattr(config, 'ENGINE_MODE', mode)
+        cfg = RunConfig.from_module()
+        a = Simulation(4, DataLogger(run_name="test_cfg_module", seed=4))
+        b = Simulation(4, DataLogger(run_name="test_cfg_frozen", seed=4, cfg=cfg), cfg=cfg)
+        for _ in range(60):
+            a.step()
+            b.step()
+        for name in a.fields.fields:
+            assert np.array_equal(a.fields.fields[name], b.fields.fields[name]), name
+        assert a.deaths == b.deaths
+        assert load_run_config(b.logger.run_dir) == cfg
+
+    def test_side_by_side_grids(self, test_config):
+        small = RunConfig.from_module().with_overrides({'GRID_SIZE': (12, 12)})
+        a = Simulation(1, DataLogger(run_name="test_cfg_small", seed=1, cfg=small), cfg=small)
+        b = Simulation(1, DataLogger(run_name="test_cfg_default", seed=1))
+        for _ in range(10):
+            a.step()
+            b.step()
+        assert a.fields.fields['carbon'].shape == (12, 12)
+        assert b.fields.fields['carbon'].shape == (20, 20)
+
+    def test_missing_settings_fall_back_to_shipped_defaults(self, test_config):
+        values = RunConfig.from_module().to_dict()
+        del values['ENGINE_MODE']
+        del values['FIELD_LAYOUT']
+        cfg = RunConfig(values)
+        sim = Simulation(1, DataLogger(run_name="test_cfg_fallback", seed=1, cfg=cfg), cfg=cfg)
+        assert sim.engine_mode == 'vectorized'
+        assert sim.fields.layout == 'stacked'
+
+
+class TestSweep:
+    """One case folder per parameter point, all points on one worker pool."""
+
+    def test_expand_grid(self):
+        from src.sweep import expand_grid
+        points = expand_grid({'A': [1, 2], 'B.c': ['x', 'y']})
+        assert points == [{'A': 1, 'B.c': 'x'}, {'A': 1, 'B.c': 'y'},
+                          {'A': 2, 'B.c': 'x'}, {'A': 2, 'B.c': 'y'}]
+
+    def test_points_get_their_own_config(self, test_config, tmp_path):
+        from src.sweep import run_sweep, POINT_FILE
+        from src.ensemble import MANIFEST_FILE
+        points = [{'SPECIES_CONFIGS.standard.max_bite': 1.0}, {'SPECIES_CONFIGS.standard.max_bite': 7.0}]
+        sweep_dir, manifest = run_sweep(points, workers=2, base_seed=3, steps=10, sweep_dir=str(tmp_path))
+
+        with open(os.path.join(sweep_dir, MANIFEST_FILE)) as f:
+            on_disk = json.load(f)
+        assert [[r['status'] for r in p['repeats']] for p in on_disk['points']] == [['ok'], ['ok']]
+        for k, point in enumerate(points):
+            case = os.path.join(sweep_dir, f"point_{k:03d}")
+            with open(os.path.join(case, POINT_FILE)) as f:
+                assert json.load(f)['overrides'] == point
+            cfg = load_run_config(os.path.join(case, "0"))
+            assert cfg.SPECIES_CONFIGS['standard']['max_bite'] == point['SPECIES_CONFIGS.standard.max_bite']
+            assert cfg.GRID_SIZE == (20, 20)  # The fixture's grid, from the base snapshot
+            assert len(open_timeseries(os.path.join(case, "0"))) == 10
+        assert config.SPECIES_CONFIGS['standard']['max_bite'] not in (1.0, 7.0)
+
+    def test_bad_override_fails_before_running(self, test_config, tmp_path):
+        from src.sweep import run_sweep
+        with pytest.raises(KeyError):
+            run_sweep([{'FIELD_CONFIGS.heet.decay': 0.1}], steps=5, sweep_dir=str(tmp_path))
+        assert os.listdir(tmp_path) == []
+
+
+class TestBatchedSimulation:
+    """B universes in one tensor must each evolve as they would alone."""
+
+    def _pair(self, seeds, steps):
+        batch = BatchedSimulation(seeds, [DataLogger(run_name=f"test_batch_{s}", seed=s) for s in seeds])
+        alone = [Simulation(s, DataLogger(run_name=f"test_alone_{s}", seed=s)) for s in seeds]
+        for _ in range(steps):
+            batch.step()
+            for sim in alone:
+                sim.step()
+        return batch, alone
+
+    @pytest.mark.parametrize("scheme", ["proportional", "priority"])
+    def test_universes_match_standalone_runs(self, test_config, monkeypatch, scheme):
+        monkeypatch.setattr(config, 'ENGINE_MODE', 'vectorized')
+        monkeypatch.setattr(config, 'UPDATE_SCHEME', scheme)
+        batch, alone = self._pair([2, 9, 4], 120)
+
+        for u, sim in enumerate(alone):
+            view = batch.universes[u]
+            for name in sim.fields.names:
+                assert np.array_equal(view.fields.fields[name], sim.fields.fields[name]), name
+            snap, ref = view.snapshot(), sim.snapshot()
+            for column in ('rows', 'cols', 'species', 'energy', 'stored_mass', 'age'):
+                assert np.array_equal(getattr(snap, column), getattr(ref, column)), column
+            assert view.deaths == sim.deaths
+            assert np.isclose(view.mass_residual(), sim.mass_residual(), atol=1e-9)
+            assert np.isclose(view.energy_residual(), sim.energy_residual(), atol=1e-9)
+
+            batch.loggers[u].flush()
+            sim.logger.flush()
+            logged, reference = open_timeseries(batch.loggers[u].run_dir), open_timeseries(sim.logger.run_dir)
+            for column in reference.columns:
+                assert np.allclose(logged[column], reference[column], rtol=1e-12, atol=1e-9), column
+
+    def test_per_universe_audits(self, test_config):
+        batch, alone = self._pair([5, 6], 60)
+        masses = batch.check_mass_integrity()
+        energies = batch.check_energy_integrity([1])
+        assert [m.ok for m in masses] == [True, True]
+        assert len(energies) == 1 and energies[0].ok
+        assert energies[0].breakdown['heat'] == pytest.approx(np.sum(alone[1].fields.fields['heat']))
+
+    def test_headless_loop_retires_extinct_universes(self, test_config, monkeypatch):
+        species = copy.deepcopy(config.SPECIES_CONFIGS)
+        species['standard'].update(lifespan_limit=30.0, repro_prob=0.0)
+        monkeypatch.setattr(config, 'SPECIES_CONFIGS', species)
+        batch = BatchedSimulation([1, 2], [DataLogger(run_name=f"test_batch_end_{s}", seed=s) for s in (1, 2)])
+        records = batch_headless_loop(batch, 100, logs=[io.StringIO(), io.StringIO()])
+
+        assert not batch.active.any()
+        assert batch.frame_count == 30
+        for u, (mass, energy) in enumerate(records):
+            assert mass.ok and energy.ok
+            with open(os.path.join(batch.loggers[u].run_dir, "metadata.json")) as f:
+                meta = json.load(f)
+            assert meta['complete'] and meta['total_steps'] == 30 and meta['final_population'] == 0
+
+    def test_profiled_batch_saves_profile(self, test_config, monkeypatch):
+        monkeypatch.setattr(config, 'PROFILE', True)
+        batch = BatchedSimulation([1, 2], [DataLogger(run_name=f"test_batch_prof_{s}", seed=s) for s in (1, 2)])
+        batch_headless_loop(batch, 10, logs=[io.StringIO(), io.StringIO()])
+        for logger in batch.loggers:
+            with open(os.path.join(logger.run_dir, PROFILE_FILE)) as f:
+                report = json.load(f)
+            assert report['engine_mode'] == 'batched' and report['steps'] == 10
+            assert set(report['phases']) == set(POOL_PHASES) | {'step'}
+
+    def test_batched_ensemble(self, test_config, tmp_path):
+        from src.ensemble import run_ensemble
+        case_dir, manifest = run_ensemble(3, workers=1, base_seed=8, steps=15, case_dir=str(tmp_path), batch=2)
+        assert [r['status'] for r in manifest['repeats']] == ['ok'] * 3
+        assert [r['batch'] for r in manifest['repeats']] == [2, 2, 1]
+
+        seed = manifest['seeds'][1]
+        sim = Simulation(seed, DataLogger(run_name="test_batch_ensemble_ref", seed=seed))
+        for _ in range(15):
+            sim.step()
+        sim.logger.flush()
+        logged = open_timeseries(os.path.join(case_dir, "1"))
+        assert np.array_equal(logged['total_population'], open_timeseries(sim.logger.run_dir)['total_population'])
+
+
+class TestDecomposedSimulation:
+    """Row tiles in worker processes must step one world and keep its books."""
+
+    def test_one_tile_matches_vectorized_engine(self, test_config):
+        # The same backend everywhere: 'auto' may pick differently for a tile's ghost-row block
+        fields = copy.deepcopy(config.FIELD_CONFIGS)
+        for spec in fields.values():
+            spec['diffusion_backend'] = 'stencil'
+        cfg = RunConfig.from_module().with_overrides({'FIELD_CONFIGS': fields})
+        sim = Simulation(3, DataLogger(run_name="test_alone", seed=3, cfg=cfg), cfg=cfg)
+        with DecomposedSimulation(3, DataLogger(run_name="test_tiled", seed=3, cfg=cfg), tiles=1, cfg=cfg) as tiled:
+            for _ in range(60):
+                sim.step()
+                tiled.step()
+
+            for name in sim.fields.names:
+                assert np.array_equal(tiled.fields.fields[name], sim.fields.fields[name]), name
+            snap, ref = tiled.snapshot(), sim.snapshot()
+            for column in ('rows', 'cols', 'species', 'energy', 'stored_mass', 'age'):
+                assert np.array_equal(getattr(snap, column), getattr(ref, column)), column
+            assert tiled.deaths == sim.deaths
+            assert np.isclose(tiled.mass_residual(), sim.mass_residual(), atol=1e-9)
+            assert np.isclose(tiled.energy_residual(), sim.energy_residual(), atol=1e-9)
+
+            tiled.logger.flush()
+            sim.logger.flush()
+            logged, reference = open_timeseries(tiled.logger.run_dir), open_timeseries(sim.logger.run_dir)
+            for column in reference.columns:
+                assert np.allclose(logged[column], reference[column], rtol=1e-12, atol=1e-9), column
+
+    def test_tiles_conserve_and_hand_off_across_seams(self, test_config):
+        runs = []
+        for _ in range(2):
+            handoffs = 0
+            with DecomposedSimulation(3, DataLogger(run_name="test_tiles", seed=3), tiles=5) as tiled:
+                for _ in range(120):
+                    tiled.step()
+                    handoffs += int(tiled.shared.arrays['children_count'].sum())
+                    snap = tiled.snapshot()
+                    # One agent per cell, seams included
+                    assert len(set(zip(snap.rows.tolist(), snap.cols.tolist()))) == snap.size
+                assert tiled.check_mass_integrity().ok
+                assert tiled.check_energy_integrity().ok
+                runs.append((handoffs, snap.energy.copy(), tiled.fields.fields['heat'].copy()))
+
+        assert runs[0][0] > 0
+        # Reproducible for a given seed and tile count
+        assert np.array_equal(runs[0][1], runs[1][1])
+        assert np.array_equal(runs[0][2], runs[1][2])
+
+    def test_headless_run(self, test_config, monkeypatch):
+        monkeypatch.setattr(config, 'CHECKPOINT_INTERVAL', 10)
+        with DecomposedSimulation(4, DataLogger(run_name="test_tiles_headless", seed=4), tiles=2) as tiled:
+            mass, energy = headless_loop(tiled, 30)
+        assert mass.ok and energy.ok
+
+        run_dir = tiled.logger.run_dir
+        with open(os.path.join(run_dir, "metadata.json")) as f:
+            meta = json.load(f)
+        assert meta['complete'] and meta['total_steps'] == 30
+        assert os.path.exists(os.path.join(run_dir, "physics_audit.txt"))
+        assert not list_checkpoints(run_dir)
+
+    def test_thin_tiles_rejected(self):
+        assert tile_bounds(20, 5) == [0, 4, 8, 12, 16, 20]
+        with pytest.raises(ValueError):
+            tile_bounds(20, 6)
+
+
+class TestLiveSnapshot:
+    """Live mode hands the GUI consistent copies of the newest published state."""
+
+    def test_publish_and_attach(self, test_config):
+        sim = Simulation(3, DataLogger(run_name="test_live", seed=3))
+        snapshot = SharedSnapshot(sim.shape, sim.fields.names, list(sim.deaths),
+                                  list(next(iter(sim.deaths.values()))))
+        attached = SharedSnapshot(*snapshot.spec())
+        try:
+            assert attached.read() is None  # Nothing published yet
+            for _ in range(15):
+                sim.step()
+            snapshot.publish(sim, steps_per_sec=123.5)
+
+            view = LiveView(attached, sim.logger.run_dir)
+            view.step()
+            assert view.frame_count == 15
+            assert view.steps_per_sec == 123.5
+            assert view.deaths == sim.deaths
+            snap = view.snapshot()
+            assert sorted(zip(snap.rows.tolist(), snap.cols.tolist())) == sorted(a.pos for a in sim.agents)
+            for name, f in sim.fields.fields.items():
+                assert np.array_equal(view.fields.fields[name], f), name
+
+            sim.step()  # The view keeps its copy until it samples again
+            assert view.frame_count == 15
+        finally:
+            attached.close()
+            snapshot.close()
+
+    def test_stuck_or_failed_writer_does_not_hang_readers(self, test_config):
+        sim = Simulation(3, DataLogger(run_name="test_live_stuck", seed=3))
+        snapshot = SharedSnapshot(sim.shape, sim.fields.names, list(sim.deaths),
+                                  list(next(iter(sim.deaths.values()))))
+        try:
+            snapshot.arrays['header'][SEQ] = 3  # A writer that died mid-copy
+            assert snapshot.read(timeout=0.05) is None
+
+            snapshot.arrays['header'][SEQ] = 0
+            sim.deaths = {}  # Makes publish raise after the counter went odd
+            with pytest.raises(KeyError):
+                snapshot.publish(sim, steps_per_sec=1.0)
+            with pytest.raises(RuntimeError):
+                snapshot.read()
+        finally:
+            snapshot.close()
+
+
+class TestLiveSimulation:
+    """The decoupled live mode, driven through a real spawned worker."""
+
+    def test_start_and_stop(self, test_config):
+        # The worker gets the parent's settings, not a fresh import of config
+        live = LiveSimulation(5, run_name="test_live_worker")
+        try:
+            view = live.start()
+            assert view.shape == (20, 20)
+            for _ in range(200):
+                if view.frame_count > 0:
+                    break
+                time.sleep(0.01)
+                view.step()
+            assert view.frame_count > 0
+            assert view.fields.fields['heat'].shape == (20, 20)
+        finally:
+            records = live.stop()
+        mass, energy = records
+        assert mass.ok and energy.ok
+        assert os.path.exists(os.path.join(view.logger.run_dir, "physics_audit.txt"))
+
+        with pytest.raises(RuntimeError):
+            view.step()  # The worker is gone
+
+    def test_profiled_worker_saves_profile(self, test_config, monkeypatch):
+        monkeypatch.setattr(config, 'PROFILE', True)  # What --profile sets in the parent only
+        live = LiveSimulation(5, run_name="test_live_profile")
+        try:
+            view = live.start()
+            time.sleep(0.2)
+        finally:
+            live.stop()
+        assert os.path.exists(os.path.join(view.logger.run_dir, PROFILE_FILE))
+
+
+class TestReproducibility:
+    """Each Simulation owns its random streams, so a seed fixes the whole run."""
+
+    def _run(self, seed, steps=100):
+        sim = Simulation(seed, DataLogger(run_name=f"test_repro_{seed}", seed=seed))
+        for _ in range(steps):
+            sim.step()
+        return sim
+
+    @pytest.mark.parametrize("mode", ["scalar", "vectorized"])
+    def test_same_seed_is_bit_exact(self, test_config, monkeypatch, mode):
+        monkeypatch.setattr(config, 'ENGINE_MODE', mode)
+        a, b = self._run(11), self._run(11)
+
+        for name in a.fields.fields:
+            assert np.array_equal(a.fields.fields[name], b.fields.fields[name]), name
+        assert [x.pos for x in a.agents] == [y.pos for y in b.agents]
+        assert [x.energy for x in a.agents] == [y.energy for y in b.agents]
+        assert a.deaths == b.deaths
+
+    def test_interleaved_simulations_do_not_interfere(self, test_config):
+        """Stepping two universes alternately matches running them alone."""
+        solo = self._run(5, steps=60)
+
+        a = Simulation(5, DataLogger(run_name="test_repro_a", seed=5))
+        b = Simulation(6, DataLogger(run_name="test_repro_b", seed=6))
+        for _ in range(60):
+            a.step()
+            b.step()
+
+        assert np.array_equal(a.fields.fields['carbon'], solo.fields.fields['carbon'])
+
+    def test_global_rng_untouched(self, test_config):
+        state = np.random.get_state()[1].copy()
+        self._run(3, steps=20)
+        assert np.array_equal(np.random.get_state()[1], state)
@@ -10,6 +10,7 @@ import numpy as np
 import config
 from src.logger import DataLogger
 from src.engine import Simulation
+from src.ledger import AuditRecord, CompensatedSum, CompensatedArray
 
 
 class TestMassConservation:
@@ -28,7 +29,7 @@ class TestMassConservation:
             sim.step()
         
         # Check mass balance
-        mass_error = sim.check_mass_integrity()
+        mass_error = sim.check_mass_integrity().error
         
         # For short runs, error should be very small
         # (allow for floating point drift)
@@ -45,7 +46,7 @@ class TestMassConservation:
         for _ in range(200):
             sim.step()
         
-        mass_error = sim.check_mass_integrity()
+        mass_error = sim.check_mass_integrity().error
         
         # Longer runs will have slightly larger error
         assert abs(mass_error) < 1.0, f"Mass error accumulated: {mass_error}"
@@ -73,7 +74,7 @@ class TestMassConservation:
                 break
         
         # After natural extinction, mass should be conserved
-        mass_error = sim.check_mass_integrity()
+        mass_error = sim.check_mass_integrity().error
         
         assert abs(mass_error) < 1.0, \
             f"Mass not conserved after extinction. Error: {mass_error}\n" \
@@ -95,7 +96,7 @@ class TestEnergyConservation:
         for _ in range(50):
             sim.step()
         
-        energy_error = sim.check_energy_integrity()
+        energy_error = sim.check_energy_integrity().error
         
         # Energy accounting should be very tight
         assert abs(energy_error) < 1.0, f"Energy error: {energy_error}"
@@ -110,11 +111,106 @@ class TestEnergyConservation:
         for _ in range(200):
             sim.step()
         
-        energy_error = sim.check_energy_integrity()
+        energy_error = sim.check_energy_integrity().error
         
         assert abs(energy_error) < 5.0, f"Energy drift: {energy_error}"
 
 
+class TestFieldLayouts:
+    """Both field layouts must keep the ledgers balanced over a full run."""
+
+    @pytest.mark.parametrize("layout", ["stacked", "separate"])
+    def test_conservation_per_layout(self, monkeypatch, layout):
+        monkeypatch.setattr(config, 'FIELD_LAYOUT', layout)
+        logger = DataLogger(run_name=f"test_layout_{layout}", seed=42)
+        sim = Simulation(42, logger)
+
+        for _ in range(200):
+            sim.step()
+
+        assert abs(sim.check_mass_integrity().error) < 0.01
+        assert abs(sim.check_energy_integrity().error) < 1.0
+
+
+class TestDiffusionBackendConservation:
+    """Each diffusion backend must meet the same conservation bounds as the default."""
+
+    @pytest.mark.parametrize("backend", ["direct", "stencil", "fft"])
+    def test_conservation_per_backend(self, monkeypatch, backend):
+        for specs in config.FIELD_CONFIGS.values():
+            monkeypatch.setitem(specs, 'diffusion_backend', backend)
+        logger = DataLogger(run_name=f"test_backend_{backend}", seed=42)
+        sim = Simulation(42, logger)
+
+        for _ in range(50):
+            sim.step()
+        assert abs(sim.check_mass_integrity().error) < 0.01
+        assert abs(sim.check_energy_integrity().error) < 1.0
+
+        for _ in range(150):
+            sim.step()
+        assert abs(sim.check_mass_integrity().error) < 1.0
+        assert abs(sim.check_energy_integrity().error) < 5.0
+
+
+class TestIncrementalLedger:
+    """The running ledgers must agree with the recomputed full audit."""
+
+    def test_compensated_sum_beats_naive_float(self):
+        total = CompensatedSum(1e8)
+        naive = 1e8
+        for _ in range(100000):
+            total.add(1e-3)
+            naive += 1e-3
+        assert abs(total.value - (1e8 + 100.0)) < 1e-9
+        assert abs(total.value - (1e8 + 100.0)) < abs(naive - (1e8 + 100.0))
+
+    def test_compensated_array_matches_per_universe_sums(self):
+        rng = np.random.default_rng(2)
+        batched = CompensatedArray(3, 1e8)
+        sums = [CompensatedSum(1e8) for _ in range(3)]
+        for _ in range(1000):
+            amounts = rng.normal(size=3) * 1e-3
+            batched.add(amounts)
+            for s, amount in zip(sums, amounts):
+                s.add(amount)
+        assert np.array_equal(batched.value, [s.value for s in sums])
+        batched.reset(5.0, [1])
+        assert batched.value[1] == 5.0 and batched.value[0] == sums[0].value
+
+    @pytest.mark.parametrize("mode", ["scalar", "vectorized"])
+    def test_residuals_track_full_audit(self, monkeypatch, mode):
+        monkeypatch.setattr(config, 'ENGINE_MODE', mode)
+        logger = DataLogger(run_name=f"test_ledger_{mode}", seed=42)
+        sim = Simulation(42, logger)
+
+        for _ in range(200):
+            sim.step()
+            mass, energy = sim.audit()
+            assert mass.method == 'incremental'
+            assert abs(mass.error) < 1e-6
+            assert abs(energy.error) < 1e-6
+
+        residual = sim.mass_residual()
+        full = sim.check_mass_integrity()
+        assert full.method == 'full'
+        assert full.drift < 1e-6
+        assert np.isclose(full.error, residual, atol=1e-6)
+        assert sim.check_energy_integrity().drift < 1e-6
+
+    def test_audit_record_fields(self):
+        logger = DataLogger(run_name="test_audit_record", seed=42)
+        sim = Simulation(42, logger)
+        sim.step()
+
+        record = sim.check_energy_integrity()
+        assert isinstance(record, AuditRecord)
+        assert record.kind == 'energy'
+        assert record.ok
+        assert set(record.breakdown) == {'heat', 'bio_energy', 'generated', 'radiated'}
+        assert "ENERGY AUDIT" in record.summary()
+
+
 class TestSimulationStability:
     """Tests that the simulation can run without crashing."""
     
@@ -151,8 +247,8 @@ class TestSimulationStability:
             sim.step()
         
         # These should not raise exceptions
-        mass_error = sim.check_mass_integrity()
-        energy_error = sim.check_energy_integrity()
+        mass_error = sim.check_mass_integrity().error
+        energy_error = sim.check_energy_integrity().error
         
         # Both should return floats
         assert isinstance(mass_error, (float, np.floating))
@@ -0,0 +1,218 @@
+"""
+Population Module Tests
+
+Tests for the struct-of-arrays AgentPool and the vectorized engine mode.
+"""
+
+import pytest
+import numpy as np
+import config
+from src.biology import Genome, Agent
+from src.population import AgentPool
+from src.contention import resolve_contention, resolve_birth_sites
+from src.environment import FieldManager
+from src.logger import DataLogger
+from src.engine import Simulation
+
+
+class TestAgentPool:
+    """Tests for pool storage."""
+
+    def test_add_and_compact(self, test_config):
+        """Do bulk adds grow the pool and compaction keep the right rows?"""
+        pool = AgentPool(config.GRID_SIZE, config.FIELD_CONFIGS.keys(), capacity=2)
+        pool.add([1, 2, 3], [4, 5, 6], pool.species_index('standard'))
+
+        assert len(pool) == 3
+        assert pool.capacity >= 3
+        assert pool[0].energy == Genome('standard').traits['starting_energy']
+
+        pool.compact(np.array([True, False, True]))
+
+        assert len(pool) == 2
+        assert [a.pos for a in pool] == [(1, 4), (3, 6)]
+
+    def test_metabolism_matches_scalar_agent(self, test_config, ledger_host):
+        """Does one vectorized step reproduce Agent.step on the same tile?"""
+        fm_scalar = FieldManager(config.GRID_SIZE)
+        fm_pool = FieldManager(config.GRID_SIZE)
+        for fm in (fm_scalar, fm_pool):
+            fm.fields['carbon'][5, 5] = 3.0
+            fm.fields['waste'][5, 5] = 1.5
+            fm.fields['necromass'][5, 5] = 0.5
+
+        scalar_host, pool_host = ledger_host(), ledger_host()
+
+        agent = Agent((5, 5), Genome('standard'), scalar_host)
+        pool = AgentPool(config.GRID_SIZE, fm_pool.fields.keys())
+        pool.add(5, 5, pool.species_index('standard'))
+
+        agent.step(fm_scalar.fields, None)
+        pool.metabolize(fm_pool.fields, pool_host, np.random.default_rng(0))
+
+        assert np.isclose(pool.energy[0], agent.energy)
+        assert np.isclose(pool.stored_mass[0], agent.stored_mass)
+        assert np.isclose(pool.internal_toxins[0], agent.internal_toxins)
+        assert np.isclose(pool_host.ledger.flow('total_energy_generated'),
+                          scalar_host.ledger.flow('total_energy_generated'))
+        for name in fm_scalar.fields:
+            assert np.isclose(pool_host.ledger.field_totals[name].value,
+                              scalar_host.ledger.field_totals[name].value), name
+        for name in fm_scalar.fields:
+            assert np.allclose(fm_pool.fields[name], fm_scalar.fields[name]), name
+
+
+class TestContention:
+    """Tests for sharing one tile among several agents in a batched update."""
+
+    def test_unshared_tiles_get_full_request(self):
+        requests = np.array([[1.0, 2.0], [3.0, 0.5]])
+        granted = resolve_contention(np.array([0, 1]), requests, requests * 2, 'proportional', None)
+        assert np.array_equal(granted, requests)
+
+    def test_proportional_split(self):
+        """Three agents asking for 2.0 each from a tile holding 3.0 get 1.0 each."""
+        requests = np.full((3, 1), 2.0)
+        available = np.full((3, 1), 3.0)
+        granted = resolve_contention(np.array([5, 5, 5]), requests, available, 'proportional', None)
+        assert np.allclose(granted, 1.0)
+
+    def test_priority_is_reproducible_and_bounded(self):
+        tiles = np.array([5, 9, 5, 5])
+        requests = np.full((4, 1), 2.0)
+        available = np.full((4, 1), 3.0)
+        first = resolve_contention(tiles, requests, available, 'priority', np.random.default_rng(1))
+        again = resolve_contention(tiles, requests, available, 'priority', np.random.default_rng(1))
+
+        assert np.array_equal(first, again)
+        assert np.isclose(first[tiles == 5].sum(), 3.0)
+        assert sorted(first[tiles == 5, 0]) == [0.0, 1.0, 2.0]
+        assert first[1, 0] == 2.0
+
+    @pytest.mark.parametrize("scheme", ["proportional", "priority"])
+    def test_crowded_tile_conserves_mass(self, test_config, ledger_host, scheme):
+        """Stacking agents on one tile must not overdraw it."""
+        fm = FieldManager(config.GRID_SIZE)
+        fm.fields['carbon'][3, 3] = 5.0
+
+        pool = AgentPool(config.GRID_SIZE, fm.fields.keys())
+        pool.add([3] * 6, [3] * 6, pool.species_index('standard'))
+        env_before = sum(np.sum(f) for name, f in fm.fields.items() if name != 'heat')
+        bio_before = pool.bio_mass()
+
+        pool.metabolize(fm.fields, ledger_host(), np.random.default_rng(0), scheme=scheme)
+
+        env_after = sum(np.sum(f) for name, f in fm.fields.items() if name != 'heat')
+        assert np.min(fm.fields['carbon']) >= -1e-12
+        assert np.isclose(env_before + bio_before, env_after + pool.bio_mass())
+
+
+class TestBirthSites:
+    """Tests for the batched free-neighbor search used by reproduction."""
+
+    def test_sites_are_free_distinct_neighbors(self):
+        blocked = np.zeros((10, 10), dtype=bool)
+        rows, cols = np.array([4, 4, 5, 0]), np.array([4, 5, 4, 0])
+        blocked[rows, cols] = True
+        tr, tc, placed = resolve_birth_sites(rows, cols, blocked, np.random.default_rng(3))
+
+        assert placed.all()
+        assert not blocked[tr, tc].any()
+        assert len(set(zip(tr, tc))) == rows.size
+        # Every child lands in its parent's Moore neighborhood (on the torus)
+        dr = (tr - rows + 1) % 10
+        dc = (tc - cols + 1) % 10
+        assert np.all((dr <= 2) & (dc <= 2) & ~((dr == 1) & (dc == 1)))
+
+    def test_collisions_share_the_last_free_cell(self):
+        """Two parents whose only free neighbor is the same cell: exactly one wins."""
+        blocked = np.ones((5, 5), dtype=bool)
+        blocked[2, 2] = False
+        rows, cols = np.array([1, 3]), np.array([2, 2])
+        first = resolve_birth_sites(rows, cols, blocked, np.random.default_rng(0))
+        again = resolve_birth_sites(rows, cols, blocked, np.random.default_rng(0))
+
+        assert first[2].sum() == 1
+        assert (first[0][first[2]], first[1][first[2]]) == ([2], [2])
+        for a, b in zip(first, again):
+            assert np.array_equal(a, b)
+
+    def test_batch_matches_each_universe_alone(self):
+        """Universes of a batch draw from their own streams and never block each other."""
+        blocked = np.zeros((3, 6, 6), dtype=bool)
+        blocked[1, :, :3] = True
+        rows, cols = np.array([2, 0, 2, 5, 2]), np.array([2, 3, 3, 0, 1])
+        universe = np.array([0, 1, 0, 2, 1])
+        batched = resolve_birth_sites(rows, cols, blocked, [np.random.default_rng(u) for u in range(3)],
+                                      universe=universe)
+        for u in range(3):
+            mine = universe == u
+            alone = resolve_birth_sites(rows[mine], cols[mine], blocked[u], np.random.default_rng(u))
+            for a, b in zip(alone, batched):
+                assert np.array_equal(a, b[mine])
+
+    def test_births_keep_one_agent_per_tile(self, test_config):
+        logger = DataLogger(run_name="test_births", seed=7)
+        sim = Simulation(7, logger)
+        for _ in range(100):
+            sim.step()
+            pool = sim.agents
+            tiles = pool.row[:pool.size] * sim.shape[1] + pool.col[:pool.size]
+            assert np.unique(tiles).size == pool.size
+
+
+class TestBatchedDeaths:
+    """The batched necroburst must match the per-agent reference."""
+
+    def test_matches_per_agent_handle_death(self, test_config):
+        batched = Simulation(7, DataLogger(run_name="test_deaths_batch", seed=7))
+        reference = Simulation(7, DataLogger(run_name="test_deaths_ref", seed=7))
+        for sim in (batched, reference):
+            pool = sim.agents
+            pool.age[:pool.size:3] = 1e9                     # senility
+            pool.energy[1:pool.size:3] = -1.0                # starvation
+            pool.internal_toxins[2:pool.size:3] = 1e3        # toxins
+        dead = np.arange(batched.agents.size)
+
+        batched._handle_deaths(dead)
+        for idx in dead:
+            reference._handle_death(reference.agents[idx])
+
+        assert batched.deaths == reference.deaths
+        assert sum(batched.deaths['standard'].values()) == dead.size
+        for name in ('heat', 'necromass'):
+            assert np.allclose(batched.fields.fields[name], reference.fields.fields[name])
+        assert np.isclose(batched.mass_residual(), reference.mass_residual())
+        assert np.isclose(batched.energy_residual(), reference.energy_residual())
+
+
+class TestEngineModes:
+    """Every update scheme must keep the thermodynamic ledger balanced."""
+
+    @pytest.mark.parametrize("mode, scheme", [
+        ("scalar", "sequential"),
+        ("vectorized", "proportional"),
+        ("vectorized", "priority"),
+    ])
+    def test_conservation(self, test_config, monkeypatch, mode, scheme):
+        monkeypatch.setattr(config, 'ENGINE_MODE', mode)
+        monkeypatch.setattr(config, 'UPDATE_SCHEME', scheme)
+        logger = DataLogger(run_name=f"test_engine_{scheme}", seed=7)
+        sim = Simulation(7, logger)
+
+        for _ in range(200):
+            sim.step()
+
+        assert sim.update_scheme == scheme
+        assert abs(sim.check_mass_integrity().error) < 1e-6
+        assert abs(sim.check_energy_integrity().error) < 1e-6
+
+    def test_unknown_mode_rejected(self, test_config, monkeypatch):
+        monkeypatch.setattr(config, 'ENGINE_MODE', 'quantum')
+        with pytest.raises(ValueError):
+            Simulation(7, DataLogger(run_name="test_engine_bad", seed=7))
+
+    def test_unknown_scheme_rejected(self, test_config, monkeypatch):
+        monkeypatch.setattr(config, 'UPDATE_SCHEME', 'sequential')
+        with pytest.raises(ValueError):
+            Simulation(7, DataLogger(run_name="test_scheme_bad", seed=7))
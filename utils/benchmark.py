@@ -0,0 +1,254 @@
+import sys
+import os
+
+# Add the project root (parent directory) to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import copy
+import json
+import time
+import platform
+import resource
+import tempfile
+import itertools
+from datetime import datetime
+from multiprocessing import get_context
+import numpy as np
+import config
+
+# Benchmark matrices: every combination of the listed values is one case
+MATRICES = {
+    'quick': {'grid': [50, 100], 'population': [40, 200], 'species': [1, 2], 'fields': [4]},
+    'full': {'grid': [50, 200, 500, 1000, 2000], 'population': [100, 1000, 10000],
+             'species': [1, 2, 4], 'fields': [4, 8]},
+}
+MAX_SPECIES = 5            # Grid seeding places at most 5 species around each site
+BENCH_SEED = 42
+WARMUP_STEPS = 10
+REPEATS = 3                # Fresh-process runs per case; the fastest one is kept
+REGRESSION_THRESHOLD = 0.10
+
+
+def case_id(case):
+    cid = f"g{case['grid']}_p{case['population']}_s{case['species']}_f{case['fields']}"
+    cid += f"_b{case['batch']}" if case.get('batch', 1) > 1 else ""
+    return cid + (f"_t{case['tiles']}" if case.get('tiles', 1) > 1 else "")
+
+
+def build_cases(matrix):
+    """
+    Every combination of the matrix values, minus the ones this config cannot
+    build: populations the grid cannot seed, too many species, or fewer fields
+    than config.FIELD_CONFIGS already has. An optional 'batch' list runs each
+    case as that many universes of one BatchedSimulation, and an optional
+    'tiles' list as one DecomposedSimulation of that many tile processes
+    (a batch is never also decomposed, and a grid only fits so many tiles).
+    """
+    from src.domain import MIN_TILE_ROWS
+    cases = []
+    for grid, population, species, fields, batch, tiles in itertools.product(
+            matrix['grid'], matrix['population'], matrix['species'], matrix['fields'],
+            matrix.get('batch', [1]), matrix.get('tiles', [1])):
+        if (species > MAX_SPECIES or population > grid * grid // 2
+                or fields < len(config.FIELD_CONFIGS)
+                or (batch > 1 and tiles > 1) or (tiles > 1 and grid // tiles < MIN_TILE_ROWS)):
+            continue
+        case = {'grid': grid, 'population': population, 'species': species, 'fields': fields}
+        if batch > 1:
+            case['batch'] = batch
+        if tiles > 1:
+            case['tiles'] = tiles
+        cases.append(case)
+    return cases
+
+
+def case_config(case):
+    """Config overrides of one case: copies of the configured species and fields, scaled up or down."""
+    template = next(iter(config.SPECIES_CONFIGS.values()))
+    species = {}
+    for s in range(case['species']):
+        spec = copy.deepcopy(template)
+        spec['init_count'] = max(1, case['population'] // case['species'])
+        species['standard' if s == 0 else f"species_{s}"] = spec
+
+    # The configured fields stay (species depend on them); extra ones just diffuse and decay
+    fields = copy.deepcopy(config.FIELD_CONFIGS)
+    for k in range(case['fields'] - len(fields)):
+        fields[f"inert_{k}"] = {'decay': 0.01, 'diffusion': 0.08, 'init_value': 1.0}
+
+    return {
+        'GRID_SIZE': (case['grid'], case['grid']),
+        'SPECIES_CONFIGS': species,
+        'FIELD_CONFIGS': fields,
+        'PROFILE': True,
+        'PROFILE_COLUMNS': False,
+    }
+
+
+def run_case(case, steps, seed=BENCH_SEED, warmup=WARMUP_STEPS):
+    """
+    Runs one case in this process and returns its measurements. Peak RSS
+    covers the whole process, so run each case in a fresh process (see
+    run_matrix) for comparable numbers; it covers the parent process only,
+    not the tile processes of a decomposed case. Batched cases count
+    steps/sec in universe-steps, so they compare directly with unbatched ones.
+    """
+    from src.logger import DataLogger
+    from src.engine import Simulation
+    from src.batch import BatchedSimulation
+    from src.domain import DecomposedSimulation
+    from src.profiler import StepProfiler
+    from src.run_config import RunConfig
+
+    cfg = RunConfig.from_module().with_overrides(case_config(case))
+    batch, tiles = case.get('batch', 1), case.get('tiles', 1)
+    with tempfile.TemporaryDirectory() as run_dir:
+        if batch > 1:
+            seeds = [seed + u for u in range(batch)]
+            sim = BatchedSimulation(seeds, [DataLogger(seed=s, run_dir=os.path.join(run_dir, str(s)), cfg=cfg)
+                                            for s in seeds], cfg=cfg)
+        elif tiles > 1:
+            sim = DecomposedSimulation(seed, DataLogger(seed=seed, run_dir=run_dir, cfg=cfg), tiles=tiles, cfg=cfg)
+        else:
+            sim = Simulation(seed, DataLogger(seed=seed, run_dir=run_dir, cfg=cfg), cfg=cfg)
+        try:
+            for _ in range(warmup):
+                sim.step()
+            # Profile only the measured steps
+            sim.profiler = StepProfiler(sim.profiler.phases, steps)
+            start = time.perf_counter()
+            for _ in range(steps):
+                sim.step()
+            elapsed = time.perf_counter() - start
+            phases = sim.profiler.summary()
+            population = np.sum(sim.population())
+        finally:
+            if tiles > 1:
+                sim.close()
+
+    return {
+        'id': case_id(case),
+        **case,
+        'steps': steps,
+        'seconds': elapsed,
+        'steps_per_sec': batch * steps / elapsed,
+        # From the median step time, which a few slow steps (GC, page faults) don't move
+        'median_steps_per_sec': batch * 1e6 / phases['step']['p50_us'],
+        'phase_mean_us': {name: s['mean_us'] for name, s in phases.items()},
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'final_population': int(population),
+    }
+
+
+def _run_case_isolated(args):
+    return run_case(*args)
+
+
+def run_matrix(cases, steps, seed=BENCH_SEED, repeats=REPEATS):
+    """
+    Runs every case `repeats` times, each in its own fresh process, one at a
+    time, and keeps the fastest run: noise from other load only slows runs down.
+    """
+    ctx = get_context('spawn')
+    results = []
+    for case in cases:
+        runs = []
+        for _ in range(repeats):
+            with ctx.Pool(1) as pool:
+                runs.append(pool.apply(_run_case_isolated, ((case, steps, seed),)))
+        result = max(runs, key=lambda r: r['median_steps_per_sec'])
+        result['repeats'] = repeats
+        print(f"  {result['id']:<24}{result['median_steps_per_sec']:>10.1f} steps/s"
+              f"{result['peak_rss_mb']:>10.0f} MB")
+        results.append(result)
+    return results
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compares the median-based steps/sec case by case against a baseline report.
+    Returns rows of (id, baseline steps/s, current steps/s, ratio, regressed);
+    a case regressed when it runs more than `threshold` slower.
+    """
+    reference = {case['id']: case for case in baseline['cases']}
+    rows = []
+    for result in results:
+        base = reference.get(result['id'])
+        if base is None:
+            continue
+        ratio = result['median_steps_per_sec'] / base['median_steps_per_sec']
+        rows.append((result['id'], base['median_steps_per_sec'], result['median_steps_per_sec'], ratio,
+                     ratio < 1.0 - threshold))
+    return rows
+
+
+def _option(args, name, default, parse=str):
+    """Pops `name VALUE` out of args."""
+    if name not in args:
+        return default
+    i = args.index(name)
+    value = parse(args[i + 1])
+    del args[i:i + 2]
+    return value
+
+
+def _int_list(text):
+    return [int(v) for v in text.split(',')]
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    preset = _option(args, "--preset", 'quick')
+    matrix = dict(MATRICES[preset])
+    for key in ('grid', 'population', 'species', 'fields', 'batch', 'tiles'):
+        matrix[key] = _option(args, f"--{key}", matrix.get(key, [1]), _int_list)
+    steps = _option(args, "--steps", 100, int)
+    seed = _option(args, "--seed", BENCH_SEED, int)
+    repeats = _option(args, "--repeats", REPEATS, int)
+    baseline_path = _option(args, "--baseline", None)
+    threshold = _option(args, "--threshold", REGRESSION_THRESHOLD, float)
+    out = _option(args, "--out", os.path.join(
+        "Results", f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"))
+    if args:
+        print("Usage: python utils/benchmark.py [--preset quick|full] [--grid 50,200] [--population 100,1000] "
+              "[--species 1,2] [--fields 4,8] [--batch 1,16] [--tiles 1,4] [--steps N] [--seed S] [--repeats R] [--out FILE] "
+              "[--baseline FILE] [--threshold 0.10]")
+        sys.exit(2)
+
+    cases = build_cases(matrix)
+    print(f"⏱️ BENCHMARK: {len(cases)} cases, {steps} steps each ({getattr(config, 'ENGINE_MODE', 'vectorized')} engine)")
+    results = run_matrix(cases, steps, seed, repeats)
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'engine_mode': getattr(config, 'ENGINE_MODE', 'vectorized'),
+        'update_scheme': getattr(config, 'UPDATE_SCHEME', None),
+        'seed': seed,
+        'machine': machine_info(),
+        'cases': results,
+    }
+    os.makedirs(os.path.dirname(out) or '.', exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"✅ Results saved to: {out}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if baseline.get('machine') != report['machine']:
+            print("⚠️ Baseline was recorded on a different machine or software stack")
+        rows = compare(results, baseline, threshold)
+        print(f"{'CASE':<24}{'BASE st/s':>12}{'NOW st/s':>12}{'RATIO':>8}")
+        for cid, base, now, ratio, regressed in rows:
+            print(f"{cid:<24}{base:>12.1f}{now:>12.1f}{ratio:>8.2f}{'  🚨 REGRESSION' if regressed else ''}")
+        if any(row[4] for row in rows):
+            sys.exit(1)
@@ -3,7 +3,12 @@ import matplotlib.pyplot as plt
 import os
 import sys
 import numpy as np
+
+# Add the project root (parent directory) to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import config
+from src.columnar import open_timeseries, has_timeseries
 
 def apply_style(ax, title, ylabel, style):
     """Applies the chosen aesthetic to a subplot."""
@@ -31,12 +36,15 @@ def plot_case(case_path):
     # 1. Data Retrieval
     repeat_dirs = [d for d in os.listdir(case_path) if os.path.isdir(os.path.join(case_path, d)) and d.isdigit()]
     if not repeat_dirs:
-        repeat_dirs = ['.'] if os.path.exists(os.path.join(case_path, 'timeseries.csv')) else []
+        repeat_dirs = ['.'] if has_timeseries(case_path) else []
     
-    all_runs = [pd.read_csv(os.path.join(case_path, rd, 'timeseries.csv')) for rd in repeat_dirs 
-                if os.path.exists(os.path.join(case_path, rd, 'timeseries.csv'))]
+    # Binary column stores open lazily: only the columns plotted below are mapped
+    all_runs = [open_timeseries(os.path.join(case_path, rd)) for rd in repeat_dirs 
+                if has_timeseries(os.path.join(case_path, rd))]
     
     if not all_runs: return
+    # Repeats that went extinct stop early; compare all of them over the common span
+    span = min(len(run) for run in all_runs)
 
     sample_df = all_runs[0]
     species_names = [col.replace('pop_', '') for col in sample_df.columns if col.startswith('pop_')]
@@ -56,7 +64,7 @@ def plot_case(case_path):
             col_name = f"{col_prefix}{sid}{suffix}"
             if col_name not in sample_df.columns: continue
             
-            data_stack = np.array([run[col_name].values for run in all_runs])
+            data_stack = np.array([np.asarray(run[col_name])[:span] for run in all_runs])
             mean_vals = np.mean(data_stack, axis=0)
             min_vals = np.min(data_stack, axis=0)
             max_vals = np.max(data_stack, axis=0)
@@ -78,7 +86,7 @@ def plot_case(case_path):
     death_causes = ['starve', 'senility', 'toxic', 'heat']
     for sid in species_names:
         color = colors.get(sid, '#00FF41')
-        rates = {c: pd.Series(np.diff(np.mean([r[f"{sid}_{c}"].values for r in all_runs], axis=0), prepend=0)).rolling(window=window).mean() 
+        rates = {c: pd.Series(np.diff(np.mean([np.asarray(r[f"{sid}_{c}"])[:span] for r in all_runs], axis=0), prepend=0)).rolling(window=window).mean() 
                  for c in death_causes if f"{sid}_{c}" in sample_df.columns}
         
         rate_df = pd.DataFrame(rates).fillna(0)
@@ -106,12 +114,14 @@ def plot_case(case_path):
 if __name__ == "__main__":
     path = sys.argv[1] if len(sys.argv) > 1 else '.'
     if os.path.isdir(path):
-        # FIX: Check if timeseries.csv exists directly in this folder or subfolders
-        if os.path.exists(os.path.join(path, 'timeseries.csv')):
+        # FIX: Check if a timeseries exists directly in this folder or subfolders
+        repeats = [d for d in os.listdir(path) if d.isdigit() and has_timeseries(os.path.join(path, d))]
+        if has_timeseries(path) or repeats:
+            # A single run, or an ensemble case of numbered repeats
             plot_case(path)
         else:
             # Check one level deep for any folder containing data
             for folder in [os.path.join(path, f) for f in os.listdir(path) if os.path.isdir(os.path.join(path, f))]:
-                if os.path.exists(os.path.join(folder, 'timeseries.csv')) or \
-                   any(os.path.exists(os.path.join(folder, sub, 'timeseries.csv')) for sub in os.listdir(folder) if os.path.isdir(os.path.join(folder, sub))):
+                if has_timeseries(folder) or \
+                   any(has_timeseries(os.path.join(folder, sub)) for sub in os.listdir(folder) if os.path.isdir(os.path.join(folder, sub))):
                     plot_case(folder)
\ No newline at end of file
@@ -9,11 +9,14 @@ import config
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from src.engine import Simulation
+from src.frames import FramePlayer, has_frames
 from utils.viz import Visualizer
 
 class NullLogger:
     """A silent logger to prevent creating redundant files during rendering."""
     def log_step(self, data): pass
+    def set_columns(self, columns, int_columns=()): pass
+    def log_row(self, row): pass
     def save_to_disk(self): pass
     @property
     def run_dir(self): return "REPLAY_BUFFER"
@@ -25,19 +28,9 @@ def get_run_metadata(folder):
     with open(meta_path, 'r') as f:
         return json.load(f)
 
-def social_render(run_folder, mode="timelapse", start_step=0, duration=200, target_field='carbon'):
-    # 1. Setup Environment
-    meta = get_run_metadata(run_folder)
-    original_seed = meta['seed']
-    style = getattr(config, 'VISUAL_STYLE', 'SCIENTIFIC').upper()
-    
-    print(f"📡 RECONSTRUCTING_UNIVERSE | Style: {style} | Seed: {original_seed}")
-    
-    # 2. Reconstruct Simulation & Visualizer
-    sim = Simulation(seed=original_seed, logger=NullLogger())
-    viz = Visualizer(sim)
-    
-    # 3. Apply Field Choice
+def style_visualizer(viz, target_field, style):
+    """Applies the render framing and field choice shared by every render path."""
+    # Field choice
     viz.display_field = target_field
     conf = viz.field_configs.get(target_field, {'cmap': 'magma', 'vmax': 1.0})
     viz.im.set_cmap(conf['cmap'])
@@ -45,15 +38,62 @@ def social_render(run_folder, mode="timelapse", start_step=0, duration=200, targ
     if hasattr(viz, 'cbar'):
         viz.cbar.set_label(f"Concentration ({target_field})")
     
-    # 4. Fix Framing for HUD
+    # Framing for HUD
     # Scientific mode needs less margin; Telemetric needs more for the sidebar
     right_margin = 0.72 if style == 'TELEMETRIC' else 0.85
     viz.fig.subplots_adjust(right=right_margin, left=0.05, top=0.95, bottom=0.05)
+
+def recorded_indices(reader, mode, start_step=0, duration=200):
+    """Frame indices of a recorded stream that a render of `mode` shows, in order."""
+    if mode == "timelapse":
+        num_frames = min(getattr(config, 'RENDER_INTERVAL', 200), len(reader))
+        stride = max(1, len(reader) // max(1, num_frames))
+        return [min(frame * stride, len(reader) - 1) for frame in range(num_frames)]
+    if mode == "event":
+        first = min(reader.index_at(start_step), len(reader) - 1)
+        last = reader.index_at(start_step + duration)
+        return list(range(first, max(first + 1, last)))
+    raise ValueError(f"❌ Unknown mode: '{mode}'. Use 'timelapse' or 'event'.")
+
+def social_render(run_folder, mode="timelapse", start_step=0, duration=200, target_field='carbon',
+                  fmt='mp4', fps=20):
+    # 1. Setup Environment
+    meta = get_run_metadata(run_folder)
+    original_seed = meta['seed']
+    style = getattr(config, 'VISUAL_STYLE', 'SCIENTIFIC').upper()
+    
+    print(f"📡 RECONSTRUCTING_UNIVERSE | Style: {style} | Seed: {original_seed}")
+    
+    # 2. Reconstruct Simulation & Visualizer
+    # Recorded frames are drawn directly; otherwise the universe is re-simulated,
+    # with event mode seeking to the nearest snapshot before start_step
+    recorded = has_frames(run_folder)
+    if recorded:
+        sim = FramePlayer(run_folder)
+    else:
+        seek_step = start_step if mode == "event" else 0
+        sim = Simulation.from_history(run_folder, logger=NullLogger(), step=seek_step)
+    viz = Visualizer(sim)
+    
+    # 3. Apply Field Choice & Framing
+    style_visualizer(viz, target_field, style)
     
-    save_path = os.path.join(run_folder, f"render_{style.lower()}_{target_field}_{mode}.mp4")
+    if fmt not in ('mp4', 'gif'):
+        raise ValueError(f"❌ Unknown format: '{fmt}'. Use 'mp4' or 'gif'.")
+    save_path = os.path.join(run_folder, f"render_{style.lower()}_{target_field}_{mode}.{fmt}")
     
     # 5. Define Animation Logic
-    if mode == "timelapse":
+    if recorded and mode in ("timelapse", "event"):
+        indices = recorded_indices(sim.reader, mode, start_step, duration)
+        num_frames = len(indices)
+        if mode == "event":
+            print(f"⏩ SEEKED to recorded frame {indices[0]} (step {start_step})")
+
+        def update(frame):
+            sim.seek(indices[frame])
+            return viz.update_visuals()
+
+    elif mode == "timelapse":
         total_steps = getattr(config, 'MAX_STEPS_HEADLESS', 20000)
         num_frames = getattr(config, 'RENDER_INTERVAL', 200)
         stride = total_steps // num_frames
@@ -61,14 +101,11 @@ def social_render(run_folder, mode="timelapse", start_step=0, duration=200, targ
         def update(frame):
             for _ in range(stride):
                 sim.step()
-                if not sim.agents: break
+                if not sim.snapshot().size: break
             return viz.update_visuals()
 
     elif mode == "event":
-        print(f"⏩ FAST-FORWARDING to step {start_step}...")
-        for _ in range(start_step):
-            sim.step()
-        
+        print(f"⏩ SEEKED to step {sim.frame_count}")
         num_frames = duration
         def update(frame):
             sim.step()
@@ -82,17 +119,101 @@ def social_render(run_folder, mode="timelapse", start_step=0, duration=200, targ
     print(f"🎬 RENDERING: {save_path}")
     # Higher DPI for Telemetric to keep the green glow and text sharp
     render_dpi = 150 if style == 'TELEMETRIC' else 120
-    ani.save(save_path, writer='ffmpeg', fps=20, dpi=render_dpi)
+    ani.save(save_path, writer='pillow' if fmt == 'gif' else 'ffmpeg', fps=fps, dpi=render_dpi)
     print(f"✅ AUDIT_COMPLETE: {style} render saved.")
+    return save_path
+
+def _rasterize_block(run_folder, indices, first_slot, target_field, frame_dir, dpi):
+    """Worker: draws recorded frames `indices` to PNGs numbered from `first_slot`."""
+    import matplotlib
+    matplotlib.use('Agg')
+    style = getattr(config, 'VISUAL_STYLE', 'SCIENTIFIC').upper()
+    player = FramePlayer(run_folder)
+    viz = Visualizer(player)
+    style_visualizer(viz, target_field, style)
+    paths = []
+    for slot, idx in enumerate(indices, start=first_slot):
+        player.seek(idx)
+        viz.update_visuals()
+        path = os.path.join(frame_dir, f"frame_{slot:06d}.png")
+        viz.fig.savefig(path, dpi=dpi)
+        paths.append(path)
+    plt.close(viz.fig)
+    return paths
+
+def parallel_render(run_folder, mode="timelapse", start_step=0, duration=200, target_field='carbon',
+                    workers=None, fmt='mp4', fps=20):
+    """
+    Renders a recorded frame stream on a process pool. Each worker rasterizes a
+    contiguous block of frames with the usual Visualizer styling; the PNGs are
+    then assembled in order into an mp4 (ffmpeg) or a GIF (pillow).
+    Runs without recorded frames fall back to the serial social_render.
+    """
+    import tempfile
+    import shutil
+    import subprocess
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+    from src.frames import FrameReader
+
+    if not has_frames(run_folder):
+        print("⚠️ No recorded frames: falling back to serial re-simulation")
+        return social_render(run_folder, mode, start_step, duration, target_field, fmt=fmt, fps=fps)
+
+    style = getattr(config, 'VISUAL_STYLE', 'SCIENTIFIC').upper()
+    render_dpi = 150 if style == 'TELEMETRIC' else 120
+    indices = recorded_indices(FrameReader(run_folder), mode, start_step, duration)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(indices)))
+    bounds = [len(indices) * w // workers for w in range(workers + 1)]
+
+    frame_dir = tempfile.mkdtemp(prefix="render_", dir=run_folder)
+    try:
+        print(f"🎬 RASTERIZING {len(indices)} frames on {workers} workers")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+            blocks = [pool.submit(_rasterize_block, run_folder, indices[lo:hi], lo,
+                                  target_field, frame_dir, render_dpi)
+                      for lo, hi in zip(bounds[:-1], bounds[1:])]
+            paths = [path for block in blocks for path in block.result()]
+
+        save_path = os.path.join(run_folder, f"render_{style.lower()}_{target_field}_{mode}.{fmt}")
+        if fmt == 'gif':
+            from PIL import Image
+            images = [Image.open(path) for path in paths]
+            images[0].save(save_path, save_all=True, append_images=images[1:],
+                           duration=int(1000 / fps), loop=0)
+        elif fmt == 'mp4':
+            subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-framerate', str(fps),
+                            '-i', os.path.join(frame_dir, 'frame_%06d.png'),
+                            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', save_path],
+                           check=True)
+        else:
+            raise ValueError(f"❌ Unknown format: '{fmt}'. Use 'mp4' or 'gif'.")
+    finally:
+        shutil.rmtree(frame_dir, ignore_errors=True)
+    print(f"✅ AUDIT_COMPLETE: {style} render saved.")
+    return save_path
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python render.py <folder> <mode: timelapse/event> <field> [start_step] [duration]")
+    args = sys.argv[1:]
+    workers = None
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+    fmt = 'gif' if "--gif" in args else 'mp4'
+    args = [a for a in args if a != "--gif"]
+
+    if len(args) < 2:
+        print("Usage: python render.py <folder> <mode: timelapse/event> <field> [start_step] [duration] "
+              "[--workers K] [--gif]")
     else:
-        path = sys.argv[1]
-        m = sys.argv[2]
-        field = sys.argv[3] if len(sys.argv) > 3 else 'carbon'
-        s = int(sys.argv[4]) if len(sys.argv) > 4 else 0
-        d = int(sys.argv[5]) if len(sys.argv) > 5 else 200
+        path = args[0]
+        m = args[1]
+        field = args[2] if len(args) > 2 else 'carbon'
+        s = int(args[3]) if len(args) > 3 else 0
+        d = int(args[4]) if len(args) > 4 else 200
         
-        social_render(path, m, s, d, field)
\ No newline at end of file
+        if workers is not None or fmt == 'gif':
+            parallel_render(path, m, s, d, field, workers=workers, fmt=fmt)
+        else:
+            social_render(path, m, s, d, field)
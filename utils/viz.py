@@ -1,7 +1,9 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.animation import FuncAnimation
+from matplotlib.colors import to_rgba_array
 import os
+import time
 import config
 
 class Visualizer:
@@ -48,6 +50,10 @@ class Visualizer:
             self.ax.set_title(f"Simulation Audit: {self.sim.logger.run_dir.split('_')[-1]}")
             self.cbar = self.fig.colorbar(self.im, ax=self.ax)
 
+        # Render rate, measured between animation callbacks
+        self.render_fps = 0.0
+        self._last_draw = None
+
         self.fig.canvas.mpl_connect('key_press_event', self.on_key)
         plt.tight_layout()
 
@@ -75,18 +81,16 @@ class Visualizer:
             self.fig.canvas.draw_idle()
 
     def update_visuals(self):
-        self.im.set_array(self.sim.fields.fields[self.display_field])
-        species_counts = {}
-        if self.sim.agents:
-            offsets = np.array([a.pos[::-1] for a in self.sim.agents])
-            colors = [self.species_colors.get(a.genome.species_id, 'white') for a in self.sim.agents]
-            for a in self.sim.agents:
-                sid = a.genome.species_id
-                species_counts[sid] = species_counts.get(sid, 0) + 1
-            self.scat.set_offsets(offsets)
-            self.scat.set_facecolors(colors)
+        snap = self.sim.snapshot()
+        self.im.set_array(snap.fields[self.display_field])
+        counts = snap.counts()
+        species_counts = {sid: int(n) for sid, n in zip(snap.species_ids, counts) if n}
+        if snap.size:
+            palette = to_rgba_array([self.species_colors.get(sid, 'white') for sid in snap.species_ids])
+            self.scat.set_offsets(np.column_stack((snap.cols, snap.rows)))
+            self.scat.set_facecolors(palette[snap.species])
         
-        avg_e = np.mean([a.energy for a in self.sim.agents]) if self.sim.agents else 0
+        avg_e = np.mean(snap.energy) if snap.size else 0
         
         if self.style == 'TELEMETRIC':
             readout = self._get_telemetric_text(species_counts, avg_e)
@@ -96,29 +100,45 @@ class Visualizer:
         self.counter_text.set_text(readout)
         return (self.im, self.scat, self.counter_text)
 
+    def _rates(self):
+        """(sim steps/s, render fps) when the simulation runs in a background worker, else None."""
+        if not hasattr(self.sim, 'steps_per_sec'):
+            return None
+        return self.sim.steps_per_sec, self.render_fps
+
     def _get_telemetric_text(self, counts, avg_e):
         info = ""
         for sid, count in counts.items():
             deaths = self.sim.deaths.get(sid, {})
             top = max(deaths, key=deaths.get) if any(deaths.values()) else "NONE"
             info += f"» {sid:<10} | POP: {count:04d} | RIP: {top.upper()}\n"
-        return f"▼ SYSTEM_STATE: RUNNING\n▼ CHRONO_STEP: {self.sim.frame_count:05d}\n▼ AVG_NRG: {avg_e:06.2f}\n{'-'*30}\n{info}\nENTROPY: STABLE"
+        rates = self._rates()
+        rate_info = f"▼ SIM_RATE: {rates[0]:.0f} ST/S\n▼ RENDER_FPS: {rates[1]:.1f}\n" if rates else ""
+        return f"▼ SYSTEM_STATE: RUNNING\n▼ CHRONO_STEP: {self.sim.frame_count:05d}\n▼ AVG_NRG: {avg_e:06.2f}\n{rate_info}{'-'*30}\n{info}\nENTROPY: STABLE"
 
     def _get_scientific_text(self, counts, avg_e):
-        return f"STEP: {self.sim.frame_count}\nPOP: {sum(counts.values())}\nAVG E: {avg_e:.1f}"
+        rates = self._rates()
+        rate_info = f"\nSIM: {rates[0]:.0f} steps/s\nFPS: {rates[1]:.1f}" if rates else ""
+        return f"STEP: {self.sim.frame_count}\nPOP: {sum(counts.values())}\nAVG E: {avg_e:.1f}{rate_info}"
 
     def update(self, frame):
+        now = time.perf_counter()
+        if self._last_draw is not None:
+            fps = 1.0 / max(now - self._last_draw, 1e-9)
+            self.render_fps = fps if not self.render_fps else 0.9 * self.render_fps + 0.1 * fps
+        self._last_draw = now
         self.sim.step()
         return self.update_visuals()
         
     def show(self, save_gif=False, folder=None):
         if save_gif and folder:
-            subsample_rate = 20  
+            # Steps per GIF frame; a FramePlayer already skips frame_stride steps per step()
+            subsample_rate = max(1, 20 // getattr(self.sim, 'frame_stride', 1))
             total_gif_frames = 150 
             def replay_step(frame):
                 for _ in range(subsample_rate):
                     self.sim.step()
-                    if not self.sim.agents: break 
+                    if not self.sim.snapshot().size: break 
                 return self.update_visuals()
             ani = FuncAnimation(self.fig, replay_step, frames=total_gif_frames, blit=True)
             save_path = os.path.join(folder, f"{self.style.lower()}_render.gif")